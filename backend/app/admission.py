@@ -0,0 +1,187 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Request Coalescing and Admission Control
+
+Este módulo evita que rajadas de requisições esgotem o threadpool da API. Consultas
+idênticas simultâneas compartilham uma única computação em andamento (single-flight),
+e cada endpoint tem um limite de concorrência com fila de espera limitada: quando a
+fila está cheia a requisição é recusada com 429, e quando a espera estoura o prazo,
+com 503 — ambas com ``Retry-After``.
+
+This module keeps request bursts from starving the API threadpool. Concurrent
+identical queries share one in-flight computation (single-flight), and each endpoint
+has a concurrency limit with a bounded wait queue: requests are shed with 429 when the
+queue is full and with 503 when the wait times out, both carrying ``Retry-After``.
+"""
+
+import os
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+
+from fastapi import HTTPException
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+# Seconds a request may wait for a slot / Segundos que uma requisição pode esperar
+ADMISSION_TIMEOUT = float(os.getenv("ORBITHUB_ADMISSION_TIMEOUT", "2"))
+RETRY_AFTER = _env_int("ORBITHUB_RETRY_AFTER", 1)
+
+
+class SingleFlight:
+    """
+    Share one in-flight computation among concurrent callers with the same key.
+    Compartilha uma computação em andamento entre chamadas simultâneas de mesma chave.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """
+        Await ``fn()`` once per key; callers arriving meanwhile get the same result.
+        Aguarda ``fn()`` uma vez por chave; quem chega no meio recebe o mesmo resultado.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            # run as its own task so a disconnecting caller cannot cancel the shared work
+            # roda como tarefa própria: um cliente que desconecta não cancela o trabalho
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._forget(key, t))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._inflight), "leaders": self.leaders, "coalesced": self.coalesced}
+
+
+class AdmissionLimiter:
+    """
+    Per-endpoint concurrency limit with a bounded wait queue and fast load shedding.
+    Limite de concorrência por endpoint com fila de espera limitada e descarte rápido.
+
+    Args:
+        name: Endpoint name; limits come from ``ORBITHUB_<NAME>_CONCURRENCY`` and
+              ``ORBITHUB_<NAME>_QUEUE`` when set
+        max_concurrent: Requests allowed to run at once
+        max_queue: Requests allowed to wait for a slot (beyond that → 429)
+        timeout: Seconds a queued request may wait (beyond that → 503)
+        retry_after: Seconds suggested to clients in ``Retry-After``
+
+    Usage:
+        async with LIMITER:
+            ...
+        # or / ou
+        await LIMITER.run(coroutine_factory)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        timeout: float = ADMISSION_TIMEOUT,
+        retry_after: int = RETRY_AFTER,
+    ):
+        prefix = f"ORBITHUB_{name.upper()}"
+        self.name = name
+        self.max_concurrent = max(1, _env_int(f"{prefix}_CONCURRENCY", max_concurrent))
+        self.max_queue = max(0, _env_int(f"{prefix}_QUEUE", max_queue))
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self.running = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    def _shed(self, status_code: int, detail: str) -> HTTPException:
+        return HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    async def __aenter__(self):
+        if self.running >= self.max_concurrent or self.waiting:
+            # no free slot: queue only if there is room / sem vaga: enfileira se houver espaço
+            if self.waiting >= self.max_queue:
+                self.rejected_queue_full += 1
+                raise self._shed(429, f"Too many concurrent {self.name} requests")
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                raise self._shed(503, f"{self.name} is overloaded, try again later")
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+        self.running += 1
+        self.admitted += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    async def reserve(self) -> None:
+        """
+        Wait for a slot with no queue bound or timeout, for callers that bound their
+        own queue (e.g. the micro-batcher); pair with ``release``.
+        Aguarda uma vaga sem limite de fila; para quem limita a própria fila.
+        """
+        await self._slots.acquire()
+        self.running += 1
+        self.admitted += 1
+
+    def release(self) -> None:
+        self.running -= 1
+        self._slots.release()
+
+    async def run(self, fn: Callable[[], Awaitable]):
+        """Await ``fn()`` inside an admitted slot / Aguarda ``fn()`` dentro de uma vaga."""
+        async with self:
+            return await fn()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "timeout_seconds": self.timeout,
+            "retry_after_seconds": self.retry_after,
+            "running": self.running,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected_429": self.rejected_queue_full,
+            "rejected_503": self.rejected_timeout,
+        }
+
+
+# Both limits share anyio's default 40-thread pool; keep their sum below it
+# Ambos os limites dividem o pool padrão de 40 threads do anyio
+SATELLITES_LIMIT = AdmissionLimiter("satellites", max_concurrent=16, max_queue=64)
+CLASSIFY_LIMIT = AdmissionLimiter("classify", max_concurrent=4, max_queue=16)
+SATELLITES_FLIGHT = SingleFlight("satellites")
+CLASSIFY_FLIGHT = SingleFlight("classify")
+
+
+def admission_stats() -> dict:
+    return {
+        "satellites": {"limit": SATELLITES_LIMIT.stats(), "single_flight": SATELLITES_FLIGHT.stats()},
+        "classify": {"limit": CLASSIFY_LIMIT.stats(), "single_flight": CLASSIFY_FLIGHT.stats()},
+    }
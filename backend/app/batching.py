@@ -0,0 +1,278 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Micro-Batching Scheduler
+
+Este módulo agrupa requisições simultâneas em micro-lotes: os registros ficam numa
+fila até atingir o tamanho máximo do lote ou o tempo máximo de espera (ex.: 2 ms),
+são processados numa única chamada vetorizada (transform/predict) e os resultados
+voltam para cada requisição de origem.
+
+This module groups concurrent requests into micro-batches: records are queued until
+the batch reaches its maximum size or maximum wait (e.g. 2 ms), processed in a single
+vectorized call (transform/predict) and the results are fanned back out to each
+originating request.
+"""
+
+import os
+import asyncio
+from collections import deque
+from typing import Callable, Deque, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from .admission import ADMISSION_TIMEOUT, RETRY_AFTER, AdmissionLimiter
+
+
+# Batch limits / Limites do lote
+MAX_BATCH = int(os.getenv("ORBITHUB_CLASSIFY_MAX_BATCH", "256"))
+MAX_WAIT_MS = float(os.getenv("ORBITHUB_CLASSIFY_MAX_WAIT_MS", "2"))
+# Records allowed to wait for a batch / Registros que podem aguardar um lote
+MAX_PENDING = int(os.getenv("ORBITHUB_CLASSIFY_MAX_PENDING", "4096"))
+
+
+class MicroBatcher:
+    """
+    Queue records from concurrent callers and process them in vectorized batches.
+    Enfileira registros de chamadas simultâneas e os processa em lotes vetorizados.
+
+    Args:
+        name: Label used in stats
+        process: Sync function mapping a list of records to one result per record;
+                 runs on the threadpool
+        max_batch: Records per batch (a single larger request still runs alone)
+        max_wait_ms: How long the first queued record waits for company
+        limiter: Optional admission limiter; each batch holds one of its slots and a
+                 batch is only cut once a slot is free, so records keep accumulating
+                 while every slot is busy
+        max_pending: Queued records allowed before new requests are shed with 429
+                     (a single larger request is still admitted into an empty queue)
+        timeout: Seconds a request may wait to be dispatched before a 503
+                 (defaults to the limiter's timeout)
+        retry_after: Seconds suggested to clients in ``Retry-After``
+
+    A failing batch is retried request by request, so an invalid record only fails
+    the request that sent it.
+    Um lote com erro é refeito requisição a requisição: só quem enviou o registro
+    inválido recebe o erro.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        process: Callable[[List[dict]], list],
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = MAX_WAIT_MS,
+        limiter: Optional[AdmissionLimiter] = None,
+        max_pending: int = MAX_PENDING,
+        timeout: Optional[float] = None,
+        retry_after: Optional[int] = None,
+    ):
+        self.name = name
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_pending = max(self.max_batch, max_pending)
+        if timeout is None:
+            timeout = limiter.timeout if limiter is not None else ADMISSION_TIMEOUT
+        if retry_after is None:
+            retry_after = limiter.retry_after if limiter is not None else RETRY_AFTER
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._process = process
+        self._limiter = limiter
+        self._pending: Deque[Tuple[List[dict], asyncio.Future]] = deque()
+        self._pending_records = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._arrived: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self.requests = 0
+        self.batches = 0
+        self.records = 0
+        self.largest_batch = 0
+        self.isolated_batches = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    # ---------- public API ----------
+
+    async def submit(self, records: List[dict]) -> list:
+        """
+        Queue ``records`` and return their results once their batch has run.
+        Enfileira ``records`` e retorna seus resultados quando o lote for executado.
+
+        Raises:
+            HTTPException: 429 when the queue is full, 503 when the request is not
+                           dispatched within ``timeout`` (both with ``Retry-After``)
+        """
+        if not records:
+            return []
+        self._ensure_started()
+        if self._pending_records and self._pending_records + len(records) > self.max_pending:
+            self.rejected_queue_full += 1
+            raise self._shed(429, f"Too many queued {self.name} records")
+        fut = self._loop.create_future()
+        entry = (records, fut)
+        self._pending.append(entry)
+        self._pending_records += len(records)
+        self.requests += 1
+        self._arrived.set()
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), self.timeout)
+        except asyncio.TimeoutError:
+            if not self._withdraw(entry):
+                # already running: the timeout only bounds the wait for a slot
+                # já em execução: o prazo limita apenas a espera por vaga
+                return await fut
+            self.rejected_timeout += 1
+            raise self._shed(503, f"{self.name} is overloaded, try again later")
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+
+    def close(self) -> None:
+        """Stop the dispatcher (queued callers are cancelled) / Encerra o despachante."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        while self._pending:
+            _, fut = self._pending.popleft()
+            fut.cancel()
+        self._pending_records = 0
+        self._loop = None
+
+    def stats(self) -> dict:
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queued_requests": len(self._pending),
+            "queued_records": self._pending_records,
+            "max_pending": self.max_pending,
+            "running_batches": len(self._running),
+            "requests": self.requests,
+            "batches": self.batches,
+            "records": self.records,
+            "largest_batch": self.largest_batch,
+            "mean_batch": round(self.records / self.batches, 2) if self.batches else 0.0,
+            "isolated_batches": self.isolated_batches,
+            "rejected_429": self.rejected_queue_full,
+            "rejected_503": self.rejected_timeout,
+        }
+
+    def _shed(self, status_code: int, detail: str) -> HTTPException:
+        return HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    def _withdraw(self, entry: Tuple[List[dict], asyncio.Future]) -> bool:
+        """Drop a still-queued request; False once it was dispatched."""
+        for i, queued in enumerate(self._pending):
+            if queued is entry:
+                del self._pending[i]
+                self._pending_records -= len(entry[0])
+                entry[1].cancel()
+                return True
+        return False
+
+    # ---------- dispatcher ----------
+
+    def _ensure_started(self) -> None:
+        # one dispatcher per event loop / um despachante por event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._arrived = asyncio.Event()
+        self._pending = deque()
+        self._pending_records = 0
+        self._running = set()
+        self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        loop = self._loop
+        while True:
+            if not self._pending:
+                self._arrived.clear()
+                await self._arrived.wait()
+            # the first record waits at most max_wait for the batch to fill
+            # o primeiro registro espera no máximo max_wait o lote encher
+            deadline = loop.time() + self.max_wait
+            while self._pending_records < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._arrived.clear()
+                try:
+                    await asyncio.wait_for(self._arrived.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            # cut the batch only once a slot is free: while every slot is busy the
+            # queue keeps filling, so the next batch is larger rather than queued
+            # corta o lote só com vaga livre: enquanto todas estão ocupadas a fila enche
+            if self._limiter is not None:
+                await self._limiter.reserve()
+            task = loop.create_task(self._execute(self._take()))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    def _take(self) -> List[Tuple[List[dict], asyncio.Future]]:
+        """Whole requests up to max_batch records (at least one request)."""
+        batch: List[Tuple[List[dict], asyncio.Future]] = []
+        size = 0
+        while self._pending:
+            records, fut = self._pending[0]
+            if batch and size + len(records) > self.max_batch:
+                break
+            self._pending.popleft()
+            self._pending_records -= len(records)
+            if fut.done():  # caller went away / cliente desistiu
+                continue
+            batch.append((records, fut))
+            size += len(records)
+        return batch
+
+    async def _execute(self, batch: List[Tuple[List[dict], asyncio.Future]]) -> None:
+        try:
+            if batch:
+                await self._run_batch(batch)
+        finally:
+            if self._limiter is not None:
+                self._limiter.release()
+
+    async def _run_batch(self, batch: List[Tuple[List[dict], asyncio.Future]]) -> None:
+        records = [r for recs, _ in batch for r in recs]
+        self.batches += 1
+        self.records += len(records)
+        self.largest_batch = max(self.largest_batch, len(records))
+        try:
+            results = await run_in_threadpool(self._process, records)
+        except Exception as exc:
+            if len(batch) > 1:
+                await self._run_isolated(batch)
+            elif not batch[0][1].done():
+                batch[0][1].set_exception(exc)
+            return
+        # fan the results back out / distribui os resultados de volta
+        start = 0
+        for recs, fut in batch:
+            end = start + len(recs)
+            if not fut.done():
+                fut.set_result(results[start:end])
+            start = end
+
+    async def _run_isolated(self, batch: List[Tuple[List[dict], asyncio.Future]]) -> None:
+        """Rerun a failed batch one request at a time / Refaz o lote requisição a requisição."""
+        self.isolated_batches += 1
+        for recs, fut in batch:
+            if fut.done():
+                continue
+            try:
+                results = await run_in_threadpool(self._process, recs)
+            except Exception as exc:
+                if not fut.done():
+                    fut.set_exception(exc)
+            else:
+                if not fut.done():
+                    fut.set_result(results)
@@ -0,0 +1,154 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Compact Serving Catalog
+
+Este módulo constrói uma representação compacta em memória do catálogo classificado,
+mantendo apenas as colunas usadas pela API, com strings repetitivas codificadas como
+categorias, campos orbitais numéricos em float32 e nomes internados.
+
+This module builds a compact in-memory representation of the classified catalog,
+keeping only the columns the API uses, with repetitive strings dictionary-encoded as
+categoricals, numeric orbital fields as float32 and interned names.
+"""
+
+import sys
+import argparse
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Columns returned by /satellites / Colunas retornadas por /satellites
+NAME_COLUMNS = [
+    "Name of Satellite, Alternate Names",
+    "Current Official Name of Satellite",
+]
+CATEGORICAL_COLUMNS = [
+    "Country/Org of UN Registry",
+    "Country of Operator/Owner",
+    "Operator/Owner",
+    "Purpose",
+    "Detailed Purpose",
+    "SUSTAINABILITY_CLASS",
+]
+# Numeric orbital fields kept as float32 / Campos orbitais numéricos mantidos em float32
+ORBITAL_COLUMNS = [
+    "Longitude of GEO (degrees)",
+    "Perigee (km)",
+    "Apogee (km)",
+    "Eccentricity",
+    "Inclination (degrees)",
+    "Period (minutes)",
+]
+# Identifiers used to join other catalogs / Identificadores usados para juntar outros catálogos
+ID_COLUMNS = ["NORAD Number"]
+KEY_COLUMNS = ["COSPAR Number"]
+SERVING_COLUMNS = NAME_COLUMNS + CATEGORICAL_COLUMNS + ORBITAL_COLUMNS + ID_COLUMNS + KEY_COLUMNS
+
+
+def _intern_series(series: pd.Series) -> pd.Series:
+    """
+    Convert a string column to Python objects with interned values.
+    Converte uma coluna de strings para objetos Python com valores internados.
+    """
+    values = [sys.intern(v) if isinstance(v, str) else None for v in series.tolist()]
+    return pd.Series(values, index=series.index, dtype=object, name=series.name)
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the compact serving frame from a full classified DataFrame.
+    Constrói o DataFrame compacto de serviço a partir do DataFrame classificado completo.
+
+    Args:
+        df: Classified satellites DataFrame (as read from the processed CSV)
+
+    Returns:
+        DataFrame restricted to SERVING_COLUMNS with compact dtypes
+    """
+    out = {}
+    for col in NAME_COLUMNS + KEY_COLUMNS:
+        if col in df.columns:
+            out[col] = _intern_series(df[col])
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            out[col] = df[col].astype("category")
+    for col in ORBITAL_COLUMNS:
+        if col in df.columns:
+            out[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float32)
+    for col in ID_COLUMNS:
+        if col in df.columns:
+            out[col] = pd.to_numeric(df[col], errors="coerce").astype("Int32")
+    return pd.DataFrame(out, index=pd.RangeIndex(len(df)))
+
+
+def read_serving_csv(csv_path: str) -> pd.DataFrame:
+    """
+    Read only the serving columns from the classified CSV and compact them.
+    Lê apenas as colunas de serviço do CSV classificado e as compacta.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [c for c in SERVING_COLUMNS if c in header]
+    return compact_frame(pd.read_csv(csv_path, usecols=usecols))
+
+
+def contains_mask(series: pd.Series, pattern: str) -> pd.Series:
+    """
+    Case-insensitive substring mask, evaluated once per category when possible.
+    Máscara de substring sem distinção de caixa, avaliada uma vez por categoria quando possível.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        hits = series.cat.categories.astype(str).str.contains(pattern, case=False, na=False)
+        hits = np.append(np.asarray(hits, dtype=bool), False)  # code -1 (NaN) → False
+        return pd.Series(hits[codes], index=series.index)
+    return series.astype(str).str.contains(pattern, case=False, na=False)
+
+
+def memory_report(df: pd.DataFrame) -> Dict[str, object]:
+    """
+    Report bytes per column (deep) for a DataFrame.
+    Relata bytes por coluna (profundo) de um DataFrame.
+
+    Returns:
+        dict with rows, per-column bytes/dtype and total bytes
+    """
+    usage = df.memory_usage(deep=True, index=True)
+    columns: List[dict] = [
+        {"column": str(col), "dtype": str(df[col].dtype), "bytes": int(usage[col])}
+        for col in df.columns
+    ]
+    return {
+        "rows": int(len(df)),
+        "columns": columns,
+        "index_bytes": int(usage["Index"]),
+        "total_bytes": int(usage.sum()),
+    }
+
+
+def _print_report(title: str, report: Dict[str, object]) -> None:
+    print(f"{title}: {report['rows']} rows, {report['total_bytes']:,} bytes")
+    for item in sorted(report["columns"], key=lambda r: r["bytes"], reverse=True):
+        print(f"  {item['bytes']:>12,}  {item['dtype']:<10}  {item['column']}")
+
+
+def main(csv_path: Optional[str] = None) -> None:
+    from .data_access import CLASSIFIED_CSV
+
+    csv_path = csv_path or CLASSIFIED_CSV
+    full = pd.read_csv(csv_path)
+    compact = read_serving_csv(csv_path)
+    full_report = memory_report(full)
+    compact_report = memory_report(compact)
+    _print_report("Full classified frame", full_report)
+    _print_report("Compact serving frame", compact_report)
+    ratio = full_report["total_bytes"] / max(1, compact_report["total_bytes"])
+    print(f"Reduction: {ratio:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory report for the serving catalog")
+    parser.add_argument("--csv", default=None)
+    args = parser.parse_args()
+    main(args.csv if args.csv else None)
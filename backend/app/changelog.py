@@ -0,0 +1,291 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Dataset Versions and Change Feed
+
+Este módulo compara cada build do conjunto de dados com o anterior e registra um número
+de versão persistente e sempre crescente, além de um log de mudanças por linha
+(adicionado, removido, classe alterada, campos alterados) indexado pelo ID estável do
+satélite. Clientes de entrega via API pedem apenas as mudanças desde a última versão
+que viram. As entradas são compactadas por ID na consulta, então o tamanho de um delta
+acompanha o número de satélites alterados, não o tamanho do catálogo; versões antigas
+são descartadas do log e quem ficou para trás recebe uma ressincronização completa.
+
+This module diffs each dataset build against the previous one and records a
+persistent, monotonically increasing version plus a per-row change log (added, removed,
+class changed, fields changed) keyed by the stable satellite ID. API-delivery clients
+ask only for the changes since the last version they saw. Entries are compacted per ID
+at query time, so a delta's size tracks the number of changed satellites rather than
+the catalog; old versions are trimmed from the log and clients that fell behind get a
+full resync instead.
+
+Vários processos (workers do uvicorn) compartilham os arquivos: toda leitura e escrita
+ocorre sob um lock de arquivo e recarrega o estado do disco quando outro processo o
+alterou, então um mesmo build gera uma única versão.
+Several processes (uvicorn workers) share the files: every read and write happens
+under a file lock and reloads the state from disk when another process changed it, so
+one build yields a single version.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from .filelock import file_lock
+
+
+CHANGES_DIR = os.path.join("..", "data", "changes")
+# Versions kept in the log / Versões mantidas no log
+MAX_VERSIONS = int(os.getenv("ORBITHUB_CHANGELOG_VERSIONS", "100"))
+CLASS_FIELD = "sustainability_class"
+
+
+def _stat_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def diff_records(old: Dict[str, dict], new: Dict[str, dict]) -> List[dict]:
+    """
+    Per-ID differences between two catalogs (without version numbers).
+    Diferenças por ID entre dois catálogos (sem número de versão).
+    """
+    entries: List[dict] = []
+    for sid, rec in new.items():
+        before = old.get(sid)
+        if before is None:
+            entries.append({"id": sid, "op": "added", "fields": [], "class_from": None})
+        elif before != rec:
+            fields = sorted(k for k in rec.keys() | before.keys() if rec.get(k) != before.get(k))
+            op = "class_changed" if CLASS_FIELD in fields else "updated"
+            entries.append({"id": sid, "op": op, "fields": fields, "class_from": before.get(CLASS_FIELD)})
+    for sid, before in old.items():
+        if sid not in new:
+            entries.append({"id": sid, "op": "removed", "fields": [], "class_from": before.get(CLASS_FIELD)})
+    return entries
+
+
+class ChangeLog:
+    """
+    Persistent dataset version counter with a per-row change log.
+    Contador persistente de versões do conjunto de dados com log de mudanças por linha.
+
+    Files (under ``directory``):
+        catalog.json   latest records, version and the oldest version still in the log
+        changes.ndjson one entry per changed row: version, id, op, fields, class_from
+        changes.lock   cross-process lock around every read and write
+    """
+
+    def __init__(self, directory: str = CHANGES_DIR, max_versions: int = MAX_VERSIONS):
+        self.directory = directory
+        self.max_versions = max(1, max_versions)
+        self.catalog_path = os.path.join(directory, "catalog.json")
+        self.log_path = os.path.join(directory, "changes.ndjson")
+        self.lock_path = os.path.join(directory, "changes.lock")
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self.version = 0
+        self.base = 0  # deltas are answerable for since >= base / deltas válidos para since >= base
+        self.updated_at: Optional[str] = None
+        self.records: Dict[str, dict] = {}
+        self._by_version: Dict[int, List[dict]] = {}
+
+    # ---------- persistence ----------
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Thread + file lock, with the state refreshed from disk / Lock com estado atualizado."""
+        with self._lock, file_lock(self.lock_path):
+            self._load()
+            yield
+
+    def _load(self) -> None:
+        """(Re)load the files when the catalog changed since we last read or wrote it."""
+        stamp = _stat_signature(self.catalog_path)
+        if stamp == self._stamp:
+            return
+        self._stamp = stamp
+        self.version = self.base = 0
+        self.updated_at = None
+        self.records, self._by_version = {}, {}
+        if stamp is None:
+            return
+        try:
+            with open(self.catalog_path, "rb") as f:
+                state = orjson.loads(f.read())
+            self.version = int(state["version"])
+            self.base = int(state["base"])
+            self.updated_at = state.get("updated_at")
+            self.records = state["records"]
+        except (OSError, ValueError, KeyError):
+            return
+        orphans = False
+        try:
+            with open(self.log_path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = orjson.loads(line)
+                    if self.base < entry["version"] <= self.version:
+                        self._by_version.setdefault(entry["version"], []).append(entry)
+                    elif entry["version"] > self.version:
+                        orphans = True  # crashed before its catalog was written
+        except (OSError, ValueError, KeyError):
+            # log lost or corrupt: only full resyncs until new versions accrue
+            # log perdido ou corrompido: só ressincronização completa até novas versões
+            self._by_version = {}
+            self.base = self.version
+            orphans = True
+        if orphans:
+            self._rewrite_log()
+
+    def _write_catalog(self) -> None:
+        state = {"version": self.version, "base": self.base, "updated_at": self.updated_at, "records": self.records}
+        tmp = f"{self.catalog_path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(state))
+        os.replace(tmp, self.catalog_path)
+        self._stamp = _stat_signature(self.catalog_path)
+
+    def _rewrite_log(self) -> None:
+        tmp = f"{self.log_path}.tmp"
+        with open(tmp, "wb") as f:
+            for version in sorted(self._by_version):
+                for entry in self._by_version[version]:
+                    f.write(orjson.dumps(entry) + b"\n")
+        os.replace(tmp, self.log_path)
+
+    # ---------- recording ----------
+
+    def record(self, records: Dict[str, dict]) -> int:
+        """
+        Diff a new build against the last one; bump the version only if rows changed.
+        Compara um novo build com o anterior; só incrementa a versão se linhas mudaram.
+
+        Another worker that already recorded the same build leaves nothing to diff,
+        so every process ends up on the same version.
+
+        Returns:
+            Dataset version of ``records``
+        """
+        with self._locked():
+            now = datetime.now(timezone.utc).isoformat()
+            if self.version == 0:
+                # first build is the baseline: clients start with a full sync
+                # o primeiro build é a base: clientes começam com sincronização completa
+                self.version = self.base = 1
+                self.records, self.updated_at = records, now
+                os.makedirs(self.directory, exist_ok=True)
+                self._write_catalog()
+                self._rewrite_log()
+                return self.version
+
+            entries = diff_records(self.records, records)
+            if not entries:
+                return self.version
+            version = self.version + 1
+            for entry in entries:
+                entry["version"] = version
+            # log first, then the catalog that makes the version visible after a restart
+            # primeiro o log, depois o catálogo que torna a versão visível após reinício
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.log_path, "ab") as f:
+                f.write(b"".join(orjson.dumps(e) + b"\n" for e in entries))
+            self._by_version[version] = entries
+            self.version, self.records, self.updated_at = version, records, now
+            self._compact()
+            self._write_catalog()
+            return self.version
+
+    def _compact(self) -> None:
+        """Drop versions older than ``max_versions`` from the log / Descarta versões antigas."""
+        horizon = self.version - self.max_versions
+        if horizon <= self.base:
+            return
+        for version in [v for v in self._by_version if v <= horizon]:
+            del self._by_version[version]
+        self.base = horizon
+        self._rewrite_log()
+
+    # ---------- queries ----------
+
+    def changes_since(self, since: int) -> dict:
+        """
+        Net change per satellite after version ``since`` (one entry per ID).
+        Mudança líquida por satélite após a versão ``since`` (uma entrada por ID).
+
+        Args:
+            since: Last version the client has applied (0 = never synced)
+
+        Returns:
+            Dict with version, full_resync flag and the list of changes; added and
+            changed entries carry the current record, removed ones only the ID
+        """
+        with self._locked():
+            version, base, records = self.version, self.base, self.records
+            if since < base or since > version:
+                # too old (compacted away) or from another dataset lineage → full resync
+                # antigo demais (compactado) ou de outra linhagem → ressincronização completa
+                changes = [{"id": sid, "op": "added", "record": rec} for sid, rec in records.items()]
+                return self._response(since, version, True, changes)
+
+            # fold the entries of every version after `since`, per ID, in order
+            # combina as entradas de cada versão após `since`, por ID, em ordem
+            folded: Dict[str, dict] = {}
+            for v in range(since + 1, version + 1):
+                for entry in self._by_version.get(v, ()):
+                    acc = folded.get(entry["id"])
+                    if acc is None:
+                        folded[entry["id"]] = {
+                            "existed": entry["op"] != "added",
+                            "class_from": entry["class_from"],
+                            "fields": set(entry["fields"]),
+                            "version": v,
+                        }
+                    else:
+                        acc["fields"].update(entry["fields"])
+                        acc["version"] = v
+
+        changes: List[dict] = []
+        for sid, acc in sorted(folded.items(), key=lambda kv: kv[1]["version"]):
+            current = records.get(sid)
+            if current is None:
+                if acc["existed"]:
+                    changes.append({"id": sid, "op": "removed", "version": acc["version"]})
+                continue
+            change = {"id": sid, "version": acc["version"], "record": current}
+            if not acc["existed"]:
+                change["op"] = "added"
+            else:
+                class_now = current.get(CLASS_FIELD)
+                change["op"] = "class_changed" if class_now != acc["class_from"] else "updated"
+                change["fields"] = sorted(acc["fields"])
+                if change["op"] == "class_changed":
+                    change["previous_class"] = acc["class_from"]
+            changes.append(change)
+        return self._response(since, version, False, changes)
+
+    @staticmethod
+    def _response(since: int, version: int, full: bool, changes: List[dict]) -> dict:
+        return {"since": since, "version": version, "full_resync": full, "count": len(changes), "changes": changes}
+
+    def stats(self) -> dict:
+        with self._locked():
+            return {
+                "version": self.version,
+                "oldest_delta_since": self.base,
+                "updated_at": self.updated_at,
+                "rows": len(self.records),
+                "versions_in_log": len(self._by_version),
+                "entries_in_log": sum(len(v) for v in self._by_version.values()),
+                "max_versions": self.max_versions,
+            }
+
+
+CHANGELOG = ChangeLog()
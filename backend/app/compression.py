@@ -0,0 +1,302 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Precompressed Response Variants
+
+Este módulo mantém variantes pré-compactadas (gzip e brotli) das respostas mais
+acessadas, geradas uma vez por versão do conjunto de dados e servidas por negociação
+de conteúdo via ``Accept-Encoding``. Só o aquecimento usa compactação máxima; numa
+falta de cache apenas a codificação negociada é gerada, em nível rápido, e as demais
+são acrescentadas à entrada quando algum cliente as pede. Cada variante tem seu
+próprio ETag. O cache é limitado em bytes. Respostas fora do cache continuam usando a
+compactação sob demanda do GZipMiddleware.
+
+This module keeps precompressed (gzip and brotli) variants of hot responses, produced
+once per dataset version and served by content negotiation on ``Accept-Encoding``.
+Only warming uses maximum effort; a cache miss encodes just the negotiated variant at
+a fast level, and the others are added to the entry the first time a client asks for
+them. Each variant has its own ETag. The cache is bounded in bytes. Uncached responses
+still fall back to on-the-fly GZipMiddleware compression.
+"""
+
+import os
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+try:  # optional dependency / dependência opcional
+    import brotli
+except ImportError:  # pragma: no cover - gzip-only without brotli
+    brotli = None
+
+
+# Same threshold the GZipMiddleware used / Mesmo limite usado pelo GZipMiddleware
+MINIMUM_SIZE = 800
+MAX_ENTRIES = int(os.getenv("ORBITHUB_PRECOMPRESSED_ENTRIES", "256"))
+MAX_BYTES = int(os.getenv("ORBITHUB_PRECOMPRESSED_BYTES", str(64 * 1024 * 1024)))
+# Maximum effort, for warm() only / Esforço máximo, apenas no warm()
+GZIP_LEVEL = 9
+# brotli quality 11 is too slow for multi-MB bodies / qualidade 11 é lenta para corpos grandes
+BROTLI_QUALITY_SMALL = 11
+BROTLI_QUALITY_LARGE = 6
+BROTLI_LARGE_BODY = 256 * 1024
+# Fast levels for variants built on a request miss / Níveis rápidos numa falta de cache
+GZIP_LEVEL_FAST = 6
+BROTLI_QUALITY_FAST = 5
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+class CompressedVariants:
+    """
+    One response body with its encoded variants and a per-encoding strong ETag.
+    Um corpo de resposta com suas variantes codificadas e um ETag forte por codificação.
+    """
+
+    __slots__ = ("media_type", "bodies", "digest")
+
+    def __init__(
+        self,
+        body: bytes,
+        media_type: str = "application/json",
+        encodings: Sequence[str] = ENCODINGS,
+        fast: bool = False,
+    ):
+        self.media_type = media_type
+        self.bodies: Dict[str, bytes] = {"identity": body}
+        self.digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+        for encoding in encodings:
+            self.encode(encoding, fast)
+
+    def encode(self, encoding: str, fast: bool = True) -> int:
+        """
+        Add the ``encoding`` variant if missing; returns the bytes added.
+        Adiciona a variante ``encoding`` se faltar; retorna os bytes adicionados.
+        """
+        body = self.bodies["identity"]
+        if encoding in self.bodies or len(body) < MINIMUM_SIZE:
+            return 0
+        if encoding == "gzip":
+            level = GZIP_LEVEL_FAST if fast else GZIP_LEVEL
+            encoded = gzip.compress(body, compresslevel=level, mtime=0)
+        elif encoding == "br" and brotli is not None:
+            if fast:
+                quality = BROTLI_QUALITY_FAST
+            elif len(body) > BROTLI_LARGE_BODY:
+                quality = BROTLI_QUALITY_LARGE
+            else:
+                quality = BROTLI_QUALITY_SMALL
+            encoded = brotli.compress(body, quality=quality)
+        else:
+            return 0
+        # dict assignment is atomic; a duplicate concurrent encode only wastes work
+        # atribuição em dict é atômica; uma codificação duplicada só desperdiça trabalho
+        self.bodies[encoding] = encoded
+        return len(encoded)
+
+    def missing(self, accept_encoding: str) -> Optional[str]:
+        """
+        Encoding the client prefers that has not been produced yet, or None.
+        Codificação preferida pelo cliente que ainda não foi gerada, ou None.
+        """
+        if len(self.bodies["identity"]) < MINIMUM_SIZE:
+            return None
+        encoding = negotiate(accept_encoding, ENCODINGS)
+        return None if encoding in self.bodies else encoding
+
+    def etag(self, encoding: str = "identity") -> str:
+        """
+        Strong ETag of one variant: the bytes differ per encoding, so the tags do too.
+        ETag forte de uma variante: os bytes mudam por codificação, então os tags também.
+        """
+        if encoding == "identity":
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(b) for b in self.bodies.values())
+
+
+def negotiate(accept_encoding: str, available: Iterable[str]) -> str:
+    """
+    Pick the best available encoding for an ``Accept-Encoding`` header.
+    Escolhe a melhor codificação disponível para um cabeçalho ``Accept-Encoding``.
+
+    Preference on equal q-values: br > gzip > identity.
+    """
+    prefs: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        prefs[token] = q
+    wildcard = prefs.get("*")
+    best, best_q = "identity", prefs.get("identity", 1.0 if wildcard is None else wildcard) * 0.999
+    for enc in ("br", "gzip"):
+        if enc not in available:
+            continue
+        q = prefs.get(enc, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+class PrecompressedCache:
+    """
+    LRU of CompressedVariants keyed by query, cleared whenever the dataset version changes.
+    LRU de CompressedVariants por consulta, limpa sempre que a versão dos dados muda.
+
+    Bounded both in entries and in total encoded bytes; a body larger than the whole
+    byte budget is served but not cached.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CompressedVariants]" = OrderedDict()
+        self._nbytes = 0
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _reset_if_stale(self, version: int) -> bool:
+        if self._version != version:
+            if self._version is not None and version < self._version:
+                return False  # late builder for an older snapshot / construtor atrasado
+            self._entries.clear()
+            self._nbytes = 0
+            self._version = version
+        return True
+
+    def lookup(self, version: int, key: Hashable) -> Optional[CompressedVariants]:
+        """Cached variants for ``key`` or None, without building / sem construir."""
+        with self._lock:
+            if self._version != version:
+                return None
+            found = self._entries.get(key)
+            if found is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return found
+
+    def get(
+        self,
+        version: int,
+        key: Hashable,
+        build: Callable[[], bytes],
+        media_type: str = "application/json",
+        accept_encoding: str = "",
+    ) -> CompressedVariants:
+        """
+        Return cached variants for ``key`` or build, compress and store them.
+        Retorna variantes em cache para ``key`` ou constrói, compacta e armazena.
+
+        A miss encodes only the variant negotiated for ``accept_encoding``, at a fast
+        level; warm() is where maximum-effort variants are produced.
+        """
+        with self._lock:
+            self._reset_if_stale(version)
+            found = self._entries.get(key)
+            if found is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return found
+            self.misses += 1
+        encoding = negotiate(accept_encoding, ENCODINGS)
+        encodings = () if encoding == "identity" else (encoding,)
+        variants = CompressedVariants(build(), media_type, encodings=encodings, fast=True)
+        self.put(version, key, variants)
+        return variants
+
+    def add_encoding(
+        self, version: int, key: Hashable, variants: CompressedVariants, encoding: str
+    ) -> CompressedVariants:
+        """
+        Encode a variant missing from a cached entry (fast level) and account its bytes.
+        Codifica uma variante ausente de uma entrada em cache (nível rápido) e conta seus bytes.
+
+        Later clients with the same ``Accept-Encoding`` then get it from the cache
+        instead of falling back to per-request GZipMiddleware compression.
+        """
+        added = variants.encode(encoding, fast=True)
+        with self._lock:
+            if added and self._version == version and self._entries.get(key) is variants:
+                self._nbytes += added
+                self._entries.move_to_end(key)
+                while self._nbytes > self.max_bytes and len(self._entries) > 1:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._nbytes -= evicted.nbytes
+        return variants
+
+    def put(self, version: int, key: Hashable, variants: CompressedVariants) -> None:
+        with self._lock:
+            if not self._reset_if_stale(version) or self._version != version:
+                return
+            nbytes = variants.nbytes
+            if nbytes > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            self._entries[key] = variants
+            self._nbytes += nbytes
+            while len(self._entries) > self.max_entries or self._nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def warm(self, version: int, builders: Iterable[Tuple[Hashable, Callable[[], bytes]]]) -> None:
+        """Precompress a set of hot queries for a new dataset version, at maximum effort."""
+        for key, build in builders:
+            self.put(version, key, CompressedVariants(build()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "version": self._version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "brotli": brotli is not None,
+            }
+
+
+def precompressed_response(
+    variants: CompressedVariants,
+    accept_encoding: str,
+    if_none_match: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Build a Response serving the negotiated variant (or 304 on a matching ETag).
+    Constrói uma Response com a variante negociada (ou 304 se o ETag coincidir).
+    """
+    out = dict(headers or {})
+    out["Vary"] = "Accept, Accept-Encoding"
+    encoding = negotiate(accept_encoding, variants.bodies)
+    out["ETag"] = variants.etag(encoding)
+    if if_none_match:
+        # any variant of the same body is still a valid cached copy
+        # qualquer variante do mesmo corpo continua sendo uma cópia válida em cache
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if "*" in tags or any(variants.etag(e) in tags for e in variants.bodies):
+            return Response(status_code=304, headers=out)
+    if encoding != "identity":
+        out["Content-Encoding"] = encoding
+    return Response(variants.bodies[encoding], media_type=variants.media_type, headers=out)
+
+PRECOMPRESSED = PrecompressedCache()
@@ -17,13 +17,24 @@ from functools import lru_cache
 
 import pandas as pd
 
-from .features import load_ucs_from_data_raw, engineer_features
+from .feature_store import load_source, load_features
+from .catalog import read_serving_csv, compact_frame, contains_mask
+from .reload import ReloadManager, Snapshot
+from .xref import build_xref, load_or_build_xref
+from .ingest import ELEMENT_STORE, read_celestrak_csv
+from .decay import DECAY_ESTIMATES, load_estimates
 from joblib import load
 
 
 # Directory paths / Caminhos de diretórios
 MODELS_DIR = os.path.join("app", "models")
 CLASSIFIED_CSV = os.path.join("..", "data", "processed", "satellites_classified.csv")
+CELESTRAK_CSV = os.path.join("..", "data", "raw", "Celestrak_data.csv")
+MODEL_FILES = [
+    os.path.join(MODELS_DIR, "preprocessor.joblib"),
+    os.path.join(MODELS_DIR, "kmeans.joblib"),
+    os.path.join(MODELS_DIR, "cluster_label_map.json"),
+]
 
 
 def _load_artifacts():
@@ -60,8 +71,8 @@ def get_classified_satellites(force_recompute: bool = False) -> pd.DataFrame:
         return load_classified_df()
 
     # Compute classification / Computa classificação
-    df_raw, _ = load_ucs_from_data_raw()
-    feats = engineer_features(df_raw)
+    df_raw = load_source()
+    feats, _ = load_features()
     pre, model, label_map = _load_artifacts()
     X = pre.transform(feats)
     clusters = model.predict(X)
@@ -74,11 +85,8 @@ def get_classified_satellites(force_recompute: bool = False) -> pd.DataFrame:
     # Persist for quicker reads later / Persiste para leituras mais rápidas depois
     os.makedirs(os.path.dirname(CLASSIFIED_CSV), exist_ok=True)
     out.to_csv(CLASSIFIED_CSV, index=False)
-    # refresh in‑memory cache / atualiza cache em memória
-    try:
-        load_classified_df.cache_clear()  # type: ignore[attr-defined]
-    except Exception:
-        pass
+    # refresh in‑memory snapshot in the background / atualiza snapshot em memória em segundo plano
+    RELOADER.trigger()
     return out
 
 
@@ -116,34 +124,19 @@ def _find_col(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
     return None
 
 
-def filter_satellites(
-    classification: Optional[str] = None,
-    purpose: Optional[str] = None,
-    delivery: Optional[str] = None,
-    limit: int = 50,
-) -> List[dict]:
+def _filter_frame(
+    classification: Optional[str],
+    purpose: Optional[str],
+    limit: int,
+    snap: Snapshot,
+) -> pd.DataFrame:
     """
-    Filter satellites by classification, purpose, and delivery method.
-    Filtra satélites por classificação, finalidade e método de entrega.
-    
-    Args:
-        classification: Sustainability class filter (OURO/PRATA/BRONZE)
-        purpose: Purpose keyword filter
-        delivery: Delivery method preference (API/Batch) - not currently used in filtering
-        limit: Maximum number of results to return
-        
-    Returns:
-        List of satellite records with detailed information
+    Filter engine shared by the JSON records and the columnar formats.
+    Motor de filtro compartilhado pelos registros JSON e pelos formatos colunares.
     """
-    # Special branch: Pending classification → list from Celestrak CSV
-    # Ramo especial: Pendente de classificação → lista do CSV Celestrak
-    norm_class = (classification or "").strip().upper()
-    if norm_class in {"PENDENTE", "PENDENTE DE CLASSIFICAÇÃO", "PENDING", "PENDING CLASSIFICATION"}:
-        return _list_pending_from_celestrak(limit=limit)
-
     # Get all classified satellites / Obtém todos os satélites classificados
-    # Use cached DataFrame / Usa DataFrame em cache
-    df = load_classified_df()
+    # Use compact DataFrame from the snapshot / Usa DataFrame compacto do snapshot
+    df = snap["serving"]
 
     df_f = df
     
@@ -155,7 +148,7 @@ def filter_satellites(
     # Filtra por finalidade: busca na coluna Purpose ou usa outras colunas como fallback
     if purpose:
         if "Purpose" in df_f.columns:
-            mask = df_f["Purpose"].astype(str).str.contains(purpose, case=False, na=False)
+            mask = contains_mask(df_f["Purpose"], purpose)
         else:
             # Fallback: search in object-related columns
             # Fallback: busca em colunas relacionadas ao objeto
@@ -163,13 +156,11 @@ def filter_satellites(
             if search_cols:
                 mask = False
                 for c in search_cols:
-                    mask = mask | df_f[c].astype(str).str.contains(purpose, case=False, na=False)
+                    mask = mask | contains_mask(df_f[c], purpose)
             else:
                 mask = pd.Series([True] * len(df_f), index=df_f.index)
         df_f = df_f[mask]
 
-    # Build response with expected semantic fields using exact column names from CSV
-    # Constrói resposta com campos semânticos esperados usando nomes exatos de colunas do CSV
     # select only necessary columns before iterating / seleciona apenas colunas necessárias
     needed_cols = [
         "Name of Satellite, Alternate Names",
@@ -187,7 +178,43 @@ def filter_satellites(
     # apply limit early to reduce iteration cost / aplica limite cedo
     if limit and limit > 0:
         df_sel = df_sel.head(limit)
+    return df_sel
 
+
+def filter_satellites(
+    classification: Optional[str] = None,
+    purpose: Optional[str] = None,
+    delivery: Optional[str] = None,
+    limit: int = 50,
+    snap: Optional[Snapshot] = None,
+) -> List[dict]:
+    """
+    Filter satellites by classification, purpose, and delivery method.
+    Filtra satélites por classificação, finalidade e método de entrega.
+    
+    Args:
+        classification: Sustainability class filter (OURO/PRATA/BRONZE)
+        purpose: Purpose keyword filter
+        delivery: Delivery method preference (API/Batch) - not currently used in filtering
+        limit: Maximum number of results to return
+        snap: Dataset snapshot to read from (defaults to the live one)
+        
+    Returns:
+        List of satellite records with detailed information
+    """
+    # Pin one snapshot for the whole request / Fixa um snapshot para toda a requisição
+    snap = snap or current_snapshot()
+
+    # Special branch: Pending classification → list from Celestrak CSV
+    # Ramo especial: Pendente de classificação → lista do CSV Celestrak
+    norm_class = (classification or "").strip().upper()
+    if norm_class in PENDING_CLASSES:
+        return _list_pending_from_celestrak(limit=limit, snap=snap)
+
+    df_sel = _filter_frame(classification, purpose, limit, snap)
+
+    # Build response with expected semantic fields using exact column names from CSV
+    # Constrói resposta com campos semânticos esperados usando nomes exatos de colunas do CSV
     records: List[dict] = []
     for _, row in df_sel.iterrows():
         # Get satellite name and extract alternate name if exists
@@ -210,20 +237,91 @@ def filter_satellites(
     return records
 
 
-def _list_pending_from_celestrak(limit: int = 50) -> List[dict]:
+def _clean_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Column-wise ``_safe_get``: missing → all null, values as text (categoricals kept)."""
+    if column not in df.columns:
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+    col = df[column]
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        if not all(isinstance(c, str) for c in col.cat.categories):
+            col = col.cat.rename_categories([str(c) for c in col.cat.categories])
+        return col
+    return col.astype(object).map(lambda v: None if pd.isna(v) else str(v))
+
+
+def satellite_columns(
+    classification: Optional[str] = None,
+    purpose: Optional[str] = None,
+    limit: int = 50,
+    snap: Optional[Snapshot] = None,
+) -> pd.DataFrame:
     """
-    Load a lightweight list of satellites from Celestrak CSV for the
-    "Pending Classification" category. Missing fields are returned as "--".
+    Same rows and fields as ``filter_satellites``, built column by column (no dict per
+    row); low-cardinality fields stay categorical for dictionary-encoded formats.
 
-    Carrega uma lista leve de satélites do CSV Celestrak para a categoria
-    "Pendente de Classificação". Campos ausentes retornam "--".
+    Mesmas linhas e campos de ``filter_satellites``, construídos coluna a coluna (sem
+    dict por linha); campos de baixa cardinalidade seguem categóricos.
     """
-    # Load cached Celestrak CSV / Carrega CSV Celestrak em cache
-    df = load_celestrak_df()
+    snap = snap or current_snapshot()
+    norm_class = (classification or "").strip().upper()
+    if norm_class in PENDING_CLASSES:
+        pending = _pending_frame(limit, snap)
+        names = pending["name"].astype(object) if "name" in pending.columns else pd.Series([None] * len(pending))
+        n = len(pending)
+        dash = pd.Categorical(["--"] * n)
+        return pd.DataFrame({
+            "name_of_satellite": [str(v) if pd.notna(v) else "--" for v in names],
+            "alternate_names": dash,
+            "country_un_registry": dash,
+            "country_operator_owner": dash,
+            "operator_owner": dash,
+            "purpose": dash,
+            "detailed_purpose": dash,
+            "sustainability_class": pd.Categorical(["PENDENTE DE CLASSIFICAÇÃO"] * n),
+        })
+
+    df_sel = _filter_frame(classification, purpose, limit, snap)
+    full = _clean_column(df_sel, "Name of Satellite, Alternate Names")
+    current = _clean_column(df_sel, "Current Official Name of Satellite")
+    # `current or full` and `full if full != current else None`, vectorized
+    has_current = current.notna() & current.astype(object).ne("")
+    return pd.DataFrame({
+        "name_of_satellite": current.astype(object).where(has_current, full.astype(object)),
+        "alternate_names": full.astype(object).where(full.astype(object).ne(current.astype(object)) & full.notna()),
+        "country_un_registry": _clean_column(df_sel, "Country/Org of UN Registry"),
+        "country_operator_owner": _clean_column(df_sel, "Country of Operator/Owner"),
+        "operator_owner": _clean_column(df_sel, "Operator/Owner"),
+        "purpose": _clean_column(df_sel, "Purpose"),
+        "detailed_purpose": _clean_column(df_sel, "Detailed Purpose"),
+        "sustainability_class": _clean_column(df_sel, "SUSTAINABILITY_CLASS"),
+    }).reset_index(drop=True)
+
+
+def _pending_frame(limit: int, snap: Snapshot) -> pd.DataFrame:
+    # Celestrak data from the live snapshot / Dados Celestrak do snapshot ativo
+    df = snap["celestrak"]
+
+    # Skip objects already linked to a classified UCS record
+    # Ignora objetos já ligados a um registro UCS classificado
+    xref = snap.get("xref")
+    if xref is not None and len(xref) == len(df):
+        df = df[xref["ucs_row"].isna().to_numpy()]
 
     # Ensure we only take up to limit rows
     if limit and limit > 0:
         df = df.head(limit)
+    return df
+
+
+def _list_pending_from_celestrak(limit: int = 50, snap: Optional[Snapshot] = None) -> List[dict]:
+    """
+    Load a lightweight list of satellites from Celestrak CSV for the
+    "Pending Classification" category. Missing fields are returned as "--".
+
+    Carrega uma lista leve de satélites do CSV Celestrak para a categoria
+    "Pendente de Classificação". Campos ausentes retornam "--".
+    """
+    df = _pending_frame(limit, snap or current_snapshot())
 
     records: List[dict] = []
     for _, row in df.iterrows():
@@ -243,23 +341,236 @@ def _list_pending_from_celestrak(limit: int = 50) -> List[dict]:
     return records
 
 
-# ---------- Lightweight cached loaders (performance) ----------
+def _stable_ids(norads, names) -> List[str]:
+    """NORAD number as text ("25544"), "-2", "-3"... on repeats, "name:<NAME>" without NORAD."""
+    seen = {}
+    out: List[str] = []
+    for norad, name in zip(norads, names):
+        if pd.notna(norad):
+            base = str(int(norad))
+        else:
+            base = "name:" + " ".join(str(name or "").upper().split())
+        seen[base] = seen.get(base, 0) + 1
+        out.append(base if seen[base] == 1 else f"{base}-{seen[base]}")
+    return out
 
-@lru_cache(maxsize=1)
-def load_celestrak_df() -> pd.DataFrame:
-    """Load Celestrak CSV once and keep in memory."""
-    csv_path = os.path.join("..", "data", "raw", "Celestrak_data.csv")
+
+def catalog_records(snap: Optional[Snapshot] = None) -> dict:
+    """
+    Every record served by /satellites (classified and pending), keyed by a stable
+    satellite ID. Feeds the change log of each dataset build.
+
+    Todos os registros servidos por /satellites (classificados e pendentes), indexados
+    por um ID estável do satélite. Alimenta o log de mudanças de cada build.
+    """
+    snap = snap or current_snapshot()
+    serving = snap["serving"]
+    classified = filter_satellites(limit=0, snap=snap)
+    norads = serving["NORAD Number"].tolist() if "NORAD Number" in serving.columns else [None] * len(serving)
+    ids = _stable_ids(norads, [r["name_of_satellite"] for r in classified])
+
+    # pending rows, in the order _list_pending_from_celestrak yields them
+    # linhas pendentes, na ordem em que _list_pending_from_celestrak as produz
+    cel = snap["celestrak"]
+    xref = snap.get("xref")
+    if xref is not None and len(xref) == len(cel):
+        pending_norads = xref["norad_id"][xref["ucs_row"].isna()].tolist()
+    else:
+        pending_norads = pd.to_numeric(cel.get("norad_cat_id", pd.Series([None] * len(cel))), errors="coerce").tolist()
+    pending = _list_pending_from_celestrak(limit=0, snap=snap)
+    taken = set(ids)
+    pending_ids = [
+        pid if pid not in taken else f"cel:{pid}"
+        for pid in _stable_ids(pending_norads, [r["name_of_satellite"] for r in pending])
+    ]
+
+    out = {}
+    for sid, norad, rec in zip(ids + pending_ids, norads + pending_norads, classified + pending):
+        out[sid] = {"id": sid, "norad_id": int(norad) if pd.notna(norad) else None, **rec}
+    return out
+
+
+PENDING_CLASSES = {"PENDENTE", "PENDENTE DE CLASSIFICAÇÃO", "PENDING", "PENDING CLASSIFICATION"}
+
+
+def list_tle_objects(
+    classification: Optional[str] = None,
+    purpose: Optional[str] = None,
+    snap: Optional[Snapshot] = None,
+) -> List[dict]:
+    """
+    Celestrak objects with TLEs, joined to the classified catalog via the cross-reference.
+    Objetos Celestrak com TLEs, ligados ao catálogo classificado pela referência cruzada.
+
+    When the element store holds a newer TLE for a NORAD number (or the CSV row has
+    none), the ingested TLE is used instead.
+    Quando o repositório de elementos tem um TLE mais novo (ou a linha do CSV não tem
+    TLE), usa-se o TLE ingerido.
+
+    Args:
+        classification: Sustainability class filter (pending = objects not classified)
+        purpose: Purpose keyword filter (classified objects only)
+        snap: Dataset snapshot to read from (defaults to the live one)
+
+    Returns:
+        List of dicts with name, norad_id, sustainability_class, purpose and TLE lines
+    """
+    snap = snap or current_snapshot()
+    cel = snap["celestrak"]
+    if "tle_line1" not in cel.columns or "tle_line2" not in cel.columns:
+        return []
+    xref = snap["xref"]
+    if len(xref) != len(cel):
+        # zip below pairs rows by position: rebuild rather than misalign them
+        # o zip abaixo pareia linhas por posição: reconstrói em vez de desalinhar
+        xref, _ = build_xref(cel, snap["serving"])
+    line1, line2 = cel["tle_line1"].astype(object), cel["tle_line2"].astype(object)
+    elements = snap.get("elements")
+    if elements is not None and len(elements):
+        ingested = elements.reindex(xref["norad_id"].to_numpy())
+        csv_epoch = pd.to_datetime(cel.get("epoch", pd.Series(None, index=cel.index)), utc=True, errors="coerce")
+        # NaT compares False, so rows without a usable CSV epoch take the ingested TLE
+        # NaT compara como False, então linhas sem época válida no CSV usam o TLE ingerido
+        use = ingested["tle_line1"].notna().to_numpy() & (
+            line1.isna().to_numpy() | ~(csv_epoch.to_numpy() >= ingested["epoch"].to_numpy())
+        )
+        line1 = line1.where(~use, ingested["tle_line1"].to_numpy())
+        line2 = line2.where(~use, ingested["tle_line2"].to_numpy())
+    has_tle = (line1.notna() & line2.notna()).to_numpy()
+
+    serving = snap["serving"]
+    classes = serving["SUSTAINABILITY_CLASS"].astype(object).to_numpy()
+    purposes = serving["Purpose"].astype(object).to_numpy() if "Purpose" in serving.columns else None
+    # same matcher as filter_satellites, once per serving row / mesmo filtro de filter_satellites
+    purpose_ok = None
+    if purpose:
+        if purposes is not None:
+            purpose_ok = contains_mask(serving["Purpose"], purpose).to_numpy()
+        else:
+            purpose_ok = [False] * len(serving)
+
+    norm_class = (classification or "").strip().upper()
+    wanted_pending = norm_class in PENDING_CLASSES
+
+    out: List[dict] = []
+    rows = zip(cel["name"], line1, line2, xref["norad_id"], xref["ucs_row"], has_tle)
+    for name, l1, l2, norad, ucs_row, ok in rows:
+        if not ok:
+            continue
+        matched = pd.notna(ucs_row)
+        sclass = classes[int(ucs_row)] if matched else None
+        spurpose = purposes[int(ucs_row)] if matched and purposes is not None else None
+        if norm_class:
+            if wanted_pending:
+                if matched:
+                    continue
+            elif sclass is None or str(sclass).upper() != norm_class:
+                continue
+        if purpose_ok is not None and not (matched and purpose_ok[int(ucs_row)]):
+            continue
+        out.append({
+            "name": str(name) if pd.notna(name) else None,
+            "norad_id": int(norad) if pd.notna(norad) else None,
+            "sustainability_class": _clean_value(sclass) if matched else "PENDENTE DE CLASSIFICAÇÃO",
+            "purpose": _clean_value(spurpose),
+            "tle_line1": l1,
+            "tle_line2": l2,
+        })
+    return out
+
+
+# ---------- Snapshot loaders (performance + hot reload) ----------
+
+def _read_celestrak_csv() -> pd.DataFrame:
+    """Read the Celestrak CSV from disk / Lê o CSV Celestrak do disco."""
+    return read_celestrak_csv(CELESTRAK_CSV)
+
+
+def _read_latest_elements() -> Optional[pd.DataFrame]:
+    """
+    Newest ingested TLE per NORAD number (see app.ingest), None before any ingest.
+    TLE mais recente ingerido por NORAD (ver app.ingest), None antes de qualquer ingestão.
+    """
+    if not os.path.exists(ELEMENT_STORE.latest_path):
+        return None
+    latest = pd.read_parquet(ELEMENT_STORE.latest_path, columns=["norad_id", "epoch", "tle_line1", "tle_line2"])
+    return latest[latest["tle_line1"].notna() & latest["tle_line2"].notna()].set_index("norad_id")
+
+
+def _build_snapshot(fingerprints: Optional[dict] = None) -> dict:
+    """
+    Build every in-memory dataset/model served by the API.
+    Constrói todos os dados/modelos em memória servidos pela API.
+
+    Args:
+        fingerprints: Content hashes of the watched files (keys the persisted xref)
+    """
+    if os.path.exists(CLASSIFIED_CSV):
+        serving = read_serving_csv(CLASSIFIED_CSV)
+    else:
+        serving = compact_frame(get_classified_satellites(force_recompute=True))
     try:
-        return pd.read_csv(csv_path, sep=";", engine="python")
+        artifacts = _load_artifacts()
     except Exception:
-        return pd.read_csv(csv_path)
+        artifacts = None
+    celestrak = _read_celestrak_csv()
+    inputs = {k: (fingerprints or {}).get(k) for k in (CELESTRAK_CSV, CLASSIFIED_CSV)}
+    xref, xref_report = load_or_build_xref(celestrak, serving, inputs)
+    return {
+        "serving": serving,
+        "celestrak": celestrak,
+        "xref": xref,
+        "xref_report": xref_report,
+        "elements": _read_latest_elements(),
+        "decay": load_estimates(),
+        "artifacts": artifacts,
+    }
+
+
+RELOADER = ReloadManager(
+    [CLASSIFIED_CSV, CELESTRAK_CSV, ELEMENT_STORE.latest_path, DECAY_ESTIMATES] + MODEL_FILES, _build_snapshot
+)
+
+
+def current_snapshot() -> Snapshot:
+    """
+    Live datasets/models snapshot; swapped atomically when files change.
+    Snapshot ativo de dados/modelos; trocado atomicamente quando os arquivos mudam.
+    """
+    return RELOADER.current()
+
+
+def load_celestrak_df() -> pd.DataFrame:
+    """Celestrak DataFrame of the live snapshot."""
+    return current_snapshot()["celestrak"]
+
+
+def load_serving_df() -> pd.DataFrame:
+    """
+    Compact serving catalog (API columns only, categorical/float32 dtypes).
+    Catálogo compacto de serviço (apenas colunas da API, tipos category/float32).
+    """
+    return current_snapshot()["serving"]
+
+
+def load_artifacts_snapshot():
+    """Model artifacts (preprocessor, kmeans, label_map) of the live snapshot."""
+    artifacts = current_snapshot()["artifacts"]
+    if artifacts is None:
+        raise FileNotFoundError(f"Model artifacts not found in {MODELS_DIR}")
+    return artifacts
 
 
 @lru_cache(maxsize=1)
+def _read_classified_csv(signature: Tuple[int, int]) -> pd.DataFrame:
+    return pd.read_csv(CLASSIFIED_CSV)
+
+
 def load_classified_df() -> pd.DataFrame:
-    """Load classified satellites CSV once; compute if missing."""
+    """Load full classified satellites CSV (re-read when the file changes); compute if missing."""
     if os.path.exists(CLASSIFIED_CSV):
-        return pd.read_csv(CLASSIFIED_CSV)
+        st = os.stat(CLASSIFIED_CSV)
+        return _read_classified_csv((st.st_mtime_ns, st.st_size))
     # compute and return if file not present
     return get_classified_satellites(force_recompute=True)
 
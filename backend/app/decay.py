@@ -0,0 +1,428 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Orbital Decay and Lifetime Estimation
+
+Este módulo estima, para o catálogo inteiro, o tempo de vida orbital restante e a
+janela de reentrada a partir dos elementos TLE: semieixo e excentricidade (do
+movimento médio), o termo de arrasto B* e a derivada do movimento médio. O arrasto
+é integrado com as equações médias de King-Hele sobre um modelo exponencial por
+camadas da atmosfera; a razão área/massa efetiva é calibrada pelo decaimento
+observado (tendência do movimento médio no histórico de TLEs, ou o ṅ do próprio TLE)
+e, na falta dele, derivada do B*. O cálculo é vetorizado por lote e os lotes rodam
+num pool de processos em catálogos grandes.
+
+This module estimates remaining orbital lifetime and the reentry window for the whole
+catalog from TLE elements: semi-major axis and eccentricity (from the mean motion),
+the B* drag term and the mean-motion derivative. Drag is integrated with King-Hele's
+orbit-averaged equations over a layered exponential atmosphere model; the effective
+area-to-mass ratio is calibrated from the observed decay (mean-motion trend across
+the TLE history, or the TLE's own ṅ) and derived from B* otherwise. The computation
+is vectorized per chunk and chunks run in a process pool for large catalogs.
+"""
+
+import os
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .ingest import ELEMENT_STORE, ElementStore, read_elements
+
+
+DECAY_ESTIMATES = os.path.join(os.path.dirname(ELEMENT_STORE.latest_path), "decay_estimates.parquet")
+DECAY_WORKERS = int(os.getenv("ORBITHUB_DECAY_WORKERS", str(os.cpu_count() or 1)))
+DECAY_CHUNK = 4096  # element sets per parallel task / conjuntos por tarefa paralela
+# Lifetimes beyond this are reported as "beyond horizon" / Além disso: fora do horizonte
+HORIZON_YEARS = float(os.getenv("ORBITHUB_DECAY_HORIZON_YEARS", "200"))
+# Reentry window half-width as a share of the remaining lifetime
+# Meia largura da janela de reentrada como fração do tempo de vida restante
+UNCERTAINTY = float(os.getenv("ORBITHUB_DECAY_UNCERTAINTY", "0.25"))
+# Mean-motion history fitted for the observed decay rate / Histórico usado no ajuste
+HISTORY_DAYS = 60
+
+MU = 398600.8  # km^3/s^2 (WGS-72, as used by SGP4)
+RE = 6378.135  # km
+REENTRY_KM = 120.0
+# Observed decay only trusted where drag dominates the mean-motion change
+# Decaimento observado só é confiável onde o arrasto domina a variação de n
+DRAG_CEILING_KM = 1000.0
+# Perigees above this do not decay within any useful horizon
+# Perigeus acima disso não decaem em horizonte útil
+STABLE_PERIGEE_KM = 2000.0
+# SGP4 reference density: Cd*A/m [m^2/kg] = 2 * B* [1/ER] / RHO0
+RHO0 = 0.15696615
+AREA_TO_MASS_RANGE = (1e-5, 50.0)  # plausible Cd*A/m in m^2/kg
+
+# Layered exponential atmosphere (base altitude km, density kg/m^3, scale height km),
+# mean solar activity (Vallado, Fundamentals of Astrodynamics, table 8-4)
+# Atmosfera exponencial por camadas, atividade solar média
+_ATMOSPHERE = np.array([
+    (100, 5.297e-7, 5.877),
+    (110, 9.661e-8, 7.263),
+    (120, 2.438e-8, 9.473),
+    (130, 8.484e-9, 12.636),
+    (140, 3.845e-9, 16.149),
+    (150, 2.070e-9, 22.523),
+    (180, 5.464e-10, 29.740),
+    (200, 2.789e-10, 37.105),
+    (250, 7.248e-11, 45.546),
+    (300, 2.418e-11, 53.628),
+    (350, 9.518e-12, 53.298),
+    (400, 3.725e-12, 58.515),
+    (450, 1.585e-12, 60.828),
+    (500, 6.967e-13, 63.822),
+    (600, 1.454e-13, 71.835),
+    (700, 3.614e-14, 88.667),
+    (800, 1.170e-14, 124.64),
+    (900, 5.245e-15, 181.05),
+    (1000, 3.019e-15, 268.00),
+])
+_BASE, _DENSITY, _SCALE = _ATMOSPHERE.T
+
+# Quadrature over eccentric anomaly E in [0, pi], nodes packed near perigee (E = pi*u^2)
+# Quadratura na anomalia excêntrica, com nós concentrados perto do perigeu
+_NODES = 64
+_U = (np.arange(_NODES) + 0.5) / _NODES
+_E = np.pi * _U**2
+_W = 2.0 * np.pi * _U / _NODES
+_COS_E = np.cos(_E)
+
+MAX_STEPS = 3000
+STEP_FRACTION = 0.5  # max semi-major axis change per step, in scale heights
+
+ESTIMATE_COLUMNS = [
+    "norad_id",
+    "name",
+    "epoch",
+    "perigee_km",
+    "apogee_km",
+    "method",
+    "area_to_mass",
+    "decay_rate_km_day",
+    "lifetime_years",
+    "beyond_horizon",
+    "reentry_epoch",
+    "reentry_earliest",
+    "reentry_latest",
+]
+
+
+def density(alt_km: np.ndarray) -> np.ndarray:
+    """Atmospheric density (kg/m^3) at geodetic altitude / Densidade atmosférica."""
+    layer = np.clip(np.searchsorted(_BASE, alt_km, side="right") - 1, 0, len(_BASE) - 1)
+    return _DENSITY[layer] * np.exp(-(alt_km - _BASE[layer]) / _SCALE[layer])
+
+
+def scale_height(alt_km: np.ndarray) -> np.ndarray:
+    layer = np.clip(np.searchsorted(_BASE, alt_km, side="right") - 1, 0, len(_BASE) - 1)
+    return _SCALE[layer]
+
+
+def semi_major_axis(mean_motion: np.ndarray) -> np.ndarray:
+    """Semi-major axis (km) from mean motion (rev/day) / Semieixo maior a partir de n."""
+    n = mean_motion * 2.0 * np.pi / 86400.0
+    return np.cbrt(MU / n**2)
+
+
+def _rates(a: np.ndarray, e: np.ndarray, area_to_mass: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Orbit-averaged da/dt (km/day) and de/dt (1/day) from drag (King-Hele, no
+    atmospheric rotation), integrating density over the eccentric anomaly.
+    """
+    ecos = e[:, None] * _COS_E[None, :]
+    alt = a[:, None] * (1.0 - ecos) - RE
+    rho = density(alt)
+    ratio = np.sqrt((1.0 + ecos) / (1.0 - ecos))
+    # ∫_0^2π = 2 ∫_0^π (integrands are even in E)
+    i_a = 2.0 * (rho * (1.0 + ecos) * ratio) @ _W
+    i_e = 2.0 * (rho * ratio * _COS_E[None, :]) @ _W
+    k = area_to_mass * 1000.0  # m^2/kg * kg/m^3 → 1/m → 1/km
+    period_days = 2.0 * np.pi * np.sqrt(a**3 / MU) / 86400.0
+    da = -k * a**2 * i_a / period_days
+    de = -k * a * (1.0 - e**2) * i_e / period_days
+    return da, de
+
+
+def _propagate(a: np.ndarray, e: np.ndarray, area_to_mass: np.ndarray, horizon_days: float) -> np.ndarray:
+    """
+    Days until perigee falls below REENTRY_KM (RK2, step sized to the local scale
+    height); NaN when that is beyond ``horizon_days``.
+    Dias até o perigeu cair abaixo de REENTRY_KM; NaN se além do horizonte.
+    """
+    a, e = a.astype(np.float64).copy(), e.astype(np.float64).copy()
+    t = np.zeros(len(a))
+    out = np.full(len(a), np.nan)
+    live = np.flatnonzero(np.isfinite(a) & np.isfinite(e) & (area_to_mass > 0))
+    hp0 = a[live] * (1.0 - e[live]) - RE
+    done = hp0 <= REENTRY_KM
+    out[live[done]] = 0.0
+    live = live[~done]
+    for _ in range(MAX_STEPS):
+        if live.size == 0:
+            break
+        al, el, bl = a[live], e[live], area_to_mass[live]
+        hp = al * (1.0 - el) - RE
+        da, de = _rates(al, el, bl)
+        # cap Δa at a fraction of the perigee scale height, or 2% of the apogee
+        # height for eccentric orbits where the apogee does most of the decaying
+        # limita Δa a uma fração da altura de escala (ou 2% do apogeu em órbitas excêntricas)
+        max_step = np.maximum(STEP_FRACTION * scale_height(hp), 0.02 * (al * (1.0 + el) - RE - REENTRY_KM))
+        dt = max_step / np.maximum(-da, 1e-300)
+        a_mid = al + 0.5 * dt * da
+        e_mid = np.clip(el + 0.5 * dt * de, 0.0, 0.99)
+        da2, de2 = _rates(a_mid, e_mid, bl)
+        a_new = al + dt * da2
+        e_new = np.clip(el + dt * de2, 0.0, 0.99)
+        hp_new = a_new * (1.0 - e_new) - RE
+        t_new = t[live] + dt
+
+        reentered = hp_new <= REENTRY_KM
+        # interpolate the crossing inside the last step / interpola o cruzamento no passo
+        frac = np.clip((hp - REENTRY_KM) / np.maximum(hp - hp_new, 1e-12), 0.0, 1.0)
+        out[live[reentered]] = (t[live] + frac * dt)[reentered]
+        a[live], e[live], t[live] = a_new, e_new, t_new
+        live = live[~reentered & (t_new < horizon_days)]
+    out[out > horizon_days] = np.nan
+    return out
+
+
+def _estimate_chunk(
+    mean_motion: np.ndarray,
+    eccentricity: np.ndarray,
+    bstar: np.ndarray,
+    observed_ndot: np.ndarray,
+    observed_method: np.ndarray,
+    horizon_days: float,
+) -> dict:
+    """
+    Vectorized lifetime estimate of one chunk (runs in worker processes).
+    Estimativa vetorizada de um lote (roda nos processos do pool).
+    """
+    n = len(mean_motion)
+    a = semi_major_axis(mean_motion)
+    e = np.clip(np.nan_to_num(eccentricity, nan=0.0), 0.0, 0.99)
+    perigee = a * (1.0 - e) - RE
+    apogee = a * (1.0 + e) - RE
+
+    unit_da, _ = _rates(a, e, np.ones(n))
+    # observed: da/dt = -(2/3) (a/n) dn/dt, with dn/dt = 2 * (ṅ/2 from the TLE field)
+    # observado: da/dt = -(2/3) (a/n) dn/dt, com dn/dt = 2 * (ṅ/2 do campo do TLE)
+    observed_da = -(2.0 / 3.0) * a / mean_motion * (2.0 * observed_ndot)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        from_observed = observed_da / unit_da
+    from_bstar = 2.0 * bstar / RHO0
+    lo, hi = AREA_TO_MASS_RANGE
+
+    use_observed = (observed_ndot > 0) & (perigee < DRAG_CEILING_KM) & (from_observed >= lo) & (from_observed <= hi)
+    use_bstar = ~use_observed & (from_bstar >= lo) & (from_bstar <= hi)
+    stable = perigee >= STABLE_PERIGEE_KM
+    area_to_mass = np.where(use_observed, from_observed, np.where(use_bstar, from_bstar, np.nan))
+    area_to_mass[stable] = np.nan
+
+    method = np.full(n, "none", dtype=object)
+    method[use_bstar] = "bstar"
+    method[use_observed] = observed_method[use_observed]
+    method[stable] = "stable"
+
+    days = np.full(n, np.nan)
+    todo = np.flatnonzero(np.isfinite(area_to_mass) & np.isfinite(a))
+    if todo.size:
+        days[todo] = _propagate(a[todo], e[todo], area_to_mass[todo], horizon_days)
+    beyond = stable | (np.isfinite(area_to_mass) & np.isnan(days))
+    return {
+        "perigee_km": perigee,
+        "apogee_km": apogee,
+        "method": method,
+        "area_to_mass": area_to_mass,
+        "decay_rate_km_day": np.where(np.isfinite(area_to_mass), unit_da * area_to_mass, np.nan),
+        "lifetime_days": days,
+        "beyond_horizon": beyond,
+    }
+
+
+def observed_decay(elements: pd.DataFrame, history: Optional[pd.DataFrame] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Observed ṅ/2 (rev/day²) per element set: least-squares slope of the mean motion
+    over the last HISTORY_DAYS of TLE history when there are enough sets, else the
+    TLE's own mean-motion derivative.
+    ṅ/2 observado por conjunto: inclinação da reta de n no histórico recente, ou o ṅ do TLE.
+
+    Returns:
+        (ṅ/2 per row, method label per row: "history" or "mean_motion_dot")
+    """
+    ndot = elements["mean_motion_dot"].to_numpy(dtype=np.float64, na_value=np.nan)
+    method = np.full(len(elements), "mean_motion_dot", dtype=object)
+    if history is None or history.empty:
+        return ndot, method
+
+    latest = elements[["norad_id", "epoch", "mean_motion"]]
+    points = pd.concat([history[["norad_id", "epoch", "mean_motion"]], latest], ignore_index=True)
+    points = points.dropna().drop_duplicates(["norad_id", "epoch"])
+    points["epoch"] = pd.to_datetime(points["epoch"], utc=True)
+    newest = points.groupby("norad_id")["epoch"].transform("max")
+    x = (points["epoch"] - newest).dt.total_seconds() / 86400.0
+    points = points.assign(x=x)[x >= -HISTORY_DAYS]
+    # per-object linear regression from grouped sums / regressão linear por objeto via somas
+    points = points.assign(xy=points["x"] * points["mean_motion"], xx=points["x"] ** 2)
+    sums = points.groupby("norad_id").agg(
+        count=("x", "size"), sx=("x", "sum"), sy=("mean_motion", "sum"), sxy=("xy", "sum"), sxx=("xx", "sum"),
+        span=("x", "min"),
+    )
+    var = sums["count"] * sums["sxx"] - sums["sx"] ** 2
+    slope = (sums["count"] * sums["sxy"] - sums["sx"] * sums["sy"]) / var.where(var > 0)
+    fitted = slope[(sums["count"] >= 3) & (sums["span"] <= -1.0)].dropna()
+
+    fit = elements["norad_id"].map(fitted / 2.0).to_numpy(dtype=np.float64, na_value=np.nan)
+    has_fit = np.isfinite(fit)
+    ndot = np.where(has_fit, fit, ndot)
+    method[has_fit] = "history"
+    return ndot, method
+
+
+def estimate_decay(
+    elements: pd.DataFrame,
+    history: Optional[pd.DataFrame] = None,
+    workers: int = DECAY_WORKERS,
+    horizon_years: float = HORIZON_YEARS,
+) -> pd.DataFrame:
+    """
+    Remaining orbital lifetime and reentry window for every element set.
+    Tempo de vida orbital restante e janela de reentrada de cada conjunto de elementos.
+
+    Args:
+        elements: Element sets (app.ingest ELEMENT_COLUMNS), one per object
+        history: Older sets (norad_id, epoch, mean_motion) for the observed decay fit
+        workers: Processes for chunks (1 = in-process)
+        horizon_years: Longest lifetime reported; longer ones are flagged beyond_horizon
+
+    Returns:
+        DataFrame with ESTIMATE_COLUMNS, one row per element set with a mean motion
+    """
+    elements = elements[elements["mean_motion"].notna() & (elements["mean_motion"] > 0)].reset_index(drop=True)
+    ndot, observed_method = observed_decay(elements, history)
+    columns = {
+        "mean_motion": elements["mean_motion"].to_numpy(dtype=np.float64),
+        "eccentricity": elements["eccentricity"].to_numpy(dtype=np.float64, na_value=np.nan),
+        "bstar": elements["bstar"].to_numpy(dtype=np.float64, na_value=np.nan),
+        "observed_ndot": ndot,
+        "observed_method": observed_method,
+    }
+    horizon_days = horizon_years * 365.25
+    bounds = [(i, min(i + DECAY_CHUNK, len(elements))) for i in range(0, len(elements), DECAY_CHUNK)]
+    args = [tuple(col[lo:hi] for col in columns.values()) + (horizon_days,) for lo, hi in bounds]
+    if len(args) > 1 and workers > 1:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(args)), mp_context=ctx) as pool:
+            parts = list(pool.map(_estimate_chunk, *zip(*args)))
+    else:
+        parts = [_estimate_chunk(*chunk) for chunk in args]
+
+    merged = {k: np.concatenate([p[k] for p in parts]) if parts else np.array([]) for k in (parts[0] if parts else {})}
+    out = pd.DataFrame({"norad_id": elements["norad_id"], "name": elements["name"], "epoch": elements["epoch"]})
+    for key in ("perigee_km", "apogee_km", "method", "area_to_mass", "decay_rate_km_day", "beyond_horizon"):
+        out[key] = merged.get(key, np.array([]))
+    days = merged.get("lifetime_days", np.array([]))
+    out["lifetime_years"] = days / 365.25
+    remaining = pd.to_timedelta(days, unit="D").round("s")
+    out["reentry_epoch"] = out["epoch"] + remaining
+    out["reentry_earliest"] = out["epoch"] + remaining * (1.0 - UNCERTAINTY)
+    out["reentry_latest"] = out["epoch"] + remaining * (1.0 + UNCERTAINTY)
+    return out[ESTIMATE_COLUMNS]
+
+
+def run(
+    store: ElementStore = ELEMENT_STORE,
+    source: Optional[str] = None,
+    output: str = DECAY_ESTIMATES,
+    workers: int = DECAY_WORKERS,
+) -> dict:
+    """
+    Batch job: estimate decay for the latest element set of every object and persist it.
+    Job em lote: estima o decaimento do conjunto mais recente de cada objeto e persiste.
+
+    Args:
+        store: Element store with the latest sets and the history (see app.ingest)
+        source: Element file to use instead of the store (any format app.ingest reads)
+        output: Parquet file for the estimates
+
+    Returns:
+        Report with counts per method and timings
+    """
+    t0 = time.perf_counter()
+    if source is not None:
+        elements = read_elements(source)
+        elements = elements[elements["mean_motion"].notna()]
+        elements = elements.sort_values("epoch").drop_duplicates("norad_id", keep="last")
+        history = None
+    else:
+        elements = store.latest()
+        since = elements["epoch"].max() - pd.Timedelta(days=HISTORY_DAYS) if len(elements) else None
+        history = store.history_columns(["norad_id", "epoch", "mean_motion"], since=since)
+    t_load = time.perf_counter() - t0
+
+    estimates = estimate_decay(elements, history, workers=workers)
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    estimates.to_parquet(f"{output}.tmp", index=False)
+    os.replace(f"{output}.tmp", output)
+    return {
+        "rows": int(len(estimates)),
+        "methods": {str(k): int(v) for k, v in estimates["method"].value_counts().items()},
+        "reentering_within_1y": int((estimates["lifetime_years"] <= 1).sum()),
+        "beyond_horizon": int(estimates["beyond_horizon"].sum()),
+        "seconds_load": round(t_load, 4),
+        "seconds_total": round(time.perf_counter() - t0, 4),
+        "computed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def load_estimates(path: str = DECAY_ESTIMATES) -> Optional[pd.DataFrame]:
+    """
+    Persisted estimates indexed by NORAD number, None before the job has run.
+    Estimativas persistidas indexadas por NORAD, None antes da primeira execução.
+    """
+    if not os.path.exists(path):
+        return None
+    df = pd.read_parquet(path)
+    return df.drop_duplicates("norad_id", keep="last").set_index("norad_id")
+
+
+def remaining_years(estimates: pd.DataFrame, as_of: pd.Timestamp, horizon_years: float = HORIZON_YEARS) -> pd.Series:
+    """
+    Lifetime left at ``as_of`` (years; horizon for beyond-horizon objects, NaN if unknown).
+    Vida orbital restante em ``as_of`` (anos; horizonte se além dele, NaN se desconhecida).
+    """
+    left = (estimates["reentry_epoch"] - as_of).dt.total_seconds() / (365.25 * 86400.0)
+    left = left.clip(lower=0.0)
+    return left.where(~estimates["beyond_horizon"].astype(bool), horizon_years)
+
+
+def estimate_records(df: pd.DataFrame) -> list:
+    """JSON-ready estimates (ISO timestamps, NaN → None) / Estimativas prontas para JSON."""
+    out = df.reset_index() if "norad_id" not in df.columns else df.copy()
+    for col in ("epoch", "reentry_epoch", "reentry_earliest", "reentry_latest"):
+        out[col] = out[col].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    out = out.astype(object).where(out.notna(), None)
+    return out.to_dict("records")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estimate orbital lifetime and reentry windows for the catalog")
+    parser.add_argument("--source", default=None, help="Element file to use instead of the element store")
+    parser.add_argument("--workers", type=int, default=DECAY_WORKERS)
+    args = parser.parse_args()
+    source = args.source
+    if source is None and not os.path.exists(ELEMENT_STORE.latest_path):
+        from .data_access import CELESTRAK_CSV
+
+        source = CELESTRAK_CSV  # nothing ingested yet / nada ingerido ainda
+    print(json.dumps(run(source=source, workers=args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
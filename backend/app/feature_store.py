@@ -0,0 +1,211 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Versioned Feature Store
+
+Este módulo persiste a matriz de features do UCS junto com o hash dos dados de origem,
+a versão do código de features e a data de referência (as-of). Treino, predição e a
+API carregam a matriz salva em vez de recalculá-la; ela só é recalculada quando uma
+dessas entradas muda, e a data de referência fica fixa, então os resultados não variam
+de um dia para o outro. Uma cópia binária da planilha de origem evita reler o XLSX.
+
+This module persists the UCS feature matrix together with the source data hash, the
+feature-code version and the as-of date. Training, prediction and the API load the
+stored matrix instead of recomputing it; it is only rebuilt when one of those inputs
+changes, and the as-of date stays pinned so results no longer drift from day to day.
+A binary copy of the source spreadsheet avoids re-parsing the XLSX.
+"""
+
+import os
+import json
+import glob
+import time
+import hashlib
+import inspect
+import argparse
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from . import decay, features
+from .features import DECAY_COLUMNS, UCS_XLSX, decay_features, engineer_features, load_ucs_from_data_raw
+from .decay import DECAY_ESTIMATES, load_estimates
+from .reload import _file_digest
+
+
+FEATURE_STORE_DIR = os.getenv("ORBITHUB_FEATURE_STORE", os.path.join("..", "data", "features"))
+# Bump on semantic changes that the source digest below would not catch
+# Incremente em mudanças semânticas que o digest do código não detecta
+FEATURE_VERSION = 1
+KEEP_ENTRIES = 4
+
+
+def feature_code_version() -> str:
+    """FEATURE_VERSION plus a digest of the feature engineering and decay source code."""
+    source = (inspect.getsource(features) + inspect.getsource(decay)).encode("utf-8")
+    return f"{FEATURE_VERSION}-{hashlib.blake2b(source, digest_size=6).hexdigest()}"
+
+
+def _atomic_write_json(path: str, payload: dict) -> None:
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def _entries(store_dir: str) -> List[dict]:
+    out = []
+    for path in glob.glob(os.path.join(store_dir, "features_*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if os.path.exists(os.path.join(store_dir, meta.get("file", ""))):
+            out.append(meta)
+    return sorted(out, key=lambda m: m.get("built_at", ""), reverse=True)
+
+
+def _prune(store_dir: str, pattern: str, keep: int) -> None:
+    paths = sorted(glob.glob(os.path.join(store_dir, pattern)), key=os.path.getmtime, reverse=True)
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_source(source_path: str = UCS_XLSX, store_dir: str = FEATURE_STORE_DIR) -> pd.DataFrame:
+    """
+    Raw UCS frame, from a binary copy keyed by the spreadsheet's content hash.
+    Frame UCS bruto, de uma cópia binária indexada pelo hash do conteúdo da planilha.
+    """
+    source_hash = _file_digest(source_path)
+    if source_hash is None:
+        raise FileNotFoundError("Arquivo UCS XLSX não encontrado em data/raw")
+    cached = os.path.join(store_dir, f"source_{source_hash}.pkl")
+    if os.path.exists(cached):
+        return pd.read_pickle(cached)
+    if source_path == UCS_XLSX:
+        df, _ = load_ucs_from_data_raw()
+    else:
+        df = pd.read_excel(source_path, engine="openpyxl")
+    try:
+        os.makedirs(store_dir, exist_ok=True)
+        df.to_pickle(f"{cached}.tmp")
+        os.replace(f"{cached}.tmp", cached)
+        _prune(store_dir, "source_*.pkl", keep=2)
+    except OSError:
+        pass  # read-only deploys still get the frame / deploy somente leitura
+    return df
+
+
+def _store(feats: pd.DataFrame, meta: dict, store_dir: str) -> None:
+    try:
+        os.makedirs(store_dir, exist_ok=True)
+        target = os.path.join(store_dir, meta["file"])
+        feats.to_parquet(f"{target}.tmp", index=False)
+        os.replace(f"{target}.tmp", target)
+        _atomic_write_json(os.path.join(store_dir, f"features_{meta['key']}.json"), meta)
+        _prune(store_dir, "features_*.json", keep=KEEP_ENTRIES)
+        live = {m["file"] for m in _entries(store_dir)}
+        for path in glob.glob(os.path.join(store_dir, "features_*.parquet")):
+            if os.path.basename(path) not in live:
+                os.remove(path)
+    except OSError:
+        pass  # read-only deploys still get the matrix / deploy somente leitura
+
+
+def load_features(
+    source_path: str = UCS_XLSX,
+    as_of: Optional[str] = None,
+    force: bool = False,
+    store_dir: str = FEATURE_STORE_DIR,
+) -> Tuple[pd.DataFrame, dict]:
+    """
+    Engineered feature matrix for the UCS source, recomputed only when inputs change
+    (spreadsheet, feature code, as-of date or the decay estimates of app.decay).
+    Matriz de features da fonte UCS, recalculada apenas quando as entradas mudam.
+
+    When only the decay estimates changed, the newest matrix for this source/code is
+    reused with its pinned as-of date and just the DECAY_COLUMNS are recomputed.
+
+    Args:
+        source_path: UCS spreadsheet
+        as_of: Reference date (YYYY-MM-DD) for lifetimes; None reuses the date of the
+               newest stored matrix for this source/code, or today if there is none
+        force: Recompute even if a matching matrix is stored
+
+    Returns:
+        (features DataFrame, metadata dict)
+    """
+    as_of = as_of or os.getenv("ORBITHUB_FEATURES_AS_OF") or None
+    if as_of is not None:
+        as_of = pd.Timestamp(as_of).strftime("%Y-%m-%d")
+    source_hash = _file_digest(source_path)
+    if source_hash is None:
+        raise FileNotFoundError("Arquivo UCS XLSX não encontrado em data/raw")
+    code_version = feature_code_version()
+    decay_hash = _file_digest(DECAY_ESTIMATES)
+
+    base = None  # newest matrix differing only in decay / mais nova que difere só no decay
+    if not force:
+        for meta in _entries(store_dir):
+            if meta.get("source_hash") != source_hash or meta.get("feature_version") != code_version:
+                continue
+            if as_of is not None and meta.get("as_of") != as_of:
+                continue
+            if meta.get("decay_hash") != decay_hash:
+                base = base or meta
+                continue
+            feats = pd.read_parquet(os.path.join(store_dir, meta["file"]))
+            return feats, meta
+
+    df = load_source(source_path, store_dir=store_dir)
+    t0 = time.perf_counter()
+    if base is not None:
+        as_of = base["as_of"]
+        feats = pd.read_parquet(os.path.join(store_dir, base["file"]))
+        fresh = decay_features(df, pd.Timestamp(as_of, tz="UTC"), load_estimates())
+        for col in DECAY_COLUMNS:
+            feats[col] = fresh[col].to_numpy()
+    else:
+        as_of = as_of or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        feats = engineer_features(df, as_of=pd.Timestamp(as_of, tz="UTC"), decay=load_estimates())
+    key = hashlib.blake2b(f"{source_hash}|{code_version}|{as_of}|{decay_hash}".encode(), digest_size=8).hexdigest()
+    meta = {
+        "key": key,
+        "file": f"features_{key}.parquet",
+        "source": os.path.basename(source_path),
+        "source_hash": source_hash,
+        "feature_version": code_version,
+        "decay_hash": decay_hash,
+        "as_of": as_of,
+        "rows": int(len(feats)),
+        "columns": list(feats.columns),
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "seconds": round(time.perf_counter() - t0, 4),
+    }
+    if base is not None:
+        meta["decay_refreshed_from"] = base["key"]
+    _store(feats, meta, store_dir)
+    return feats, meta
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or inspect the UCS feature store")
+    parser.add_argument("--as-of", default=None, help="Reference date YYYY-MM-DD")
+    parser.add_argument("--force", action="store_true", help="Recompute even if stored")
+    parser.add_argument("--list", action="store_true", help="List stored matrices")
+    args = parser.parse_args()
+    if args.list:
+        for meta in _entries(FEATURE_STORE_DIR):
+            print(meta["key"], meta["as_of"], meta["feature_version"], meta["source_hash"], meta["rows"])
+        return
+    t0 = time.perf_counter()
+    feats, meta = load_features(as_of=args.as_of, force=args.force)
+    print(json.dumps(meta, indent=2))
+    print(f"Loaded {feats.shape} in {time.perf_counter() - t0:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,28 @@
 import os
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, Optional
 
+from .decay import remaining_years
+
+
+UCS_XLSX = os.path.join("..", "data", "raw", "UCS-Satellite-Database 5-1-2023.xlsx")
+FEATURE_COLUMNS = [
+    "PURPOSE",
+    "LIFETIME_YEARS",
+    "CAPABILITIES_COUNT",
+    "ENV_IMPACT_SCORE",
+    "OPS_STATUS_CODE",
+    "ORBITAL_LIFETIME_YEARS",
+]
+# Colunas que dependem das estimativas de app.decay / Columns derived from app.decay
+DECAY_COLUMNS = ["ORBITAL_LIFETIME_YEARS"]
+FEATURE_WORKERS = int(os.getenv("ORBITHUB_FEATURE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
 
 def load_ucs_from_data_raw() -> Tuple[pd.DataFrame, str]:
     # Go up one level from backend to project root, then to data/raw
-    data_dir = os.path.join("..", "data", "raw")
-    excel_path = os.path.join(data_dir, "UCS-Satellite-Database 5-1-2023.xlsx")
+    excel_path = UCS_XLSX
     if not os.path.exists(excel_path):
         raise FileNotFoundError("Arquivo UCS XLSX não encontrado em data/raw")
     df = pd.read_excel(excel_path, engine="openpyxl")
@@ -28,61 +44,59 @@ def _find_col(df: pd.DataFrame, candidates: list[str]) -> Optional[str]:
     return None
 
 
-def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
-    df_proc = df.copy()
-
+def _purpose_features(df: pd.DataFrame) -> pd.DataFrame:
     # PURPOSE: supomos que exista uma coluna de propósito; normalize texto
-    if "PURPOSE" not in df_proc.columns:
+    if "PURPOSE" not in df.columns:
         # Tente inferir a partir de OBJECT_NAME/ORBIT_TYPE se necessário
-        df_proc["PURPOSE"] = "UNKNOWN"
-    df_proc["PURPOSE"] = df_proc["PURPOSE"].astype(str).str.upper().str.strip()
+        purpose = pd.Series("UNKNOWN", index=df.index)
+    else:
+        purpose = df["PURPOSE"]
+    return pd.DataFrame({"PURPOSE": purpose.astype(str).str.upper().str.strip()}, index=df.index)
 
-    # Impacto ambiental (proxy): menor apogeu/perigeu e presença de decaimento
-    # Crie um score simples a partir de colunas se existirem
-    for col in ["APOGEE", "PERIGEE"]:
-        if col not in df_proc.columns:
-            df_proc[col] = pd.NA
 
+def _env_impact_features(df: pd.DataFrame) -> pd.DataFrame:
+    # Impacto ambiental (proxy): menor apogeu/perigeu e presença de decaimento
     # Coagir APOGEE/PERIGEE a numérico antes de calcular score
-    for _col in ["APOGEE", "PERIGEE"]:
-        df_proc[_col] = pd.to_numeric(df_proc[_col], errors="coerce")
-    apo_med = df_proc["APOGEE"].median(skipna=True)
-    per_med = df_proc["PERIGEE"].median(skipna=True)
+    cols = {}
+    for col in ["APOGEE", "PERIGEE"]:
+        raw = df[col] if col in df.columns else pd.Series(pd.NA, index=df.index, dtype=object)
+        cols[col] = pd.to_numeric(raw, errors="coerce")
+    apo_med = cols["APOGEE"].median(skipna=True)
+    per_med = cols["PERIGEE"].median(skipna=True)
     if pd.isna(apo_med):
         apo_med = 0.0
     if pd.isna(per_med):
         per_med = 0.0
-    df_proc["ENV_IMPACT_SCORE"] = (
-        df_proc["APOGEE"].fillna(apo_med) + df_proc["PERIGEE"].fillna(per_med)
-    )
     # Normalizar impacto (menor = melhor). Vamos inverter depois pelo scaler.
+    score = cols["APOGEE"].fillna(apo_med) + cols["PERIGEE"].fillna(per_med)
+    return pd.DataFrame({"ENV_IMPACT_SCORE": score}, index=df.index)
+
 
+def _lifetime_features(df: pd.DataFrame, as_of: pd.Timestamp) -> pd.DataFrame:
     # Tempo de vida útil
     # 1) tentar datas de lançamento/decay com heurística de nomes
-    launch_col = _find_col(df_proc, ["LAUNCH_DATE", "DATE OF LAUNCH", "LAUNCH"])
-    decay_col = _find_col(df_proc, ["DECAY_DATE", "DATE OF DECAY", "REENTRY", "RE-ENTRY", "DEORBIT", "DECAY"])
+    launch_col = _find_col(df, ["LAUNCH_DATE", "DATE OF LAUNCH", "LAUNCH"])
+    decay_col = _find_col(df, ["DECAY_DATE", "DATE OF DECAY", "REENTRY", "RE-ENTRY", "DEORBIT", "DECAY"])
 
     if launch_col is not None:
-        df_proc[launch_col] = pd.to_datetime(df_proc[launch_col], errors="coerce", utc=True)
-    if decay_col is not None:
-        df_proc[decay_col] = pd.to_datetime(df_proc[decay_col], errors="coerce", utc=True)
-
-    if launch_col is not None:
-        today = pd.Timestamp.now(tz="UTC").normalize()
+        launch = pd.to_datetime(df[launch_col], errors="coerce", utc=True)
         if decay_col is not None:
-            decay_series = df_proc[decay_col].fillna(today)
+            decay_series = pd.to_datetime(df[decay_col], errors="coerce", utc=True).fillna(as_of)
         else:
-            decay_series = pd.Series([today] * len(df_proc), index=df_proc.index)
-        lifetime_days = (decay_series - df_proc[launch_col]).dt.days
-        df_proc["LIFETIME_YEARS"] = (lifetime_days.fillna(0) / 365.25).clip(lower=0)
+            decay_series = pd.Series([as_of] * len(df), index=df.index)
+        lifetime_days = (decay_series - launch).dt.days
+        lifetime = (lifetime_days.fillna(0) / 365.25).clip(lower=0)
     else:
         # 2) fallback: usar coluna de vida útil declarada
-        life_col = _find_col(df_proc, ["LIFETIME", "EXPECTED LIFETIME", "LIFETIME (YRS)", "LIFE (YRS)"])
+        life_col = _find_col(df, ["LIFETIME", "EXPECTED LIFETIME", "LIFETIME (YRS)", "LIFE (YRS)"])
         if life_col is not None:
-            df_proc["LIFETIME_YEARS"] = pd.to_numeric(df_proc[life_col], errors="coerce").fillna(0).clip(lower=0)
+            lifetime = pd.to_numeric(df[life_col], errors="coerce").fillna(0).clip(lower=0)
         else:
-            df_proc["LIFETIME_YEARS"] = 0
+            lifetime = 0
+    return pd.DataFrame({"LIFETIME_YEARS": lifetime}, index=df.index)
+
 
+def _capability_features(df: pd.DataFrame) -> pd.DataFrame:
     # Capacidades (proxy): contar quantas colunas chave não nulas por linha
     capability_cols = [
         c for c in [
@@ -92,30 +106,77 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
             "ORBIT_CENTER",
             "DATA_STATUS_CODE",
         ]
-        if c in df_proc.columns
+        if c in df.columns
     ]
     if capability_cols:
-        df_proc["CAPABILITIES_COUNT"] = df_proc[capability_cols].notna().sum(axis=1)
+        count = df[capability_cols].notna().sum(axis=1)
     else:
-        df_proc["CAPABILITIES_COUNT"] = 0
+        count = 0
+    return pd.DataFrame({"CAPABILITIES_COUNT": count}, index=df.index)
 
-    # Coagir APOGEE/PERIGEE a numérico para cálculo estável do score
-    for col in ["APOGEE", "PERIGEE"]:
-        df_proc[col] = pd.to_numeric(df_proc[col], errors="coerce")
 
-    # Selecionar features finais para ML
-    base_cols = [
-        "PURPOSE",
-        "LIFETIME_YEARS",
-        "CAPABILITIES_COUNT",
-        "ENV_IMPACT_SCORE",
-    ]
-    features = df_proc[base_cols].copy()
-    if "OPS_STATUS_CODE" in df_proc.columns:
-        features["OPS_STATUS_CODE"] = df_proc["OPS_STATUS_CODE"].fillna("UNKNOWN")
+def _status_features(df: pd.DataFrame) -> pd.DataFrame:
+    if "OPS_STATUS_CODE" in df.columns:
+        status = df["OPS_STATUS_CODE"].fillna("UNKNOWN")
     else:
-        features["OPS_STATUS_CODE"] = "UNKNOWN"
+        status = "UNKNOWN"
+    return pd.DataFrame({"OPS_STATUS_CODE": status}, index=df.index)
 
-    return features
 
+def _orbital_lifetime_features(df: pd.DataFrame, as_of: pd.Timestamp, decay: Optional[pd.DataFrame]) -> pd.DataFrame:
+    # Vida orbital restante (arrasto, estimada dos TLEs por app.decay), ligada pelo NORAD;
+    # NaN sem estimativa (o pré-processador imputa a mediana)
+    norad_col = _find_col(df, ["NORAD NUMBER", "NORAD_CAT_ID", "NORAD"])
+    if decay is None or norad_col is None:
+        years = pd.Series(float("nan"), index=df.index)
+    else:
+        norad = pd.to_numeric(df[norad_col], errors="coerce")
+        years = norad.map(remaining_years(decay, as_of)).astype(float)
+    return pd.DataFrame({"ORBITAL_LIFETIME_YEARS": years}, index=df.index)
+
+
+def engineer_features(
+    df: pd.DataFrame,
+    as_of: Optional[pd.Timestamp] = None,
+    workers: int = FEATURE_WORKERS,
+    decay: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Matriz de features para ML. Cada grupo de colunas lê só as colunas de que precisa
+    (sem copiar o frame inteiro) e os grupos rodam em paralelo.
+
+    Args:
+        as_of: Data de referência do tempo de vida (padrão: hoje, UTC)
+        workers: Threads para os grupos de colunas (1 = sequencial)
+        decay: Estimativas de decaimento por NORAD (app.decay.load_estimates)
+    """
+    as_of = pd.Timestamp.now(tz="UTC").normalize() if as_of is None else pd.Timestamp(as_of)
+    if as_of.tzinfo is None:
+        as_of = as_of.tz_localize("UTC")
+    groups = [
+        (_purpose_features, ()),
+        (_lifetime_features, (as_of,)),
+        (_capability_features, ()),
+        (_env_impact_features, ()),
+        (_status_features, ()),
+        (_orbital_lifetime_features, (as_of, decay)),
+    ]
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(groups))) as pool:
+            parts = list(pool.map(lambda g: g[0](df, *g[1]), groups))
+    else:
+        parts = [fn(df, *args) for fn, args in groups]
 
+    # Selecionar features finais para ML
+    return pd.concat(parts, axis=1)[FEATURE_COLUMNS]
+
+
+def decay_features(df: pd.DataFrame, as_of: pd.Timestamp, decay: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Apenas as colunas DECAY_COLUMNS, para atualizar uma matriz salva quando só as
+    estimativas de decaimento mudaram (mesmas linhas e ordem de engineer_features).
+    """
+    as_of = pd.Timestamp(as_of)
+    if as_of.tzinfo is None:
+        as_of = as_of.tz_localize("UTC")
+    return _orbital_lifetime_features(df, as_of, decay)[DECAY_COLUMNS]
@@ -0,0 +1,106 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Cross-Process File Locks
+
+Este módulo oferece locks exclusivos entre processos baseados no sistema operacional
+(``fcntl.flock`` no POSIX, ``msvcrt.locking`` no Windows), usados pelos workers do
+uvicorn e pelos processos de jobs que compartilham arquivos em ``data/``. O lock fica
+preso ao descritor aberto: é liberado ao fechar o arquivo ou quando o processo morre,
+então não existe lock órfão nem teste de PID.
+
+This module provides OS-backed exclusive locks across processes (``fcntl.flock`` on
+POSIX, ``msvcrt.locking`` on Windows), used by the uvicorn workers and job processes
+that share files under ``data/``. The lock belongs to the open descriptor: it is
+released when the file is closed or the process dies, so there are no stale locks and
+no PID probing.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+def _open(path: str) -> IO[bytes]:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return open(path, "a+b")
+
+
+def _lock(f: IO[bytes], blocking: bool) -> bool:
+    if fcntl is not None:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            return False
+        return True
+    # Windows: lock the first byte (allowed past EOF) / trava o primeiro byte
+    while True:
+        f.seek(0)
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.05)
+
+
+def _unlock(f: IO[bytes]) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:  # pragma: no cover - Windows
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Exclusive lock on ``path`` held while the block runs (waits for other holders).
+    Lock exclusivo em ``path`` durante o bloco (aguarda outros detentores).
+    """
+    with _open(path) as f:
+        _lock(f, blocking=True)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+class HeldLock:
+    """
+    Non-blocking exclusive lock kept until ``release`` (or process exit).
+    Lock exclusivo não bloqueante mantido até ``release`` (ou fim do processo).
+
+    The lock file is never deleted: removing it while another process has it open
+    would let two processes lock different files under the same name.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[IO[bytes]] = None
+
+    def acquire(self) -> bool:
+        """Take the lock unless another descriptor holds it / Pega o lock se estiver livre."""
+        if self._file is not None:
+            return True
+        f = _open(self.path)
+        if not _lock(f, blocking=False):
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def release(self) -> None:
+        f, self._file = self._file, None
+        if f is not None:
+            try:
+                _unlock(f)
+            finally:
+                f.close()
@@ -0,0 +1,189 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Binary Response Formats
+
+Este módulo serializa os resultados do filtro de satélites em formatos binários
+compactos, escolhidos por negociação de conteúdo via ``Accept``: streams ou arquivos
+Arrow IPC (colunares, com colunas repetitivas codificadas em dicionário) e MessagePack
+colunar (um array por campo, sem repetir as chaves em cada linha). Todos são
+construídos direto das colunas em memória, sem montar um dict por linha. Clientes
+cujo ``Accept`` não corresponde a nenhum deles continuam recebendo JSON.
+
+This module serializes satellite filter results into compact binary formats chosen by
+content negotiation on ``Accept``: Arrow IPC streams or files (columnar, with
+repetitive columns dictionary-encoded) and columnar MessagePack (one array per field,
+with no keys repeated per row). All are built straight from the in-memory columns,
+without a dict per row. Clients whose ``Accept`` matches none of them still get JSON.
+"""
+
+import gzip
+from typing import Dict, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+try:  # optional dependency / dependência opcional
+    import msgpack
+except ImportError:  # pragma: no cover - JSON/Arrow only without msgpack
+    msgpack = None
+
+
+JSON = "json"
+ARROW = "arrow"
+ARROW_FILE = "arrow_file"
+MSGPACK = "msgpack"
+
+MEDIA_TYPES = {
+    JSON: "application/json",
+    ARROW: "application/vnd.apache.arrow.stream",
+    ARROW_FILE: "application/vnd.apache.arrow.file",
+    MSGPACK: "application/msgpack",
+}
+# Accept values understood for each format / Valores de Accept aceitos por formato
+_ACCEPT_TYPES = {
+    "application/json": JSON,
+    "application/vnd.apache.arrow.stream": ARROW,
+    "application/vnd.apache.arrow.file": ARROW_FILE,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+# Dictionary-encode text columns with fewer distinct values than this share of rows
+# Codifica em dicionário colunas de texto com menos valores distintos que esta fração
+DICTIONARY_RATIO = 0.5
+
+
+def available_formats() -> list:
+    return [JSON, ARROW, ARROW_FILE] + ([MSGPACK] if msgpack is not None else [])
+
+
+def negotiate_format(accept: Optional[str]) -> Optional[str]:
+    """
+    Pick a response format for an ``Accept`` header (JSON when absent or ``*/*``).
+    Escolhe o formato de resposta para um cabeçalho ``Accept`` (JSON se ausente ou ``*/*``).
+
+    Headers listing only types we do not serve (e.g. ``text/plain``) fall back to JSON,
+    as before binary formats existed.
+
+    Returns:
+        "json", "arrow", "arrow_file" or "msgpack"; None only when JSON is explicitly
+        refused (``application/json;q=0``) and nothing else matches (406)
+    """
+    if not accept or not accept.strip():
+        return JSON
+    available = available_formats()
+    best, best_q, best_specific = None, 0.0, False
+    json_refused = False
+    for part in accept.split(","):
+        media, _, params = part.strip().partition(";")
+        media = media.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        specific = media not in ("*/*", "application/*")
+        fmt = _ACCEPT_TYPES.get(media) if specific else JSON
+        if fmt == JSON and specific and q <= 0:
+            json_refused = True
+        if fmt is None or fmt not in available or q <= 0:
+            continue
+        # equal q: first listed wins, and explicit types beat wildcards
+        # q iguais: vence o primeiro listado, e tipos explícitos vencem curingas
+        if q > best_q or (q == best_q and specific and not best_specific):
+            best, best_q, best_specific = fmt, q, specific
+    if best is None and not json_refused:
+        return JSON
+    return best
+
+
+def _arrow_table(df: pd.DataFrame) -> pa.Table:
+    """Arrow table with categorical/repetitive text columns dictionary-encoded."""
+    arrays, names = [], []
+    for name in df.columns:
+        col = df[name]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            # only the categories present in this result / só as categorias deste resultado
+            arr = pa.DictionaryArray.from_pandas(col.cat.remove_unused_categories())
+        else:
+            arr = pa.array(col.astype(object).where(col.notna(), None).tolist(), type=pa.string())
+            if len(arr) and col.nunique(dropna=True) < DICTIONARY_RATIO * len(arr):
+                arr = arr.dictionary_encode()
+        arrays.append(arr)
+        names.append(name)
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def to_arrow_stream(df: pd.DataFrame) -> bytes:
+    """
+    Arrow IPC stream of the columns (one record batch).
+    Stream Arrow IPC das colunas (um record batch).
+    """
+    table = _arrow_table(df)
+    sink = pa.BufferOutputStream()
+    with ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _write_arrow_file(df: pd.DataFrame, sink, options: Optional[ipc.IpcWriteOptions] = None) -> None:
+    table = _arrow_table(df)
+    with ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+
+
+def to_arrow_file(df: pd.DataFrame, path: str) -> None:
+    """Arrow IPC file (random access, zstd-compressed buffers) for batch exports."""
+    with pa.OSFile(path, "wb") as sink:
+        _write_arrow_file(df, sink, ipc.IpcWriteOptions(compression="zstd"))
+
+
+def to_arrow_file_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Arrow IPC file for HTTP responses; buffers stay uncompressed (Content-Encoding
+    applies on the wire and not every Arrow reader decodes zstd buffers).
+    Arquivo Arrow IPC para respostas HTTP, com buffers sem compressão.
+    """
+    sink = pa.BufferOutputStream()
+    _write_arrow_file(df, sink)
+    return sink.getvalue().to_pybytes()
+
+
+def _msgpack_payload(df: pd.DataFrame) -> Dict:
+    columns = {}
+    for name in df.columns:
+        col = df[name]
+        columns[name] = col.astype(object).where(col.notna(), None).tolist()
+    return {"rows": int(len(df)), "fields": list(df.columns), "columns": columns}
+
+
+def to_msgpack(df: pd.DataFrame) -> bytes:
+    """
+    Columnar MessagePack map: ``{"rows": n, "fields": [...], "columns": {field: [...]}}``.
+    Mapa MessagePack colunar: ``{"rows": n, "fields": [...], "columns": {campo: [...]}}``.
+    """
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(_msgpack_payload(df), use_bin_type=True)
+
+
+def to_msgpack_gz(df: pd.DataFrame, path: str) -> None:
+    """Gzipped columnar MessagePack file for batch exports (byte-stable, mtime=0)."""
+    with open(path, "wb") as raw, gzip.GzipFile(filename="", fileobj=raw, mode="wb", mtime=0) as gz:
+        gz.write(to_msgpack(df))
+
+
+def encode(df: pd.DataFrame, fmt: str) -> bytes:
+    """Serialize satellite columns in a binary format / Serializa colunas em formato binário."""
+    if fmt == ARROW:
+        return to_arrow_stream(df)
+    if fmt == ARROW_FILE:
+        return to_arrow_file_bytes(df)
+    if fmt == MSGPACK:
+        return to_msgpack(df)
+    raise ValueError(f"Unsupported binary format: {fmt}")
@@ -0,0 +1,592 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Multi-Source TLE Ingest and Element History
+
+Este módulo ingere arquivos locais de elementos orbitais — CSV do Celestrak, texto
+TLE/3LE e OMM em JSON ou CSV — com um parser vetorizado de colunas fixas para TLE.
+Mantém o conjunto de elementos mais recente por número NORAD (pela época) e grava os
+conjuntos substituídos num histórico compacto em Parquet particionado por mês da
+época, que pode ser consultado por objeto.
+
+This module ingests local orbital element files — Celestrak CSV, TLE/3LE text and OMM
+as JSON or CSV — with a vectorized fixed-column TLE parser. It keeps the latest element
+set per NORAD number (by epoch) and appends superseded sets to a compact Parquet
+history partitioned by epoch month, which can be queried per object.
+"""
+
+import os
+import glob
+import json
+import time
+import uuid
+import argparse
+import threading
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .tle import parse_catalog_number
+
+
+ELEMENTS_DIR = os.getenv("ORBITHUB_ELEMENTS_DIR", os.path.join("..", "data", "tle"))
+LATEST_FILE = "latest.parquet"
+HISTORY_DIR = "history"
+# Merge a partition's part files once it has more than this / Junta partes acima disso
+COMPACT_PARTS = 16
+
+ELEMENT_COLUMNS = [
+    "norad_id",
+    "name",
+    "object_id",
+    "epoch",
+    "mean_motion",
+    "eccentricity",
+    "inclination",
+    "raan",
+    "arg_perigee",
+    "mean_anomaly",
+    "bstar",
+    "mean_motion_dot",
+    "mean_motion_ddot",
+    "element_set_no",
+    "rev_at_epoch",
+    "tle_line1",
+    "tle_line2",
+    "source",
+]
+_FLOAT_COLUMNS = ELEMENT_COLUMNS[4:13]
+
+# OMM keywords → element columns / Palavras-chave OMM → colunas de elementos
+OMM_FIELDS = {
+    "NORAD_CAT_ID": "norad_id",
+    "OBJECT_NAME": "name",
+    "OBJECT_ID": "object_id",
+    "EPOCH": "epoch",
+    "MEAN_MOTION": "mean_motion",
+    "ECCENTRICITY": "eccentricity",
+    "INCLINATION": "inclination",
+    "RA_OF_ASC_NODE": "raan",
+    "ARG_OF_PERICENTER": "arg_perigee",
+    "MEAN_ANOMALY": "mean_anomaly",
+    "BSTAR": "bstar",
+    "MEAN_MOTION_DOT": "mean_motion_dot",
+    "MEAN_MOTION_DDOT": "mean_motion_ddot",
+    "ELEMENT_SET_NO": "element_set_no",
+    "REV_AT_EPOCH": "rev_at_epoch",
+}
+
+
+# ---------- fixed-column TLE parser ----------
+
+def _fixed_width(lines: Sequence[str]) -> np.ndarray:
+    """(n, 69) uint8 matrix of the lines, space padded / matriz (n, 69) de bytes."""
+    buf = "".join(line[:69].ljust(69) for line in lines).encode("ascii", "replace")
+    return np.frombuffer(buf, dtype=np.uint8).reshape(len(lines), 69)
+
+
+def _column(arr: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Byte strings of columns [start, end) (0-based) / Strings de bytes das colunas."""
+    return np.ascontiguousarray(arr[:, start:end]).view(f"S{end - start}").ravel()
+
+
+def _floats(arr: np.ndarray, start: int, end: int) -> np.ndarray:
+    raw = np.char.strip(_column(arr, start, end))
+    raw[raw == b""] = b"nan"
+    return raw.astype(np.float64)
+
+
+def _digits(arr: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Unsigned integer field; blanks read as 0 / Campo inteiro; brancos viram 0."""
+    block = arr[:, start:end].astype(np.int64) - 48
+    block[(block < 0) | (block > 9)] = 0
+    weights = 10 ** np.arange(end - start - 1, -1, -1, dtype=np.int64)
+    return block @ weights
+
+
+def _implied_decimal(arr: np.ndarray, start: int) -> np.ndarray:
+    """``±NNNNN±E`` fields (8 columns), e.g. `` 69629-3`` → 0.69629e-3."""
+    sign = np.where(arr[:, start] == ord("-"), -1.0, 1.0)
+    mantissa = _digits(arr, start + 1, start + 6) * 1e-5
+    exp_sign = np.where(arr[:, start + 6] == ord("-"), -1, 1)
+    exponent = exp_sign * _digits(arr, start + 7, start + 8)
+    return sign * mantissa * np.power(10.0, exponent)
+
+
+def _checksum_ok(arr: np.ndarray) -> np.ndarray:
+    """Modulo-10 checksum (digits + 1 per '-'); lines without a checksum digit pass."""
+    body = arr[:, :68]
+    digit = body - np.uint8(48)  # wraps for non-digits / excede 9 para não dígitos
+    values = np.where(digit <= 9, digit, body == 45).astype(np.uint8)
+    expected = arr[:, 68] - np.uint8(48)
+    return (expected > 9) | (values.sum(axis=1, dtype=np.int32) % 10 == expected)
+
+
+def _epochs(years2: np.ndarray, days: np.ndarray) -> np.ndarray:
+    years = np.where(years2 < 57, 2000 + years2, 1900 + years2)
+    start = (years - 1970).astype("datetime64[Y]").astype("datetime64[ns]")
+    offset = np.round((days - 1.0) * 86400e6).astype(np.int64).astype("timedelta64[us]")
+    return start + offset
+
+
+def _cospar(arr: np.ndarray) -> np.ndarray:
+    """International designator (cols 10-17) as COSPAR ``YYYY-NNNP``; None if absent."""
+    yy = _digits(arr, 9, 11)
+    years = np.where(yy >= 57, 1900 + yy, 2000 + yy).astype(str)
+    rest = np.char.strip(_column(arr, 11, 17)).astype(str)
+    ok = np.char.isdigit(_column(arr, 9, 14)) & (np.char.str_len(rest) >= 4)
+    out = np.char.add(np.char.add(years, "-"), rest).astype(object)
+    out[~ok] = None
+    return out
+
+
+def parse_tle(
+    line1: Sequence[str],
+    line2: Sequence[str],
+    names: Optional[Sequence[Optional[str]]] = None,
+    source: str = "tle",
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Parse TLE line pairs column-wise into element sets.
+    Converte pares de linhas TLE, coluna a coluna, em conjuntos de elementos.
+
+    Returns:
+        (element-set DataFrame with ELEMENT_COLUMNS, number of rejected pairs)
+    """
+    n = len(line1)
+    if n == 0:
+        return pd.DataFrame(columns=ELEMENT_COLUMNS), 0
+    a1, a2 = _fixed_width(line1), _fixed_width(line2)
+    # well-formed pairs: line numbers, matching catalog numbers, checksums
+    # pares válidos: números de linha, mesmo número de catálogo, checksums
+    ok = (a1[:, 0] == ord("1")) & (a2[:, 0] == ord("2")) & _checksum_ok(a1) & _checksum_ok(a2)
+    sat1, sat2 = _column(a1, 2, 7), _column(a2, 2, 7)
+    ok &= sat1 == sat2
+
+    numeric = np.char.isdigit(np.char.strip(sat1))
+    norad = np.where(numeric, _digits(a1, 2, 7), -1)
+    for i in np.flatnonzero(~numeric):  # Alpha-5 catalog numbers / números Alpha-5
+        parsed = parse_catalog_number(sat1[i].decode("ascii", "replace"))
+        norad[i] = -1 if parsed is None else parsed
+    ok &= norad >= 0
+
+    df = pd.DataFrame({
+        "norad_id": norad,
+        "name": list(names) if names is not None else [None] * n,
+        "object_id": _cospar(a1),
+        "epoch": pd.DatetimeIndex(_epochs(_digits(a1, 18, 20), _floats(a1, 20, 32))).tz_localize("UTC"),
+        "mean_motion": _floats(a2, 52, 63),
+        "eccentricity": _digits(a2, 26, 33) * 1e-7,
+        "inclination": _floats(a2, 8, 16),
+        "raan": _floats(a2, 17, 25),
+        "arg_perigee": _floats(a2, 34, 42),
+        "mean_anomaly": _floats(a2, 43, 51),
+        "bstar": _implied_decimal(a1, 53),
+        "mean_motion_dot": _floats(a1, 33, 43),
+        "mean_motion_ddot": _implied_decimal(a1, 44),
+        "element_set_no": _digits(a1, 64, 68),
+        "rev_at_epoch": _digits(a2, 63, 68),
+        "tle_line1": list(line1),
+        "tle_line2": list(line2),
+        "source": source,
+    })
+    return df[ok].reset_index(drop=True), int((~ok).sum())
+
+
+# ---------- source readers ----------
+
+def read_tle_text(path: str) -> Tuple[pd.DataFrame, int]:
+    """
+    TLE (2-line) or 3LE (name + 2 lines, name optionally prefixed by ``0 ``) text file.
+    Arquivo de texto TLE (2 linhas) ou 3LE (nome + 2 linhas).
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        lines = [line for line in map(str.rstrip, f.read().splitlines()) if line]
+    if not lines:
+        return parse_tle([], [])
+    # a pair is a "1 " line followed by a "2 " line; anything else just before it is its name
+    # um par é uma linha "1 " seguida de uma "2 "; o que vem antes dele é o nome
+    starts = np.array([line[:2] for line in lines])
+    first = np.flatnonzero((starts[:-1] == "1 ") & (starts[1:] == "2 "))
+    prev = first - 1
+    named = (prev >= 0) & ~np.isin(prev, first + 1) & (starts[np.maximum(prev, 0)] != "1 ")
+    l1 = [lines[i] for i in first]
+    l2 = [lines[i + 1] for i in first]
+    names = np.full(len(first), None, dtype=object)
+    names[named] = [
+        lines[j][2:].strip() if starts[j] == "0 " else lines[j].strip() for j in prev[named]
+    ]
+    return parse_tle(l1, l2, names, source=os.path.basename(path))
+
+
+def read_celestrak_csv(path: str) -> pd.DataFrame:
+    """
+    Celestrak export (``name;norad_cat_id;epoch;tle_line1;tle_line2``) with the C parser.
+    Exportação Celestrak (``;``) lida com o parser C do pandas.
+    """
+    try:
+        return pd.read_csv(path, sep=";")
+    except Exception:
+        return pd.read_csv(path)
+
+
+def _catalog_numbers(values) -> pd.Series:
+    """
+    NORAD numbers as float, NaN where the value is not a non-negative integer.
+    Números NORAD como float; NaN quando o valor não é um inteiro não negativo.
+    """
+    numbers = pd.to_numeric(pd.Series(values), errors="coerce").astype("float64")
+    valid = np.isfinite(numbers) & (numbers >= 0) & (numbers == np.floor(numbers)) & (numbers < 2**53)
+    return numbers.where(valid)
+
+
+def _celestrak_elements(path: str) -> Tuple[pd.DataFrame, int]:
+    raw = read_celestrak_csv(path)
+    if "tle_line1" in raw.columns and "tle_line2" in raw.columns:
+        has_tle = raw["tle_line1"].notna() & raw["tle_line2"].notna()
+    else:
+        has_tle = pd.Series(False, index=raw.index)
+    tle_rows = raw[has_tle]
+    parsed, rejected = parse_tle(
+        tle_rows["tle_line1"].tolist(),
+        tle_rows["tle_line2"].tolist(),
+        tle_rows["name"].tolist() if "name" in raw.columns else None,
+        source=os.path.basename(path),
+    )
+    # catalog-only rows (no TLE) still carry NORAD, name and epoch
+    # linhas só de catálogo (sem TLE) ainda trazem NORAD, nome e época
+    rest = raw[~has_tle]
+    norad = _catalog_numbers(rest.get("norad_cat_id", pd.Series(index=rest.index, dtype=object)))
+    catalog = pd.DataFrame({
+        "norad_id": norad,
+        "name": rest.get("name"),
+        "epoch": pd.to_datetime(rest.get("epoch"), utc=True, errors="coerce", format="ISO8601"),
+        "source": os.path.basename(path),
+    })
+    catalog = catalog[catalog["norad_id"].notna() & catalog["epoch"].notna()]
+    rejected += int(len(rest) - len(catalog))
+    return _concat([parsed, catalog]), rejected
+
+
+def _omm_frame(raw: pd.DataFrame, source: str) -> Tuple[pd.DataFrame, int]:
+    cols = {src: dst for src, dst in OMM_FIELDS.items() if src in raw.columns}
+    df = raw[list(cols)].rename(columns=cols)
+    df["norad_id"] = _catalog_numbers(df["norad_id"]) if "norad_id" in df.columns else np.nan
+    df["epoch"] = pd.to_datetime(df.get("epoch"), utc=True, errors="coerce", format="ISO8601")
+    for col in _FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    df["source"] = source
+    ok = df["norad_id"].notna() & df["epoch"].notna()
+    return _concat([df[ok]]), int((~ok).sum())
+
+
+def read_omm_json(path: str) -> Tuple[pd.DataFrame, int]:
+    """OMM as a JSON array of objects (Celestrak ``FORMAT=json``)."""
+    with open(path, "rb") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = [data]
+    return _omm_frame(pd.DataFrame.from_records(data), os.path.basename(path))
+
+
+def read_omm_csv(path: str) -> Tuple[pd.DataFrame, int]:
+    """OMM as CSV with keyword headers (Celestrak ``FORMAT=csv``)."""
+    return _omm_frame(pd.read_csv(path), os.path.basename(path))
+
+
+def detect_format(path: str) -> str:
+    """Source format from the extension and, for CSV/JSON, the header."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        return "omm_json"
+    if ext == ".csv":
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            header = f.readline().upper()
+        if "TLE_LINE1" in header:
+            return "celestrak_csv"
+        if "MEAN_MOTION" in header:
+            return "omm_csv"
+        raise ValueError(f"Unrecognized CSV header in {path}")
+    return "tle"
+
+
+READERS = {
+    "celestrak_csv": _celestrak_elements,
+    "tle": read_tle_text,
+    "omm_json": read_omm_json,
+    "omm_csv": read_omm_csv,
+}
+
+
+def read_elements(path: str) -> pd.DataFrame:
+    """Element sets of one file in any supported format / Conjuntos de elementos de um arquivo."""
+    return READERS[detect_format(path)](path)[0]
+
+
+def _concat(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Align frames to ELEMENT_COLUMNS with stable dtypes / Alinha colunas e tipos.
+
+    Rows without a usable NORAD number are dropped (the readers count them as
+    rejected); missing strings are None on every pandas version.
+    """
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        out = pd.DataFrame({c: pd.Series(dtype=object) for c in ELEMENT_COLUMNS})
+    else:
+        out = pd.concat([f.reindex(columns=ELEMENT_COLUMNS) for f in frames], ignore_index=True)
+    norad = _catalog_numbers(out["norad_id"])
+    if norad.isna().any():
+        out, norad = out[norad.notna()].reset_index(drop=True), norad.dropna().reset_index(drop=True)
+    out["norad_id"] = norad.astype("int64")
+    out["epoch"] = pd.to_datetime(out["epoch"], utc=True, cache=False).astype("datetime64[us, UTC]")
+    for col in _FLOAT_COLUMNS:
+        out[col] = pd.to_numeric(out[col], errors="coerce").astype("float64")
+    for col in ("element_set_no", "rev_at_epoch"):
+        out[col] = pd.to_numeric(out[col], errors="coerce").astype("Int64")
+    for col in ("name", "object_id", "tle_line1", "tle_line2", "source"):
+        # object + None: astype("str") turns None/NaN into "None"/"nan" before pandas 3
+        # object + None: astype("str") vira "None"/"nan" antes do pandas 3
+        values = out[col].astype(object)
+        present = values.notna()
+        values[present] = values[present].astype(str)
+        out[col] = values.where(present, None)
+    return out
+
+
+# ---------- latest + history store ----------
+
+def _epoch_months(epochs: pd.Series) -> pd.Series:
+    """``YYYY-MM`` partition key per epoch, formatting only the distinct months."""
+    codes = epochs.dt.year * 100 + epochs.dt.month
+    labels = {c: f"{c // 100:04d}-{c % 100:02d}" for c in codes.unique()}
+    return codes.map(labels)
+
+
+class ElementStore:
+    """
+    Latest element set per NORAD number plus a month-partitioned history of older sets.
+    Conjunto de elementos mais recente por NORAD mais um histórico particionado por mês.
+
+    Layout (under ``directory``):
+        latest.parquet                              one row per NORAD number
+        history/epoch_month=YYYY-MM/part-*.parquet  superseded sets
+    """
+
+    def __init__(self, directory: str = ELEMENTS_DIR):
+        self.directory = directory
+        self.latest_path = os.path.join(directory, LATEST_FILE)
+        self.history_path = os.path.join(directory, HISTORY_DIR)
+        self._lock = threading.Lock()
+        self.last_report: Optional[dict] = None
+
+    def latest(self) -> pd.DataFrame:
+        if not os.path.exists(self.latest_path):
+            return _concat([])
+        return _concat([pd.read_parquet(self.latest_path)])
+
+    def _history_keys(self, months: Iterable[str]) -> pd.DataFrame:
+        """(norad_id, epoch) already stored in the given partitions."""
+        frames = []
+        for month in months:
+            part_dir = os.path.join(self.history_path, f"epoch_month={month}")
+            if os.path.isdir(part_dir):
+                frames.append(pd.read_parquet(part_dir, columns=["norad_id", "epoch"]))
+        if not frames:
+            return pd.DataFrame({"norad_id": pd.Series(dtype="int64"), "epoch": pd.Series(dtype="datetime64[us, UTC]")})
+        keys = pd.concat(frames, ignore_index=True)
+        keys["epoch"] = pd.to_datetime(keys["epoch"], utc=True).astype("datetime64[us, UTC]")
+        return keys
+
+    def _append_history(self, rows: pd.DataFrame) -> int:
+        if rows.empty:
+            return 0
+        months = _epoch_months(rows["epoch"])
+        existing = self._history_keys(months.unique())
+        if len(existing):
+            seen = pd.MultiIndex.from_frame(existing)
+            rows = rows[~pd.MultiIndex.from_frame(rows[["norad_id", "epoch"]]).isin(seen)]
+            months = _epoch_months(rows["epoch"])
+        written = 0
+        for month, part in rows.groupby(months, sort=True):
+            part_dir = os.path.join(self.history_path, f"epoch_month={month}")
+            os.makedirs(part_dir, exist_ok=True)
+            part = part.sort_values(["norad_id", "epoch"])
+            target = os.path.join(part_dir, f"part-{uuid.uuid4().hex[:12]}.parquet")
+            part.to_parquet(f"{target}.tmp", index=False, compression="zstd")
+            os.replace(f"{target}.tmp", target)
+            written += len(part)
+            if len(glob.glob(os.path.join(part_dir, "part-*.parquet"))) > COMPACT_PARTS:
+                self._compact_partition(part_dir)
+        return written
+
+    def _compact_partition(self, part_dir: str) -> None:
+        parts = sorted(glob.glob(os.path.join(part_dir, "part-*.parquet")))
+        if len(parts) < 2:
+            return
+        merged = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+        merged = merged.drop_duplicates(["norad_id", "epoch"], keep="last").sort_values(["norad_id", "epoch"])
+        target = os.path.join(part_dir, f"part-{uuid.uuid4().hex[:12]}.parquet")
+        merged.to_parquet(f"{target}.tmp", index=False, compression="zstd")
+        os.replace(f"{target}.tmp", target)
+        for p in parts:
+            os.remove(p)
+
+    def compact(self) -> int:
+        """Merge every partition's part files into one; returns partitions touched."""
+        with self._lock:
+            dirs = glob.glob(os.path.join(self.history_path, "epoch_month=*"))
+            for part_dir in dirs:
+                self._compact_partition(part_dir)
+            return len(dirs)
+
+    def ingest(self, paths: Sequence[str]) -> dict:
+        """
+        Parse the files, keep the newest set per NORAD and archive the superseded ones.
+        Lê os arquivos, mantém o conjunto mais novo por NORAD e arquiva os substituídos.
+
+        Rows without mean elements (e.g. catalog-only Celestrak rows, which carry just
+        a name and an epoch) are not element sets: they are counted and skipped, so a
+        newer epoch without elements never displaces a real TLE.
+
+        Returns:
+            Report with per-file counts and timings
+        """
+        t0 = time.perf_counter()
+        frames, files = [], []
+        for order, path in enumerate(paths):
+            fmt = detect_format(path)
+            t_file = time.perf_counter()
+            df, rejected = READERS[fmt](path)
+            has_elements = df["mean_motion"].notna()
+            df = df[has_elements].copy()
+            df["_order"] = order  # later files win epoch ties / arquivos posteriores vencem empates
+            frames.append(df)
+            files.append({
+                "path": path,
+                "format": fmt,
+                "rows": int(len(df)),
+                "rejected": rejected,
+                "without_elements": int((~has_elements).sum()),
+                "seconds": round(time.perf_counter() - t_file, 4),
+            })
+        t_parse = time.perf_counter() - t0
+
+        with self._lock:
+            current = self.latest()
+            # stores written before element-less rows were skipped / stores antigos
+            current = current[current["mean_motion"].notna()].copy()
+            current["_order"] = -1
+            batch = pd.concat([current] + frames, ignore_index=True)
+            batch = batch.sort_values(["norad_id", "epoch", "_order"], kind="stable")
+            # one row per (NORAD, epoch): re-ingested or re-published sets are not history
+            # uma linha por (NORAD, época): conjuntos reingeridos não viram histórico
+            batch = batch.drop_duplicates(["norad_id", "epoch"], keep="last")
+            newest = ~batch["norad_id"].duplicated(keep="last")
+            latest = _concat([batch[newest].drop(columns="_order")])
+            superseded = _concat([batch[~newest].drop(columns="_order")])
+
+            os.makedirs(self.directory, exist_ok=True)
+            archived = self._append_history(superseded)
+            latest.to_parquet(f"{self.latest_path}.tmp", index=False, compression="zstd")
+            os.replace(f"{self.latest_path}.tmp", self.latest_path)
+
+        report = {
+            "files": files,
+            "objects": int(len(latest)),
+            "updated": int(len(latest) - latest.merge(current[["norad_id", "epoch"]], on=["norad_id", "epoch"]).shape[0]),
+            "archived": archived,
+            "seconds_parse": round(t_parse, 4),
+            "seconds_total": round(time.perf_counter() - t0, 4),
+        }
+        self.last_report = report
+        return report
+
+    def history(
+        self,
+        norad_id: int,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        """
+        Every stored element set of one object (history + latest), oldest first.
+        Todos os conjuntos de elementos de um objeto (histórico + atual), do mais antigo.
+        """
+        frames = []
+        if os.path.isdir(self.history_path):
+            dataset = ds.dataset(self.history_path, format="parquet", partitioning="hive")
+            flt = ds.field("norad_id") == int(norad_id)
+            # prune partitions by month before touching row groups / poda partições por mês
+            if start is not None:
+                flt &= ds.field("epoch_month") >= start.strftime("%Y-%m")
+            if end is not None:
+                flt &= ds.field("epoch_month") <= end.strftime("%Y-%m")
+            table = dataset.to_table(filter=flt, columns=ELEMENT_COLUMNS)
+            frames.append(table.to_pandas())
+        if os.path.exists(self.latest_path):
+            latest = pq.read_table(self.latest_path, filters=[("norad_id", "=", int(norad_id))]).to_pandas()
+            frames.append(latest)
+        out = _concat(frames).sort_values("epoch").drop_duplicates(["norad_id", "epoch"], keep="last")
+        if start is not None:
+            out = out[out["epoch"] >= start]
+        if end is not None:
+            out = out[out["epoch"] <= end]
+        return out.reset_index(drop=True)
+
+    def history_columns(self, columns: Sequence[str], since: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Selected columns of every archived set (optionally from ``since`` on), all objects.
+        Colunas selecionadas de todos os conjuntos arquivados, de todos os objetos.
+        """
+        if not os.path.isdir(self.history_path):
+            return pd.DataFrame(columns=list(columns))
+        dataset = ds.dataset(self.history_path, format="parquet", partitioning="hive")
+        flt = None if since is None else ds.field("epoch_month") >= since.strftime("%Y-%m")
+        return dataset.to_table(filter=flt, columns=list(columns)).to_pandas()
+
+    def stats(self) -> dict:
+        parts = glob.glob(os.path.join(self.history_path, "epoch_month=*", "part-*.parquet"))
+        latest_rows = pq.ParquetFile(self.latest_path).metadata.num_rows if os.path.exists(self.latest_path) else 0
+        return {
+            "objects": latest_rows,
+            "history_rows": sum(pq.ParquetFile(p).metadata.num_rows for p in parts),
+            "history_files": len(parts),
+            "history_partitions": len({os.path.dirname(p) for p in parts}),
+            "bytes": sum(os.path.getsize(p) for p in parts) + (os.path.getsize(self.latest_path) if latest_rows else 0),
+            "last_ingest": self.last_report,
+        }
+
+
+ELEMENT_STORE = ElementStore()
+
+
+def element_records(df: pd.DataFrame) -> List[dict]:
+    """JSON-ready element sets (ISO epochs, NaN → None) / Conjuntos prontos para JSON."""
+    out = df.copy()
+    out["epoch"] = out["epoch"].dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    out = out.astype(object).where(out.notna(), None)
+    return out.to_dict("records")
+
+
+def main() -> None:
+    from .data_access import CELESTRAK_CSV
+
+    parser = argparse.ArgumentParser(description="Ingest TLE/3LE/OMM/Celestrak files into the element store")
+    parser.add_argument("paths", nargs="*", help=f"Files to ingest (default: {CELESTRAK_CSV})")
+    parser.add_argument("--history", type=int, default=None, help="Print the history of a NORAD number")
+    parser.add_argument("--compact", action="store_true", help="Merge history part files")
+    args = parser.parse_args()
+    if args.compact:
+        print(f"Compacted {ELEMENT_STORE.compact()} partitions")
+    if args.history is not None:
+        print(ELEMENT_STORE.history(args.history).drop(columns=["tle_line1", "tle_line2"]).to_string())
+        return
+    report = ELEMENT_STORE.ingest(args.paths or [CELESTRAK_CSV])
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Batch Delivery Job Engine
+
+Este módulo transforma cada requisição do portal com entrega "Batch" em um job: resolve
+os satélites selecionados (ou os filtros de classificação/finalidade), materializa um
+arquivo compactado (CSV/Parquet/NDJSON.gz/Arrow/MessagePack) em um pool de processos e mantém o estado
+em uma fila baseada em arquivos que sobrevive a reinicializações.
+
+This module turns each portal request with "Batch" delivery into a job: it resolves the
+selected satellites (or the classification/purpose filters), materializes a compressed
+deliverable (CSV/Parquet/NDJSON.gz/Arrow/MessagePack) on a process pool and keeps state in a file-based
+queue that survives restarts.
+"""
+
+import os
+import re
+import gzip
+import json
+import uuid
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .filelock import HeldLock, file_lock
+
+
+# Directory paths / Caminhos de diretórios
+JOBS_DIR = os.path.join("..", "data", "jobs")
+JOB_WORKERS = int(os.getenv("ORBITHUB_JOB_WORKERS", "2"))
+
+# Deliverable formats → (file extension, media type) / Formatos de entrega
+FORMATS = {
+    "csv": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "ndjson": (".ndjson.gz", "application/gzip"),
+    "arrow": (".arrow", "application/vnd.apache.arrow.file"),
+    "msgpack": (".msgpack.gz", "application/gzip"),
+}
+# Written from the columns, without building records / Escritos direto das colunas
+COLUMNAR_FORMATS = {"arrow", "msgpack"}
+DEFAULT_FORMAT = "csv"
+
+# Fields of each delivered record (same as /satellites) / Campos de cada registro entregue
+RECORD_FIELDS = [
+    "name_of_satellite",
+    "alternate_names",
+    "country_un_registry",
+    "country_operator_owner",
+    "operator_owner",
+    "purpose",
+    "detailed_purpose",
+    "sustainability_class",
+]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _write_json_atomic(path: str, data: dict) -> None:
+    # unique tmp name: several workers may write the same state file
+    # nome temporário único: vários workers podem escrever o mesmo arquivo de estado
+    tmp = f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def snapshot_fingerprint(snap) -> Dict[str, object]:
+    """
+    Inputs a deliverable depends on: the classified catalog, the Celestrak objects
+    (pending rows and selections) and the cross-reference rules joining them.
+    Entradas de uma entrega: catálogo classificado, objetos Celestrak e regras do xref.
+    """
+    from .data_access import CELESTRAK_CSV, CLASSIFIED_CSV
+    from .xref import XREF_VERSION
+
+    return {
+        "classified": snap.fingerprints.get(CLASSIFIED_CSV),
+        "celestrak": snap.fingerprints.get(CELESTRAK_CSV),
+        "xref": XREF_VERSION,
+    }
+
+
+def build_job_spec(payload: dict, dataset_fingerprint: Optional[Dict[str, object]]) -> dict:
+    """
+    Normalize a portal request into the content that defines a deliverable.
+    Normaliza uma requisição do portal no conteúdo que define uma entrega.
+
+    Two requests with the same spec produce byte-identical files, so the spec hash is
+    used as the job ID for deduplication; ``dataset_fingerprint`` (see
+    ``snapshot_fingerprint``) makes any input change a new job.
+    """
+    from .formats import available_formats
+
+    fmt = (payload.get("batch_format") or DEFAULT_FORMAT).strip().lower()
+    if fmt not in FORMATS or (fmt in COLUMNAR_FORMATS and fmt not in available_formats()):
+        raise ValueError(f"Unsupported batch format: {fmt}")
+    selected = payload.get("selected_satellites") or []
+    names = sorted({
+        str(s.get("name_of_satellite"))
+        for s in selected
+        if isinstance(s, dict) and s.get("name_of_satellite")
+    })
+    spec = {"format": fmt, "dataset": dataset_fingerprint}
+    if names:
+        spec["satellites"] = names
+    else:
+        spec["classification"] = (payload.get("classification") or "").strip().upper() or None
+        spec["purpose"] = (payload.get("purpose") or "").strip() or None
+    return spec
+
+
+def job_id_for(spec: dict) -> str:
+    raw = json.dumps(spec, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:20]
+
+
+def unmatched_selection(spec: dict, names) -> List[str]:
+    """
+    Selected names missing from the resolved rows; raises if none was found.
+    Nomes selecionados ausentes das linhas resolvidas; erro se nenhum foi encontrado.
+    """
+    wanted = spec.get("satellites") or []
+    found = set(names)
+    missing = [name for name in wanted if name not in found]
+    if wanted and len(missing) == len(wanted):
+        raise ValueError(f"None of the {len(wanted)} selected satellites is in the catalog")
+    return missing
+
+
+def resolve_records(spec: dict) -> List[dict]:
+    """
+    Resolve the satellite records of a job spec against the live catalog.
+    Resolve os registros de satélites de um job no catálogo ativo.
+
+    Selections match by name against everything /satellites lists: classified rows
+    and Celestrak objects pending classification.
+    """
+    from .data_access import filter_satellites
+
+    if spec.get("satellites"):
+        wanted = set(spec["satellites"])
+        catalog = filter_satellites(limit=0) + filter_satellites(classification="PENDING", limit=0)
+        return [r for r in catalog if r["name_of_satellite"] in wanted]
+    return filter_satellites(
+        classification=spec.get("classification"),
+        purpose=spec.get("purpose"),
+        limit=0,
+    )
+
+
+def resolve_columns(spec: dict) -> pd.DataFrame:
+    """
+    Column-wise counterpart of ``resolve_records`` for the columnar formats.
+    Equivalente colunar de ``resolve_records`` para os formatos colunares.
+    """
+    from .data_access import satellite_columns
+
+    if spec.get("satellites"):
+        wanted = set(spec["satellites"])
+        frames = [satellite_columns(limit=0), satellite_columns(classification="PENDING", limit=0)]
+        df = pd.concat([f[f["name_of_satellite"].isin(wanted)] for f in frames], ignore_index=True)
+        # concat of differing categoricals falls back to object / categorias diferentes viram object
+        for col in df.columns:
+            if col != "name_of_satellite" and df[col].dtype == object:
+                df[col] = df[col].astype("category")
+        return df
+    return satellite_columns(
+        classification=spec.get("classification"),
+        purpose=spec.get("purpose"),
+        limit=0,
+    )
+
+
+def write_columns(df: pd.DataFrame, fmt: str, out_path: str) -> None:
+    """Write satellite columns as Arrow IPC or gzipped MessagePack (atomically)."""
+    from .formats import to_arrow_file, to_msgpack_gz
+
+    tmp = f"{out_path}.tmp"
+    if fmt == "arrow":
+        to_arrow_file(df, tmp)
+    else:
+        to_msgpack_gz(df, tmp)
+    os.replace(tmp, out_path)
+
+
+def write_deliverable(records: List[dict], fmt: str, out_path: str) -> None:
+    """
+    Write records to a compressed file (atomically via a temporary file).
+    Escreve registros em um arquivo compactado (atomicamente via arquivo temporário).
+    """
+    tmp = f"{out_path}.tmp"
+    if fmt == "ndjson":
+        # mtime=0 keeps identical content byte-identical / mtime=0 mantém bytes idênticos
+        with open(tmp, "wb") as raw, gzip.GzipFile(filename="", fileobj=raw, mode="wb", mtime=0) as gz:
+            for rec in records:
+                gz.write(json.dumps(rec, ensure_ascii=False).encode("utf-8") + b"\n")
+    else:
+        df = pd.DataFrame(records, columns=RECORD_FIELDS)
+        if fmt == "parquet":
+            df.to_parquet(tmp, index=False, compression="zstd")
+        else:
+            df.to_csv(tmp, index=False, compression={"method": "gzip", "mtime": 0})
+    os.replace(tmp, out_path)
+
+
+def _materialize(spec: dict, out_path: str) -> dict:
+    """
+    Worker-process entry point: resolve and write one deliverable.
+    Ponto de entrada do processo worker: resolve e escreve uma entrega.
+
+    Returns:
+        ``{"rows": n, "unmatched": [selected names not in the catalog]}``
+    """
+    from .data_access import RELOADER
+
+    # make sure this worker sees the files the job was keyed on
+    RELOADER.check(settle=False)
+    if spec["format"] in COLUMNAR_FORMATS:
+        df = resolve_columns(spec)
+        unmatched = unmatched_selection(spec, df["name_of_satellite"])
+        write_columns(df, spec["format"], out_path)
+        return {"rows": len(df), "unmatched": unmatched}
+    records = resolve_records(spec)
+    unmatched = unmatched_selection(spec, (r["name_of_satellite"] for r in records))
+    write_deliverable(records, spec["format"], out_path)
+    return {"rows": len(records), "unmatched": unmatched}
+
+
+class JobEngine:
+    """
+    File-backed job queue with deduplication and a process pool.
+    Fila de jobs persistida em arquivos com deduplicação e pool de processos.
+
+    Each job is a JSON state file ``<jobs_dir>/<job_id>.json``; deliverables live in
+    ``<jobs_dir>/out``. An OS lock on ``<job_id>.lock``, held for the job's lifetime,
+    makes sure only one API worker process runs a given job; it is released
+    automatically if that process dies. Every read-modify-write of a state file
+    happens under the shared ``state.lock``, since all API workers share the files.
+    """
+
+    def __init__(self, jobs_dir: str = JOBS_DIR, workers: int = JOB_WORKERS):
+        self.jobs_dir = jobs_dir
+        self.out_dir = os.path.join(jobs_dir, "out")
+        self.workers = max(1, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._claims: Dict[str, HeldLock] = {}
+        self._state_lock_path = os.path.join(jobs_dir, "state.lock")
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> None:
+        """Create the worker pool and re-dispatch jobs left unfinished by a restart."""
+        with self._lock:
+            if self._pool is not None:
+                return
+            os.makedirs(self.out_dir, exist_ok=True)
+            # spawn: workers must not inherit the parent's threads (reload watcher)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        self.recover()
+
+    def stop(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def recover(self) -> int:
+        """
+        Re-queue jobs that were queued/running when the process stopped.
+        Recoloca na fila jobs que estavam pendentes/em execução quando o processo parou.
+        """
+        count = 0
+        for fname in sorted(os.listdir(self.jobs_dir)):
+            if not fname.endswith(".json"):
+                continue
+            job = self.get(fname[: -len(".json")])
+            if job is None:
+                continue
+            lost = job["status"] == "done" and not os.path.exists(self._out_path(job))
+            if job["status"] in {"queued", "running"} or lost:
+                self._dispatch(job)
+                count += 1
+        return count
+
+    # ---------- public API ----------
+
+    def submit(self, payload: dict, dataset_fingerprint: Optional[Dict[str, object]] = None) -> dict:
+        """
+        Create (or join) the job for a Batch portal request.
+        Cria (ou reaproveita) o job de uma requisição Batch do portal.
+
+        Returns:
+            Job state dict (existing job if identical content was already requested)
+        """
+        if self._pool is None:
+            self.start()
+        spec = build_job_spec(payload, dataset_fingerprint)
+        job_id = job_id_for(spec)
+        with self._lock, file_lock(self._state_lock_path):
+            job = self.get(job_id)
+            reusable = job is not None and (
+                job["status"] in {"queued", "running"}
+                or (job["status"] == "done" and os.path.exists(self._out_path(job)))
+            )
+            if reusable:
+                job["requests"] = job.get("requests", 1) + 1
+                self._save(job)
+            else:
+                job = {
+                    "job_id": job_id,
+                    "status": "queued",
+                    "spec": spec,
+                    "created_at": _now(),
+                    "updated_at": _now(),
+                    "requests": 1,
+                    "rows": None,
+                    "unmatched": [],
+                    "error": None,
+                }
+                self._save(job)
+        if job["status"] != "done":
+            # new, or orphaned by a worker that died / novo, ou órfão de um worker morto
+            self._dispatch(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        if not re.fullmatch(r"[0-9a-f]{20}", job_id or ""):
+            return None
+        path = self._state_path(job_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def deliverable(self, job_id: str) -> Optional[tuple]:
+        """Return (path, media_type, filename) of a finished job, None otherwise."""
+        job = self.get(job_id)
+        if job is None or job["status"] != "done":
+            return None
+        path = self._out_path(job)
+        if not os.path.exists(path):
+            return None
+        ext, media_type = FORMATS[job["spec"]["format"]]
+        return path, media_type, f"orbithub_{job_id}{ext}"
+
+    def stats(self) -> dict:
+        counts: Dict[str, int] = {}
+        if os.path.isdir(self.jobs_dir):
+            for fname in os.listdir(self.jobs_dir):
+                if fname.endswith(".json"):
+                    job = self.get(fname[: -len(".json")])
+                    if job is not None:
+                        counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"workers": self.workers, "inflight": len(self._inflight), "jobs": counts}
+
+    # ---------- internals ----------
+
+    def _state_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _out_path(self, job: dict) -> str:
+        ext, _ = FORMATS[job["spec"]["format"]]
+        return os.path.join(self.out_dir, f"{job['job_id']}{ext}")
+
+    def _save(self, job: dict) -> None:
+        job["updated_at"] = _now()
+        _write_json_atomic(self._state_path(job["job_id"]), job)
+
+    def _lock_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.lock")
+
+    def _claim(self, job_id: str) -> bool:
+        """Take the per-job OS lock unless another process (or engine) holds it."""
+        if job_id in self._claims:
+            return True  # still ours, e.g. cancelled by stop() / ainda nosso
+        claim = HeldLock(self._lock_path(job_id))
+        if not claim.acquire():
+            return False  # running elsewhere / em execução em outro processo
+        self._claims[job_id] = claim
+        return True
+
+    def _release(self, job_id: str) -> None:
+        claim = self._claims.pop(job_id, None)
+        if claim is not None:
+            claim.release()
+
+    def _dispatch(self, job: dict) -> None:
+        with self._lock:
+            if self._pool is None or job["job_id"] in self._inflight:
+                return
+            if not self._claim(job["job_id"]):
+                return
+            with file_lock(self._state_lock_path):
+                # re-read: another worker may have finished it meanwhile
+                # relê: outro worker pode tê-lo concluído nesse meio tempo
+                current = self.get(job["job_id"]) or job
+                if current["status"] == "done" and os.path.exists(self._out_path(current)):
+                    self._release(job["job_id"])
+                    return
+                job = current
+                job["status"] = "running"
+                job["error"] = None
+                self._save(job)
+            fut = self._pool.submit(_materialize, job["spec"], self._out_path(job))
+            self._inflight[job["job_id"]] = fut
+        fut.add_done_callback(lambda f, job_id=job["job_id"]: self._on_done(job_id, f))
+
+    def _on_done(self, job_id: str, fut: Future) -> None:
+        with self._lock:
+            self._inflight.pop(job_id, None)
+            if fut.cancelled():
+                return  # shutting down: stays "running" and is recovered on restart
+            with file_lock(self._state_lock_path):
+                job = self.get(job_id)
+                if job is not None:
+                    exc = fut.exception()
+                    if exc is None:
+                        # selections absent from the catalog are reported, not silently dropped
+                        # seleções ausentes do catálogo são informadas, não descartadas em silêncio
+                        job["status"] = "done"
+                        job["rows"] = fut.result()["rows"]
+                        job["unmatched"] = fut.result()["unmatched"]
+                    else:
+                        job["status"] = "failed"
+                        job["error"] = f"{type(exc).__name__}: {exc}"
+                    self._save(job)
+            # release only once the outcome is saved / libera só após salvar o resultado
+            self._release(job_id)
+
+
+JOB_ENGINE = JobEngine()
@@ -10,7 +10,9 @@ system, enabling data queries and requests via web portal.
 """
 
 from fastapi import FastAPI
+from fastapi import Request
 from fastapi import Response
+from fastapi import HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List
@@ -18,8 +20,22 @@ import os
 import json
 import pandas as pd
 from joblib import load
-from .data_access import filter_satellites, persist_portal_request, load_celestrak_df, load_classified_df
-from fastapi.responses import RedirectResponse, JSONResponse
+from .data_access import filter_satellites, persist_portal_request, load_serving_df, load_artifacts_snapshot, RELOADER
+from .data_access import current_snapshot, list_tle_objects
+from .passes import predict_passes, shutdown_pool as shutdown_pass_pool
+from datetime import datetime
+from .jobs import JOB_ENGINE, build_job_spec, snapshot_fingerprint
+from .compression import PRECOMPRESSED, precompressed_response
+from .admission import SATELLITES_LIMIT, SATELLITES_FLIGHT, CLASSIFY_LIMIT, CLASSIFY_FLIGHT, admission_stats
+from .batching import MicroBatcher
+from .changelog import CHANGELOG
+from .data_access import catalog_records, satellite_columns
+from .formats import negotiate_format, encode as encode_columns, MEDIA_TYPES, JSON as JSON_FORMAT
+import orjson
+from .catalog import memory_report
+from .ingest import ELEMENT_STORE, element_records
+from .decay import estimate_records
+from fastapi.responses import RedirectResponse, JSONResponse, FileResponse
 from fastapi.responses import ORJSONResponse
 from starlette.middleware.gzip import GZipMiddleware
 from fastapi.concurrency import run_in_threadpool
@@ -36,6 +52,9 @@ app.add_middleware(
     allow_methods=["*"],  # Allow all HTTP methods / Permite todos os métodos HTTP
     allow_headers=["*"],  # Allow all headers / Permite todos os headers
 )
+# On-the-fly fallback only: hot /satellites responses are served precompressed and
+# carry Content-Encoding, which GZipMiddleware leaves untouched
+# Apenas fallback: respostas quentes de /satellites já vêm pré-compactadas
 app.add_middleware(GZipMiddleware, minimum_size=800)
 # FRONTEND_ORIGIN = os.getenv("CORS_ORIGIN", "https://orbithub-lx4e.onrender.com")
 
@@ -59,6 +78,7 @@ class SatelliteInput(BaseModel):
     LAUNCH_DATE: str | None = None
     LIFETIME_YEARS: float | None = None
     CAPABILITIES_COUNT: int | None = None
+    ORBITAL_LIFETIME_YEARS: float | None = None  # drag lifetime left (see /decay) / vida orbital restante
 
 
 def get_models_dir():
@@ -115,31 +135,28 @@ def health_head():
     return Response(status_code=200)
 
 
-@app.post("/classify")
-def classify(items: List[SatelliteInput]):
-    """
-    Classify one or more satellites based on sustainability criteria.
-    Classifica um ou mais satélites baseado em critérios de sustentabilidade.
-    
-    Args:
-        items: List of satellite data inputs
-    
-    Returns:
-        List of classification labels (OURO/PRATA/BRONZE)
-    """
-    # Load ML artifacts / Carrega artefatos ML
-    pre, model, label_map = load_artifacts()
-    
+def _classify_records(records: List[dict], artifacts) -> List[dict]:
+    pre, model, label_map = artifacts
+
     # Convert input to DataFrame / Converte entrada para DataFrame
-    df = pd.DataFrame([item.dict() for item in items])
+    df = pd.DataFrame(records)
     
     # Prepare numeric features / Prepara features numéricas
     X_num = pd.DataFrame(
         {
             "LIFETIME_YEARS": df.get("LIFETIME_YEARS", pd.Series([None] * len(df))).fillna(0),
             "CAPABILITIES_COUNT": df.get("CAPABILITIES_COUNT", pd.Series([0] * len(df))).fillna(0),
+            # not an API input: left missing so the preprocessor imputes its training median
+            # não é entrada da API: fica ausente e o pré-processador imputa a mediana do treino
+            "ENV_IMPACT_SCORE": pd.Series([float("nan")] * len(df)),
         }
     )
+    # only models trained with decay estimates take it; missing values are imputed
+    # só modelos treinados com estimativas de decaimento usam; ausentes são imputados
+    if "ORBITAL_LIFETIME_YEARS" in getattr(pre, "feature_names_in_", ()):
+        X_num["ORBITAL_LIFETIME_YEARS"] = pd.to_numeric(
+            df.get("ORBITAL_LIFETIME_YEARS", pd.Series([None] * len(df))), errors="coerce"
+        )
     
     # Prepare categorical features / Prepara features categóricas
     X_cat = df[[c for c in ["PURPOSE", "OPS_STATUS_CODE"] if c in df.columns]].fillna("UNKNOWN")
@@ -155,18 +172,142 @@ def classify(items: List[SatelliteInput]):
     return [{"label": label} for label in labels]
 
 
+# Concurrent /classify calls share one vectorized transform/predict per micro-batch;
+# each batch (not each request) takes an admission slot, and the batcher's own queue
+# is bounded in records
+# Chamadas simultâneas de /classify compartilham um transform/predict por micro-lote
+CLASSIFY_BATCHER = MicroBatcher(
+    "classify",
+    # ML artifacts of the live snapshot / Artefatos ML do snapshot ativo
+    lambda records: _classify_records(records, load_artifacts_snapshot()),
+    limiter=CLASSIFY_LIMIT,
+)
+
+
+@app.post("/classify")
+async def classify(items: List[SatelliteInput]):
+    """
+    Classify one or more satellites based on sustainability criteria.
+    Classifica um ou mais satélites baseado em critérios de sustentabilidade.
+    
+    Args:
+        items: List of satellite data inputs
+    
+    Returns:
+        List of classification labels (OURO/PRATA/BRONZE)
+    """
+    snap = current_snapshot()
+    records = [item.dict() for item in items]
+    key = (snap.version, orjson.dumps(records))
+    # identical concurrent payloads are predicted once, inside a shared micro-batch
+    # cargas idênticas simultâneas são preditas uma vez, dentro de um micro-lote
+    return await CLASSIFY_FLIGHT.do(key, lambda: CLASSIFY_BATCHER.submit(records))
+
+
 @app.on_event("startup")
 def _warmup():
-    # Pre-load datasets into memory for faster first-hit latency
+    # Pre-load datasets into memory for faster first-hit latency and start the
+    # file watcher that hot-swaps them / Pré-carrega dados e inicia o observador de arquivos
+    try:
+        RELOADER.start()
+    except Exception:
+        pass
+    # Resume batch jobs left unfinished by a restart / Retoma jobs em lote pendentes
     try:
-        load_celestrak_df()
-        load_classified_df()
+        JOB_ENGINE.start()
     except Exception:
         pass
 
 
+@app.on_event("shutdown")
+def _stop_reloader():
+    RELOADER.stop()
+    JOB_ENGINE.stop()
+    shutdown_pass_pool()
+    CLASSIFY_BATCHER.close()
+
+
+@app.get("/stats/reload", tags=["meta"])
+def stats_reload():
+    """
+    Version and file fingerprints of the live dataset/model snapshot.
+    Versão e impressões digitais dos arquivos do snapshot ativo de dados/modelos.
+    """
+    return RELOADER.stats()
+
+
+@app.get("/stats/memory", tags=["meta"])
+def stats_memory():
+    """
+    Bytes per column of the in-memory serving catalog.
+    Bytes por coluna do catálogo de serviço em memória.
+    """
+    return memory_report(load_serving_df())
+
+
+@app.get("/stats/xref", tags=["meta"])
+def stats_xref():
+    """
+    Match rate of the Celestrak ↔ UCS cross-reference behind the live snapshot.
+    Taxa de correspondência da referência cruzada Celestrak ↔ UCS do snapshot ativo.
+    """
+    return current_snapshot()["xref_report"]
+
+
+# Default portal queries precompressed for every dataset version
+# Consultas padrão do portal pré-compactadas a cada versão dos dados
+HOT_CLASSIFICATIONS = [None, "OURO", "PRATA", "BRONZE", "PENDENTE DE CLASSIFICAÇÃO"]
+DEFAULT_LIMIT = 50
+
+
+def _satellites_key(classification: str | None, purpose: str | None, limit: int, fmt: str = JSON_FORMAT):
+    """Normalize query params that cannot change the /satellites output."""
+    key = (
+        (classification or "").upper() or None,
+        purpose or None,
+        limit if limit and limit > 0 else 0,
+    )
+    return key if fmt == JSON_FORMAT else key + (fmt,)
+
+
+def _satellites_body(classification, purpose, limit, snap=None, fmt: str = JSON_FORMAT) -> bytes:
+    if fmt != JSON_FORMAT:
+        # columnar formats skip the dict-per-row step / formatos colunares sem dict por linha
+        return encode_columns(
+            satellite_columns(classification=classification, purpose=purpose, limit=limit, snap=snap), fmt
+        )
+    return orjson.dumps(
+        filter_satellites(classification=classification, purpose=purpose, limit=limit, snap=snap)
+    )
+
+
+def _warm_precompressed(snap):
+    PRECOMPRESSED.warm(
+        snap.version,
+        [
+            (
+                _satellites_key(c, None, DEFAULT_LIMIT),
+                lambda c=c: _satellites_body(c, None, DEFAULT_LIMIT, snap=snap),
+            )
+            for c in HOT_CLASSIFICATIONS
+        ],
+    )
+
+
+RELOADER.subscribe(_warm_precompressed)
+
+
+def _record_dataset_version(snap):
+    snap.dataset_version = CHANGELOG.record(catalog_records(snap))
+
+
+# Record a dataset version + per-row change log for every build, on the snapshot
+# before it goes live / Registra uma versão dos dados + log de mudanças a cada build
+RELOADER.subscribe(_record_dataset_version, before_swap=True)
+
+
 @app.get("/satellites")
-async def satellites(classification: str | None = None, purpose: str | None = None, delivery: str | None = None, limit: int = 50):
+async def satellites(request: Request, classification: str | None = None, purpose: str | None = None, delivery: str | None = None, limit: int = DEFAULT_LIMIT):
     """
     Get filtered list of classified satellites.
     Obtém lista filtrada de satélites classificados.
@@ -178,12 +319,237 @@ async def satellites(classification: str | None = None, purpose: str | None = No
         limit: Maximum number of results
     
     Returns:
-        List of satellite records with detailed information
+        List of satellite records with detailed information; with ``Accept:
+        application/vnd.apache.arrow.stream`` (or ``.file``) an Arrow IPC stream (or
+        file), and with ``Accept: application/msgpack`` a columnar MessagePack map, of
+        the same fields
     """
-    # run filtering on a worker thread to avoid blocking the event loop
-    result = await run_in_threadpool(lambda: filter_satellites(classification=classification, purpose=purpose, delivery=delivery, limit=limit))
+    fmt = negotiate_format(request.headers.get("accept"))
+    if fmt is None:
+        raise HTTPException(status_code=406, detail=f"Supported media types: {', '.join(MEDIA_TYPES.values())}")
+    snap = current_snapshot()
+    key = _satellites_key(classification, purpose, limit, fmt)
+    # cache hits are served on the event loop, without a threadpool slot
+    # acertos de cache são servidos no event loop, sem ocupar o threadpool
+    variants = PRECOMPRESSED.lookup(snap.version, key)
+    if variants is None:
+        # filter + serialize + compress once per dataset version, on a worker thread;
+        # concurrent identical misses share that single admitted computation
+        # filtra + serializa + compacta uma vez por versão, em thread de trabalho;
+        # consultas idênticas simultâneas compartilham essa única computação admitida
+        variants = await SATELLITES_FLIGHT.do(
+            (snap.version, key),
+            lambda: SATELLITES_LIMIT.run(
+                lambda: run_in_threadpool(
+                    PRECOMPRESSED.get,
+                    snap.version,
+                    key,
+                    lambda: _satellites_body(classification, purpose, limit, snap=snap, fmt=fmt),
+                    MEDIA_TYPES[fmt],
+                    request.headers.get("accept-encoding", ""),
+                )
+            ),
+        )
+    encoding = variants.missing(request.headers.get("accept-encoding", ""))
+    if encoding is not None:
+        # first client of this entry asking for this encoding: add it to the cache once
+        # primeiro cliente da entrada pedindo esta codificação: acrescenta-a ao cache uma vez
+        variants = await SATELLITES_FLIGHT.do(
+            (snap.version, key, encoding),
+            lambda: SATELLITES_LIMIT.run(
+                lambda: run_in_threadpool(PRECOMPRESSED.add_encoding, snap.version, key, variants, encoding)
+            ),
+        )
     # add short-lived HTTP cache to speed up repeated identical queries
-    return ORJSONResponse(result, headers={"Cache-Control": "public, max-age=300"})
+    headers = {"Cache-Control": "public, max-age=300"}
+    if snap.dataset_version is not None:
+        # version of the snapshot that produced the body / versão do snapshot do corpo
+        headers["X-Dataset-Version"] = str(snap.dataset_version)
+    return precompressed_response(
+        variants,
+        request.headers.get("accept-encoding", ""),
+        if_none_match=request.headers.get("if-none-match"),
+        headers=headers,
+    )
+
+
+@app.get("/changes")
+def changes(since: int = 0):
+    """
+    Satellites added, removed or changed after dataset version ``since``.
+    Satélites adicionados, removidos ou alterados após a versão ``since`` dos dados.
+
+    Args:
+        since: Last dataset version the client applied (0 = full sync)
+
+    Returns:
+        Current version and one net change per satellite ID; ``full_resync`` means
+        ``since`` is older than the log and the whole catalog is returned as added
+    """
+    if since < 0:
+        raise HTTPException(status_code=400, detail="since must be >= 0")
+    return CHANGELOG.changes_since(since)
+
+
+@app.get("/stats/changes", tags=["meta"])
+def stats_changes():
+    """Dataset version and change log size / Versão dos dados e tamanho do log de mudanças."""
+    return CHANGELOG.stats()
+
+
+@app.get("/stats/admission", tags=["meta"])
+def stats_admission():
+    """
+    Concurrency limits, queue depth, shed requests, coalescing and micro-batching per endpoint.
+    Limites de concorrência, fila, descartes, coalescência e micro-lotes por endpoint.
+    """
+    stats = admission_stats()
+    stats["classify"]["batching"] = CLASSIFY_BATCHER.stats()
+    return stats
+
+
+@app.get("/stats/precompressed", tags=["meta"])
+def stats_precompressed():
+    """Precompressed response cache usage / Uso do cache de respostas pré-compactadas."""
+    return PRECOMPRESSED.stats()
+
+
+@app.get("/passes")
+async def passes(
+    lat: float,
+    lon: float,
+    alt_m: float = 0.0,
+    start: datetime | None = None,
+    hours: float = 24.0,
+    min_elevation: float = 0.0,
+    classification: str | None = None,
+    purpose: str | None = None,
+    step_seconds: float = 60.0,
+):
+    """
+    Predict passes of TLE catalog objects over a ground station.
+    Prevê passagens de objetos do catálogo TLE sobre uma estação terrestre.
+
+    Args:
+        lat, lon, alt_m: Station latitude/longitude (degrees) and altitude (meters)
+        start: Window start, ISO 8601 (UTC if no offset; defaults to now)
+        hours: Window length in hours (max 72)
+        min_elevation: Elevation mask in degrees
+        classification: Filter by sustainability class (OURO/PRATA/BRONZE/PENDENTE)
+        purpose: Filter by satellite purpose
+        step_seconds: Coarse propagation step for LEO objects
+
+    Returns:
+        Station/window echo and the list of passes (rise, culmination, set)
+    """
+    snap = current_snapshot()
+    # the row loop runs on a worker thread, like /satellites / laço por linha fora do event loop
+    objects = await run_in_threadpool(list_tle_objects, classification=classification, purpose=purpose, snap=snap)
+    try:
+        result = await run_in_threadpool(
+            predict_passes,
+            objects,
+            lat,
+            lon,
+            alt_m,
+            start,
+            hours,
+            min_elevation,
+            step_seconds,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {
+        "station": {"lat": lat, "lon": lon, "alt_m": alt_m},
+        "start": start.isoformat() if start else None,
+        "hours": hours,
+        "min_elevation": min_elevation,
+        "objects": len(objects),
+        "passes": result,
+    }
+
+
+@app.get("/tle/{norad_id}/history")
+def tle_history(norad_id: int, start: datetime | None = None, end: datetime | None = None):
+    """
+    Every ingested element set of one object, oldest first (see ``python -m app.ingest``).
+    Todos os conjuntos de elementos ingeridos de um objeto, do mais antigo ao atual.
+
+    Args:
+        norad_id: NORAD catalog number
+        start, end: Optional epoch window, ISO 8601 (UTC if no offset)
+
+    Returns:
+        NORAD number, count and the element sets (epoch, mean elements, B*, TLE lines)
+    """
+    bounds = []
+    for value in (start, end):
+        if value is not None:
+            value = pd.Timestamp(value)
+            value = value.tz_localize("UTC") if value.tzinfo is None else value.tz_convert("UTC")
+        bounds.append(value)
+    if bounds[0] is not None and bounds[1] is not None and bounds[0] > bounds[1]:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    history = ELEMENT_STORE.history(norad_id, *bounds)
+    if history.empty:
+        raise HTTPException(status_code=404, detail="No element sets for this NORAD number")
+    return {"norad_id": norad_id, "count": len(history), "element_sets": element_records(history)}
+
+
+@app.get("/stats/ingest", tags=["meta"])
+def stats_ingest():
+    """Element store size and the last ingest run / Tamanho do repositório de elementos e última ingestão."""
+    return ELEMENT_STORE.stats()
+
+
+def _decay_estimates() -> pd.DataFrame:
+    estimates = current_snapshot().get("decay")
+    if estimates is None:
+        raise HTTPException(status_code=404, detail="Decay estimates not computed yet (python -m app.decay)")
+    return estimates
+
+
+@app.get("/decay")
+def decay(within_years: float = 5.0, limit: int = 100):
+    """
+    Objects predicted to reenter within ``within_years`` from now, soonest first.
+    Objetos com reentrada prevista em até ``within_years`` a partir de agora.
+
+    Args:
+        within_years: Window from now (predictions already past are included)
+        limit: Maximum objects returned
+
+    Returns:
+        Count and estimates (perigee/apogee, method, lifetime, reentry window)
+    """
+    if within_years <= 0 or limit <= 0:
+        raise HTTPException(status_code=400, detail="within_years and limit must be > 0")
+    estimates = _decay_estimates()
+    horizon = pd.Timestamp.now(tz="UTC") + pd.Timedelta(days=within_years * 365.25)
+    upcoming = estimates[estimates["reentry_epoch"] <= horizon].sort_values("reentry_epoch")
+    return {"count": int(len(upcoming)), "estimates": estimate_records(upcoming.head(limit))}
+
+
+@app.get("/decay/{norad_id}")
+def decay_object(norad_id: int):
+    """Orbital lifetime and reentry window of one object / Vida orbital e reentrada de um objeto."""
+    estimates = _decay_estimates()
+    if norad_id not in estimates.index:
+        raise HTTPException(status_code=404, detail="No decay estimate for this NORAD number")
+    return estimate_records(estimates.loc[[norad_id]])[0]
+
+
+@app.get("/stats/decay", tags=["meta"])
+def stats_decay():
+    """Decay estimates per method / Estimativas de decaimento por método."""
+    estimates = current_snapshot().get("decay")
+    if estimates is None:
+        return {"rows": 0}
+    return {
+        "rows": int(len(estimates)),
+        "methods": {str(k): int(v) for k, v in estimates["method"].value_counts().items()},
+        "beyond_horizon": int(estimates["beyond_horizon"].sum()),
+    }
 
 
 class PortalRequest(BaseModel):
@@ -206,6 +572,7 @@ class PortalRequest(BaseModel):
     description: str | None = None  # Additional request description / Descrição adicional da requisição
     language: str | None = None  # Interface language: en or pt / Idioma da interface: en ou pt
     selected_satellites: list | None = None  # List of selected satellites / Lista de satélites selecionados
+    batch_format: str | None = None  # Batch deliverable: csv, parquet, ndjson, arrow or msgpack / Formato da entrega em lote
 
 
 @app.post("/portal/request")
@@ -220,6 +587,55 @@ def portal_request(payload: PortalRequest):
     Returns:
         Status confirmation and file path of saved request
     """
-    path = persist_portal_request(payload.dict())
-    return {"status": "received", "path": path}
+    data = payload.dict()
+    batch = (payload.delivery or "").strip().lower() == "batch"
+    if batch:
+        # reject an invalid batch request before anything is persisted
+        # rejeita uma requisição em lote inválida antes de persistir qualquer coisa
+        try:
+            build_job_spec(data, None)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    path = persist_portal_request(data)
+    response = {"status": "received", "path": path}
+
+    # Batch delivery → background job / Entrega em lote → job em segundo plano
+    if batch:
+        job = JOB_ENGINE.submit(data, dataset_fingerprint=snapshot_fingerprint(current_snapshot()))
+        response["job_id"] = job["job_id"]
+        response["job_status"] = job["status"]
+    return response
+
+
+@app.get("/stats/jobs", tags=["meta"])
+def stats_jobs():
+    """Batch job counts by status / Contagem de jobs em lote por status."""
+    return JOB_ENGINE.stats()
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    """
+    Status of a batch delivery job.
+    Status de um job de entrega em lote.
+    """
+    job = JOB_ENGINE.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "done":
+        job["download_url"] = f"/jobs/{job_id}/download"
+    return job
+
+
+@app.get("/jobs/{job_id}/download")
+def job_download(job_id: str):
+    """
+    Download the compressed deliverable of a finished batch job.
+    Baixa o arquivo compactado de um job em lote concluído.
+    """
+    found = JOB_ENGINE.deliverable(job_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Deliverable not ready")
+    path, media_type, filename = found
+    return FileResponse(path, media_type=media_type, filename=filename)
 
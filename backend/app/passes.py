@@ -0,0 +1,354 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Ground-Station Pass Prediction
+
+Este módulo calcula passagens (nascer, culminação e ocaso) de objetos do catálogo TLE
+sobre uma estação terrestre. A propagação SGP4 é feita em lote numa grade temporal
+grossa (passo proporcional ao período orbital); o refinamento só acontece perto dos
+cruzamentos do horizonte e dos picos de elevação. Catálogos grandes são divididos em
+blocos processados em paralelo.
+
+This module computes passes (rise, culmination and set) of TLE catalog objects over a
+ground station. SGP4 propagation is batched on a coarse time grid (step proportional
+to the orbital period); refinement only happens near horizon crossings and elevation
+peaks. Large catalogs are split into chunks processed in parallel.
+"""
+
+import os
+import math
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray, jday
+
+
+# WGS84 ellipsoid / Elipsoide WGS84
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+
+PASS_WORKERS = int(os.getenv("ORBITHUB_PASS_WORKERS", str(os.cpu_count() or 1)))
+PASS_CHUNK = 256  # objects per parallel task / objetos por tarefa paralela
+MAX_HOURS = 72.0
+REFINE_POINTS = 33  # samples per refined bracket / amostras por intervalo refinado
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _station(lat_deg: float, lon_deg: float, alt_m: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Station ECEF position (km) and local up/east/north unit vectors."""
+    lat, lon = math.radians(lat_deg), math.radians(lon_deg)
+    e2 = WGS84_F * (2 - WGS84_F)
+    n = WGS84_A_KM / math.sqrt(1 - e2 * math.sin(lat) ** 2)
+    h = alt_m / 1000.0
+    pos = np.array([
+        (n + h) * math.cos(lat) * math.cos(lon),
+        (n + h) * math.cos(lat) * math.sin(lon),
+        (n * (1 - e2) + h) * math.sin(lat),
+    ])
+    up = np.array([math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)])
+    east = np.array([-math.sin(lon), math.cos(lon), 0.0])
+    north = np.array([-math.sin(lat) * math.cos(lon), -math.sin(lat) * math.sin(lon), math.cos(lat)])
+    return pos, up, east, north
+
+
+def _gmst(jd: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal time (IAU 1982), radians."""
+    t = (jd - 2451545.0) / 36525.0
+    seconds = 67310.54841 + (876600.0 * 3600 + 8640184.812866) * t + 0.093104 * t**2 - 6.2e-6 * t**3
+    return np.radians(np.mod(seconds, 86400.0) / 240.0)
+
+
+def _look_angles(r_teme: np.ndarray, jd: np.ndarray, station) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Elevation/azimuth (degrees) of TEME positions ``(..., t, 3)`` seen from the station.
+    Elevação/azimute (graus) de posições TEME ``(..., t, 3)`` vistas da estação.
+    """
+    pos, up, east, north = station
+    theta = _gmst(jd)
+    c, s = np.cos(theta), np.sin(theta)
+    x, y, z = r_teme[..., 0], r_teme[..., 1], r_teme[..., 2]
+    rho = np.stack([c * x + s * y - pos[0], -s * x + c * y - pos[1], z - pos[2]], axis=-1)
+    dist = np.linalg.norm(rho, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        el = np.degrees(np.arcsin(np.clip((rho @ up) / dist, -1.0, 1.0)))
+    az = np.mod(np.degrees(np.arctan2(rho @ east, rho @ north)), 360.0)
+    return el, az
+
+
+def _grid_step(sat: Satrec, base_step: float) -> float:
+    """Coarse grid step: longer for slow (MEO/GEO) near-circular orbits."""
+    if sat.no_kozai <= 0 or sat.ecco > 0.1:
+        return base_step
+    period_min = 2 * math.pi / sat.no_kozai
+    return base_step * min(10, max(1, int(period_min // 100)))
+
+
+def _wrap_lerp(az0: np.ndarray, az1: np.ndarray, w: np.ndarray) -> np.ndarray:
+    """Interpolate azimuths across the 0/360 wrap."""
+    d = np.mod(az1 - az0 + 180.0, 360.0) - 180.0
+    return np.mod(az0 + w * d, 360.0)
+
+
+def _coarse_events(el: np.ndarray, min_el: float) -> List[Tuple[Optional[int], Optional[int], int]]:
+    """
+    (rise index, set index, peak index) of each pass on the coarse grid; a crossing
+    lies between index i and i+1, None marks a pass cut by the window edges.
+    """
+    above = el > min_el
+    if not above.any():
+        return []
+    diff = np.diff(above.astype(np.int8))
+    starts: List[Optional[int]] = [int(i) for i in np.nonzero(diff == 1)[0]]
+    ends: List[Optional[int]] = [int(i) for i in np.nonzero(diff == -1)[0]]
+    if above[0]:
+        starts.insert(0, None)  # already up at window start / já visível no início
+    if above[-1]:
+        ends.append(None)  # still up at window end / ainda visível no fim
+    last = len(el) - 1
+    out = []
+    for ri, si in zip(starts, ends):
+        lo = 0 if ri is None else ri + 1
+        hi = last if si is None else si
+        out.append((ri, si, lo + int(np.argmax(el[lo : hi + 1]))))
+    return out
+
+
+def _sample_events(sats, obj, ts, jd0, fr0, station):
+    """
+    Elevation/azimuth at per-event sample times ``ts`` (m, P), one SGP4 call per object.
+    Elevação/azimute nos instantes ``ts`` (m, P) de cada evento, uma chamada SGP4 por objeto.
+    """
+    m, npts = ts.shape
+    r = np.full((m, npts, 3), np.nan)
+    ok = np.zeros((m, npts), dtype=bool)
+    order = np.argsort(obj, kind="stable")
+    bounds = np.nonzero(np.diff(obj[order]))[0] + 1
+    for rows in np.split(order, bounds):
+        secs = ts[rows].ravel()
+        err, rr, _ = sats[obj[rows[0]]].sgp4_array(np.full(secs.shape, jd0), fr0 + secs / 86400.0)
+        r[rows] = np.asarray(rr).reshape(len(rows), npts, 3)
+        ok[rows] = (np.asarray(err) == 0).reshape(len(rows), npts)
+    el, az = _look_angles(r, jd0 + fr0 + ts / 86400.0, station)
+    return np.where(ok & np.isfinite(el), el, -90.0), az
+
+
+def _bracket_samples(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return a[:, None] + (b - a)[:, None] * np.linspace(0.0, 1.0, REFINE_POINTS)[None, :]
+
+
+def _refine_crossings(sats, obj, a, b, rising, jd0, fr0, station, min_el):
+    """Horizon crossing times/azimuths inside brackets [a, b] (vectorized)."""
+    ts = _bracket_samples(a, b)
+    el, az = _sample_events(sats, obj, ts, jd0, fr0, station)
+    f = el - min_el
+    target = (f > 0) == rising[:, None]
+    j = np.where(target.any(axis=1), np.argmax(target, axis=1), REFINE_POINTS - 1)
+    j = np.clip(j, 1, REFINE_POINTS - 1)
+    rows = np.arange(len(a))
+    f0, f1 = f[rows, j - 1], f[rows, j]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        w = np.where(f0 != f1, f0 / (f0 - f1), 0.0)
+    w = np.clip(w, 0.0, 1.0)
+    t = ts[rows, j - 1] + w * (ts[rows, j] - ts[rows, j - 1])
+    return t, _wrap_lerp(az[rows, j - 1], az[rows, j], w)
+
+
+def _refine_peaks(sats, obj, a, b, jd0, fr0, station):
+    """Culmination time/elevation/azimuth inside [a, b] with a parabolic fit (vectorized)."""
+    ts = _bracket_samples(a, b)
+    el, az = _sample_events(sats, obj, ts, jd0, fr0, station)
+    rows = np.arange(len(a))
+    k = np.clip(np.argmax(el, axis=1), 1, REFINE_POINTS - 2)
+    y0, y1, y2 = el[rows, k - 1], el[rows, k], el[rows, k + 1]
+    denom = y0 - 2 * y1 + y2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        off = np.where(denom < 0, 0.5 * (y0 - y2) / denom, 0.0)
+    off = np.clip(off, -1.0, 1.0)
+    t = ts[rows, k] + off * (b - a) / (REFINE_POINTS - 1)
+    peak = np.maximum(y1 - 0.25 * (y0 - y2) * off, el.max(axis=1))
+    az_peak = np.where(
+        off >= 0,
+        _wrap_lerp(az[rows, k], az[rows, k + 1], np.abs(off)),
+        _wrap_lerp(az[rows, k], az[rows, k - 1], np.abs(off)),
+    )
+    return t, peak, az_peak
+
+
+def _passes_for_chunk(
+    tles: Sequence[Tuple[str, str]],
+    jd0: float,
+    fr0: float,
+    duration: float,
+    lat: float,
+    lon: float,
+    alt_m: float,
+    min_el: float,
+    base_step: float,
+) -> List[List[dict]]:
+    """
+    Passes for a chunk of TLEs (runs in a worker process for large catalogs).
+    Passagens de um bloco de TLEs (roda em processo worker para catálogos grandes).
+    """
+    station = _station(lat, lon, alt_m)
+    sats = [Satrec.twoline2rv(l1, l2) for l1, l2 in tles]
+    steps = [_grid_step(s, base_step) for s in sats]
+
+    # 1) coarse grid, one batched propagation per grid step
+    # 1) grade grossa, uma propagação em lote por passo de grade
+    events = []  # (object, rise idx, set idx, peak idx, grid seconds)
+    for step in sorted(set(steps)):
+        idx = [i for i, st in enumerate(steps) if st == step]
+        secs = np.unique(np.append(np.arange(0.0, duration, step), duration))
+        jd = np.full(secs.shape, jd0)
+        fr = fr0 + secs / 86400.0
+        err, r, _ = SatrecArray([sats[i] for i in idx]).sgp4(jd, fr)
+        el, _ = _look_angles(r, jd + fr, station)
+        el = np.where((err == 0) & np.isfinite(el), el, -90.0)
+        for k, i in enumerate(idx):
+            for ri, si, pk in _coarse_events(el[k], min_el):
+                events.append((i, ri, si, pk, secs))
+
+    out: List[List[dict]] = [[] for _ in sats]
+    if not events:
+        return out
+
+    # 2) refine only near crossings and peaks, all events at once
+    # 2) refina só perto dos cruzamentos e picos, todos os eventos de uma vez
+    cross_obj, cross_a, cross_b, cross_rising, cross_ref = [], [], [], [], []
+    for n, (i, ri, si, pk, secs) in enumerate(events):
+        for gi, rising in ((ri, True), (si, False)):
+            if gi is not None:
+                cross_obj.append(i)
+                cross_a.append(secs[gi])
+                cross_b.append(secs[gi + 1])
+                cross_rising.append(rising)
+                cross_ref.append((n, rising))
+    crossings = {}
+    if cross_obj:
+        ct, caz = _refine_crossings(
+            sats, np.array(cross_obj), np.array(cross_a), np.array(cross_b),
+            np.array(cross_rising), jd0, fr0, station, min_el,
+        )
+        crossings = {ref: (float(t), float(az)) for ref, t, az in zip(cross_ref, ct, caz)}
+
+    peak_obj = np.array([e[0] for e in events])
+    peak_a = np.array([e[4][max(e[3] - 1, 0)] for e in events])
+    peak_b = np.array([e[4][min(e[3] + 1, len(e[4]) - 1)] for e in events])
+    peak_t, peak_el, peak_az = _refine_peaks(sats, peak_obj, peak_a, peak_b, jd0, fr0, station)
+
+    for n, (i, ri, si, pk, secs) in enumerate(events):
+        rise, rise_az = crossings.get((n, True), (None, None))
+        set_, set_az = crossings.get((n, False), (None, None))
+        out[i].append({
+            "rise": rise,
+            "rise_az": rise_az,
+            "peak": float(peak_t[n]),
+            "peak_el": float(peak_el[n]),
+            "peak_az": float(peak_az[n]),
+            "set": set_,
+            "set_az": set_az,
+        })
+    return out
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PASS_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iso(start: datetime, secs: Optional[float]) -> Optional[str]:
+    if secs is None:
+        return None
+    return (start + timedelta(seconds=secs)).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _deg(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 2)
+
+
+def predict_passes(
+    objects: List[dict],
+    lat: float,
+    lon: float,
+    alt_m: float = 0.0,
+    start: Optional[datetime] = None,
+    hours: float = 24.0,
+    min_elevation: float = 0.0,
+    step_seconds: float = 60.0,
+) -> List[dict]:
+    """
+    Rise/culmination/set of every object over a ground station within a time window.
+    Nascer/culminação/ocaso de cada objeto sobre uma estação terrestre numa janela de tempo.
+
+    Args:
+        objects: Dicts with ``tle_line1``/``tle_line2`` (extra keys are copied to the output)
+        lat, lon, alt_m: Station geodetic latitude/longitude (degrees) and altitude (m)
+        start: Window start (UTC, defaults to now)
+        hours: Window length in hours (max 72)
+        min_elevation: Elevation mask in degrees
+        step_seconds: Coarse grid step for LEO objects (slower orbits use multiples)
+
+    Returns:
+        Passes sorted by rise time; ``rise``/``set`` are None when the pass is already
+        in progress at the window start or still in progress at its end
+    """
+    if not -90.0 <= lat <= 90.0 or not -180.0 <= lon <= 360.0:
+        raise ValueError("Invalid station coordinates")
+    if not 0 < hours <= MAX_HOURS:
+        raise ValueError(f"hours must be in (0, {MAX_HOURS:g}]")
+    if not 5.0 <= step_seconds <= 600.0:
+        raise ValueError("step_seconds must be in [5, 600]")
+
+    start = start or datetime.now(timezone.utc)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    start = start.astimezone(timezone.utc)
+    jd0, fr0 = jday(start.year, start.month, start.day, start.hour, start.minute,
+                    start.second + start.microsecond / 1e6)
+    duration = hours * 3600.0
+
+    tles = [(o["tle_line1"], o["tle_line2"]) for o in objects]
+    args = (jd0, fr0, duration, lat, lon, alt_m, min_elevation, step_seconds)
+    chunks = [tles[i : i + PASS_CHUNK] for i in range(0, len(tles), PASS_CHUNK)]
+    if len(chunks) > 1 and PASS_WORKERS > 1:
+        pool = _get_pool()
+        futures = [pool.submit(_passes_for_chunk, chunk, *args) for chunk in chunks]
+        per_object = [p for fut in futures for p in fut.result()]
+    else:
+        per_object = [p for chunk in chunks for p in _passes_for_chunk(chunk, *args)]
+
+    ordered = []
+    for obj, passes in zip(objects, per_object):
+        meta = {k: v for k, v in obj.items() if k not in ("tle_line1", "tle_line2")}
+        for p in passes:
+            order = p["rise"] if p["rise"] is not None else -1.0
+            ordered.append((order, {
+                **meta,
+                "rise_time": _iso(start, p["rise"]),
+                "rise_azimuth_deg": _deg(p["rise_az"]),
+                "culmination_time": _iso(start, p["peak"]),
+                "max_elevation_deg": _deg(p["peak_el"]),
+                "culmination_azimuth_deg": _deg(p["peak_az"]),
+                "set_time": _iso(start, p["set"]),
+                "set_azimuth_deg": _deg(p["set_az"]),
+            }))
+    ordered.sort(key=lambda item: item[0])
+    return [rec for _, rec in ordered]
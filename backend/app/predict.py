@@ -3,7 +3,7 @@ import json
 import argparse
 import pandas as pd
 from joblib import load
-from .features import load_ucs_from_data_raw, engineer_features
+from .feature_store import load_source, load_features
 
 
 def get_models_dir() -> str:
@@ -20,8 +20,8 @@ def load_artifacts():
 
 
 def main(output: str):
-    df, _ = load_ucs_from_data_raw()
-    feats = engineer_features(df)
+    df = load_source()
+    feats, _ = load_features()
 
     pre, model, label_map = load_artifacts()
     X = pre.transform(feats)
@@ -0,0 +1,259 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Hot Reload of Datasets and Models
+
+Este módulo observa os arquivos de dados e de modelo (mtime/tamanho e hash do conteúdo),
+constrói um novo snapshot em uma thread de fundo e o troca atomicamente atrás de um
+número de versão. Requisições em andamento terminam no snapshot antigo.
+
+This module watches the data and model files (mtime/size and content hash), builds a
+new snapshot on a background thread and swaps it atomically behind a version number.
+In-flight requests finish on the old snapshot.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Poll interval in seconds (0 disables the watcher) / Intervalo de verificação em segundos
+RELOAD_INTERVAL = float(os.getenv("ORBITHUB_RELOAD_INTERVAL", "5"))
+
+
+def _stat_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Cheap (mtime_ns, size) signature, None if the file is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _file_digest(path: str) -> Optional[str]:
+    """Content hash of a file, None if it cannot be read."""
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+class Snapshot:
+    """
+    Immutable bundle of datasets/models built together under one version.
+    Conjunto imutável de dados/modelos construídos juntos sob uma versão.
+
+    ``version`` counts builds in this process; ``dataset_version`` is the persistent
+    change-log version, stamped by a ``before_swap`` listener before the snapshot goes
+    live (None if none is registered).
+    """
+
+    __slots__ = ("version", "built_at", "fingerprints", "dataset_version", "_data")
+
+    def __init__(self, version: int, fingerprints: Dict[str, Optional[str]], data: dict):
+        self.version = version
+        self.built_at = datetime.now(timezone.utc).isoformat()
+        self.fingerprints = fingerprints
+        self.dataset_version: Optional[int] = None
+        self._data = data
+
+    def __getitem__(self, key: str):
+        return self._data[key]
+
+    def get(self, key: str, default=None):
+        return self._data.get(key, default)
+
+
+class ReloadManager:
+    """
+    Watch files and rebuild a Snapshot in the background when their content changes.
+    Observa arquivos e reconstrói um Snapshot em segundo plano quando o conteúdo muda.
+
+    Args:
+        watch_paths: Files whose content defines the snapshot
+        build: Callable receiving the watched files' content hashes and returning the
+               snapshot payload (dict)
+        interval: Poll interval in seconds
+    """
+
+    def __init__(
+        self,
+        watch_paths: List[str],
+        build: Callable[[Dict[str, Optional[str]]], dict],
+        interval: float = RELOAD_INTERVAL,
+    ):
+        self.watch_paths = list(watch_paths)
+        self.interval = interval
+        self._build = build
+        self._snapshot: Optional[Snapshot] = None
+        self._build_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # last (mtime, size) seen per file and the signatures behind the live snapshot
+        self._polled: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._live_stats: Dict[str, Optional[Tuple[int, int]]] = {}
+        # signatures a build failed on: not retried until a file changes again
+        # assinaturas em que uma construção falhou: sem nova tentativa até o arquivo mudar
+        self._failed_stats: Optional[Dict[str, Optional[Tuple[int, int]]]] = None
+        self.last_error: Optional[str] = None
+        self.last_build_seconds: Optional[float] = None
+        self._listeners: List[Callable[[Snapshot], None]] = []
+        self._preparers: List[Callable[[Snapshot], None]] = []
+
+    # ---------- snapshot access ----------
+
+    def current(self) -> Snapshot:
+        """
+        Return the live snapshot, building it synchronously on first use only.
+        Retorna o snapshot ativo, construindo-o de forma síncrona apenas no primeiro uso.
+        """
+        snap = self._snapshot
+        if snap is not None:
+            return snap
+        with self._build_lock:
+            if self._snapshot is None:
+                self._rebuild()
+            return self._snapshot  # type: ignore[return-value]
+
+    def subscribe(self, callback: Callable[[Snapshot], None], before_swap: bool = False) -> None:
+        """
+        Call ``callback(snapshot)`` after every swap, on the building thread.
+        Chama ``callback(snapshot)`` após cada troca, na thread de construção.
+
+        With ``before_swap`` the callback runs on the new snapshot before it goes live,
+        e.g. to stamp it; it must not call ``current()``.
+        """
+        (self._preparers if before_swap else self._listeners).append(callback)
+
+    @property
+    def version(self) -> int:
+        snap = self._snapshot
+        return snap.version if snap is not None else 0
+
+    # ---------- watcher ----------
+
+    def start(self) -> None:
+        """Build the first snapshot if needed and start the watcher thread."""
+        self.current()
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="orbithub-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def trigger(self) -> None:
+        """
+        Ask the watcher to check the files now instead of waiting for the next poll.
+        Also retries a failed build whose files have not changed since.
+        """
+        self._failed_stats = None
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            forced = self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.check(settle=not forced)
+            except Exception as exc:  # keep watching even if a build fails
+                self.last_error = f"{type(exc).__name__}: {exc}"
+
+    def check(self, settle: bool = True) -> bool:
+        """
+        Rebuild if any watched file changed content since the live snapshot.
+        Reconstrói se algum arquivo observado mudou de conteúdo desde o snapshot ativo.
+
+        Args:
+            settle: Only act on files whose (mtime, size) was already seen on the
+                    previous poll, so half-written files are not loaded
+
+        Returns:
+            True if a new snapshot was swapped in
+        """
+        snap = self._snapshot
+        if snap is None:
+            self.current()
+            return True
+
+        sigs = {path: _stat_signature(path) for path in self.watch_paths}
+        if sigs == self._failed_stats:
+            self._polled.update(sigs)
+            return False  # same files the last build failed on / mesmos arquivos da falha
+
+        changed = False
+        for path, sig in sigs.items():
+            previous = self._polled.get(path)
+            self._polled[path] = sig
+            if sig == self._live_stats.get(path):
+                continue
+            if settle and sig != previous:
+                continue  # still being written / ainda sendo escrito
+            if _file_digest(path) != snap.fingerprints.get(path):
+                changed = True
+            else:
+                self._live_stats[path] = sig  # touched but identical content
+        if not changed:
+            return False
+        with self._build_lock:
+            return self._rebuild()
+
+    def _rebuild(self) -> bool:
+        stats = {p: _stat_signature(p) for p in self.watch_paths}
+        fingerprints = {p: _file_digest(p) for p in self.watch_paths}
+        t0 = time.perf_counter()
+        try:
+            data = self._build(fingerprints)
+        except Exception as exc:
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            self._failed_stats = stats
+            if self._snapshot is None:
+                raise
+            return False
+        self.last_build_seconds = time.perf_counter() - t0
+        self.last_error = None
+        self._failed_stats = None
+        self._live_stats = stats
+        self._polled.update(stats)
+        # single reference assignment: readers see either the old or the new snapshot
+        snap = Snapshot(self.version + 1, fingerprints, data)
+        for callback in self._preparers:
+            try:
+                callback(snap)
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+        self._snapshot = snap
+        for callback in self._listeners:
+            try:
+                callback(snap)
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+        return True
+
+    def stats(self) -> dict:
+        snap = self._snapshot
+        return {
+            "version": self.version,
+            "built_at": snap.built_at if snap is not None else None,
+            "last_build_seconds": self.last_build_seconds,
+            "last_error": self.last_error,
+            "failed_build_pending_change": self._failed_stats is not None,
+            "watching": self._thread is not None and self._thread.is_alive(),
+            "interval_seconds": self.interval,
+            "files": {p: (snap.fingerprints.get(p) if snap is not None else None) for p in self.watch_paths},
+        }
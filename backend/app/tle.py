@@ -0,0 +1,40 @@
+"""
+OrbitHub - NASA Hackathon 2025
+TLE Helpers
+
+Funções auxiliares para ler campos de colunas fixas de linhas TLE (Two-Line Elements).
+
+Helpers to read fixed-column fields from TLE (Two-Line Element) lines.
+"""
+
+from typing import Optional
+
+# Alpha-5 catalog numbers: letter prefix replaces the two leading digits (I and O unused)
+# Números Alpha-5: a letra inicial substitui os dois primeiros dígitos (sem I e O)
+_ALPHA5 = {c: 10 + i for i, c in enumerate("ABCDEFGHJKLMNPQRSTUVWXYZ")}
+
+
+def parse_catalog_number(field: str) -> Optional[int]:
+    """
+    Parse a 5-character NORAD catalog field, including Alpha-5 numbers.
+    Lê um campo de catálogo NORAD de 5 caracteres, incluindo números Alpha-5.
+    """
+    field = (field or "").strip()
+    if not field:
+        return None
+    if field.isdigit():
+        return int(field)
+    head = _ALPHA5.get(field[0].upper())
+    if head is None or not field[1:].isdigit():
+        return None
+    return head * 10000 + int(field[1:])
+
+
+def norad_id_from_line1(line1) -> Optional[int]:
+    """
+    NORAD catalog number from columns 3-7 of TLE line 1.
+    Número de catálogo NORAD das colunas 3-7 da linha 1 do TLE.
+    """
+    if not isinstance(line1, str) or len(line1) < 7 or line1[0] != "1":
+        return None
+    return parse_catalog_number(line1[2:7])
@@ -7,7 +7,7 @@ from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.cluster import KMeans
 from joblib import dump
-from .features import load_ucs_from_data_raw, engineer_features
+from .feature_store import load_features
 
 
 def ensure_models_dir() -> str:
@@ -44,11 +44,14 @@ def build_pipeline(categorical_cols, numeric_cols) -> Pipeline:
 
 
 def main():
-    df, path = load_ucs_from_data_raw()
-    feats = engineer_features(df)
+    # Features persistidas (recalculadas só se a planilha ou o código mudarem)
+    feats, _ = load_features()
 
     categorical_cols = ["PURPOSE", "OPS_STATUS_CODE"]
     numeric_cols = ["LIFETIME_YEARS", "CAPABILITIES_COUNT", "ENV_IMPACT_SCORE"]
+    # Vida orbital (app.decay) só entra quando há estimativas ligadas ao catálogo
+    if feats["ORBITAL_LIFETIME_YEARS"].notna().any():
+        numeric_cols.append("ORBITAL_LIFETIME_YEARS")
 
     pipe = build_pipeline(categorical_cols, numeric_cols)
     pipe.fit(feats)
@@ -111,6 +114,8 @@ def main():
         "CAPABILITIES_COUNT_median": float(feats["CAPABILITIES_COUNT"].median()),
         "ENV_IMPACT_SCORE_median": float(feats["ENV_IMPACT_SCORE"].median()),
     }
+    if "ORBITAL_LIFETIME_YEARS" in numeric_cols:
+        defaults["ORBITAL_LIFETIME_YEARS_median"] = float(feats["ORBITAL_LIFETIME_YEARS"].median())
 
     with open(os.path.join(models_dir, "cluster_label_map.json"), "w", encoding="utf-8") as f:
         json.dump(label_map, f)
@@ -0,0 +1,305 @@
+"""
+OrbitHub - NASA Hackathon 2025
+Celestrak ↔ UCS Entity Resolution
+
+Este módulo liga objetos do Celestrak a registros classificados da UCS. Primeiro faz um
+hash join exato pelo número NORAD (extraído da linha 1 do TLE ou de ``norad_cat_id``) e
+pela designação COSPAR; depois, para o restante, compara nomes normalizados usando
+blocagem por tokens e trigramas em vez de comparar todos contra todos. O resultado é
+persistido como uma tabela de referência cruzada junto com a taxa de acerto.
+
+This module links Celestrak objects to classified UCS records. It first does an exact
+hash join on the NORAD number (parsed from TLE line 1 or ``norad_cat_id``) and the COSPAR
+designator; the rest falls back to normalized-name matching with token/trigram blocking
+instead of an all-pairs comparison. The result is persisted as a cross-reference table
+together with its match rate.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import argparse
+from collections import defaultdict
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from .filelock import file_lock
+from .tle import norad_id_from_line1
+
+
+XREF_CSV = os.path.join("..", "data", "processed", "celestrak_ucs_xref.csv")
+XREF_META = os.path.join("..", "data", "processed", "celestrak_ucs_xref.json")
+XREF_VERSION = 1  # bump when the matching rules change / incremente ao mudar as regras
+
+UCS_NAME_COLUMNS = ["Current Official Name of Satellite", "Name of Satellite, Alternate Names"]
+MAX_BLOCK = 200  # skip tokens shared by more aliases (e.g. STARLINK) / ignora tokens muito comuns
+MIN_SCORE = 0.85
+MIN_MARGIN = 0.05
+
+XREF_COLUMNS = ["cel_row", "cel_name", "norad_id", "ucs_row", "method", "score"]
+
+
+def normalize_name(text) -> str:
+    """Uppercase alphanumeric tokens separated by single spaces."""
+    if not isinstance(text, str):
+        return ""
+    return " ".join(re.sub(r"[^A-Z0-9]+", " ", text.upper()).split())
+
+
+def cospar_from_line1(line1) -> Optional[str]:
+    """International designator of TLE line 1 (``23027B`` → ``2023-027B``)."""
+    if not isinstance(line1, str) or len(line1) < 17 or line1[0] != "1":
+        return None
+    field = line1[9:17].strip()
+    if len(field) < 6 or not field[:5].isdigit():
+        return None
+    yy = int(field[:2])
+    year = 1900 + yy if yy >= 57 else 2000 + yy
+    return f"{year}-{field[2:5]}{field[5:]}"
+
+
+def _celestrak_names(name) -> Tuple[List[str], bool]:
+    """
+    Candidate names of a Celestrak object and whether they were truncated (``*``).
+    Celestrak packs ``NAME (ALT NAME)`` into 24 characters and marks cuts with ``*``.
+    """
+    if not isinstance(name, str):
+        return [], False
+    truncated = "*" in name
+    main, _, alt = name.partition("(")
+    names = [normalize_name(main)]
+    alt = normalize_name(alt)
+    if alt:
+        names.append(alt)
+    return [n for n in names if n], truncated
+
+
+def _ucs_aliases(row_names: List[str]) -> List[str]:
+    """Official name plus every alias listed in ``NAME (ALT1, ALT2)``."""
+    aliases: List[str] = []
+    for text in row_names:
+        if not isinstance(text, str):
+            continue
+        main, _, rest = text.partition("(")
+        parts = [main] + re.split(r"[,;/]", rest.rstrip(") "))
+        for part in parts:
+            norm = normalize_name(part)
+            if norm and norm not in aliases:
+                aliases.append(norm)
+    return aliases
+
+
+def _trigrams(text: str) -> Set[str]:
+    compact = f"  {text.replace(' ', '')} "
+    return {compact[i : i + 3] for i in range(len(compact) - 2)}
+
+
+class _NameIndex:
+    """Blocking index: alias → UCS row, bucketed by token and by trigram."""
+
+    def __init__(self, ucs: pd.DataFrame):
+        self.alias_row: List[int] = []
+        self.alias_text: List[str] = []
+        self.alias_grams: List[Set[str]] = []
+        self.by_token: Dict[str, List[int]] = defaultdict(list)
+        self.by_gram: Dict[str, List[int]] = defaultdict(list)
+        cols = [c for c in UCS_NAME_COLUMNS if c in ucs.columns]
+        values = zip(*[ucs[c].astype(object).tolist() for c in cols]) if cols else []
+        for row, names in zip(range(len(ucs)), values):
+            for alias in _ucs_aliases(list(names)):
+                aid = len(self.alias_row)
+                self.alias_row.append(row)
+                self.alias_text.append(alias)
+                grams = _trigrams(alias)
+                self.alias_grams.append(grams)
+                for tok in set(alias.split()):
+                    self.by_token[tok].append(aid)
+                for g in grams:
+                    self.by_gram[g].append(aid)
+
+    def candidates(self, name: str) -> Set[int]:
+        """Aliases sharing a selective token; trigram buckets as a fallback."""
+        found: Set[int] = set()
+        for tok in name.split():
+            bucket = self.by_token.get(tok, ())
+            if 0 < len(bucket) <= MAX_BLOCK:
+                found.update(bucket)
+        if not found:
+            for g in _trigrams(name):
+                bucket = self.by_gram.get(g, ())
+                if 0 < len(bucket) <= MAX_BLOCK:
+                    found.update(bucket)
+        return found
+
+    def best(self, names: List[str], truncated: bool) -> Tuple[Optional[int], float]:
+        """Best UCS row for a set of names (None if no confident, unambiguous match)."""
+        scores: Dict[int, float] = {}
+        for name in names:
+            grams = _trigrams(name)
+            compact = name.replace(" ", "")
+            for aid in self.candidates(name):
+                alias = self.alias_text[aid]
+                if alias == name:
+                    score = 1.0
+                elif truncated and len(compact) >= 6 and alias.replace(" ", "").startswith(compact):
+                    score = 0.95
+                else:
+                    other = self.alias_grams[aid]
+                    score = len(grams & other) / max(1, len(grams | other))
+                row = self.alias_row[aid]
+                if score > scores.get(row, 0.0):
+                    scores[row] = score
+        if not scores:
+            return None, 0.0
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        row, score = ranked[0]
+        second = ranked[1][1] if len(ranked) > 1 else 0.0
+        if score < MIN_SCORE or score - second < MIN_MARGIN:
+            return None, score
+        return row, score
+
+
+def build_xref(celestrak: pd.DataFrame, ucs: pd.DataFrame) -> Tuple[pd.DataFrame, dict]:
+    """
+    Link each Celestrak row to a UCS row (exact IDs first, then blocked name matching).
+    Liga cada linha do Celestrak a uma linha da UCS (IDs exatos primeiro, depois nomes).
+
+    Args:
+        celestrak: Celestrak frame (name, norad_cat_id, tle_line1, ...)
+        ucs: Classified UCS frame (row positions are the join key)
+
+    Returns:
+        (cross-reference DataFrame with XREF_COLUMNS, report dict)
+    """
+    t0 = time.perf_counter()
+    n = len(celestrak)
+    names = celestrak["name"].tolist() if "name" in celestrak.columns else [None] * n
+    line1 = celestrak["tle_line1"].tolist() if "tle_line1" in celestrak.columns else [None] * n
+    cat_ids = celestrak["norad_cat_id"].tolist() if "norad_cat_id" in celestrak.columns else [None] * n
+
+    # exact keys → UCS row (first occurrence wins) / chaves exatas → linha UCS
+    norad_index: Dict[int, int] = {}
+    if "NORAD Number" in ucs.columns:
+        for row, value in enumerate(pd.to_numeric(ucs["NORAD Number"], errors="coerce").tolist()):
+            if pd.notna(value):
+                norad_index.setdefault(int(value), row)
+    cospar_index: Dict[str, int] = {}
+    if "COSPAR Number" in ucs.columns:
+        for row, value in enumerate(ucs["COSPAR Number"].astype(object).tolist()):
+            if isinstance(value, str) and value.strip():
+                cospar_index.setdefault(value.strip().upper(), row)
+
+    records = []
+    pending: List[int] = []
+    for i in range(n):
+        norad = norad_id_from_line1(line1[i])
+        if norad is None and pd.notna(cat_ids[i]):
+            try:
+                norad = int(float(cat_ids[i]))
+            except (TypeError, ValueError):
+                norad = None
+        rec = {"cel_row": i, "cel_name": names[i], "norad_id": norad, "ucs_row": None, "method": None, "score": None}
+        if norad is not None and norad in norad_index:
+            rec.update(ucs_row=norad_index[norad], method="norad", score=1.0)
+        else:
+            cospar = cospar_from_line1(line1[i])
+            if cospar is not None and cospar in cospar_index:
+                rec.update(ucs_row=cospar_index[cospar], method="cospar", score=1.0)
+            else:
+                pending.append(i)
+        records.append(rec)
+    t_exact = time.perf_counter() - t0
+
+    # blocked fuzzy name matching for the rest / correspondência de nomes com blocagem
+    if pending:
+        index = _NameIndex(ucs)
+        for i in pending:
+            cand_names, truncated = _celestrak_names(names[i])
+            row, score = index.best(cand_names, truncated)
+            if row is not None:
+                records[i].update(ucs_row=row, method="name", score=round(score, 4))
+
+    xref = pd.DataFrame.from_records(records, columns=XREF_COLUMNS)
+    xref["norad_id"] = xref["norad_id"].astype("Int64")
+    xref["ucs_row"] = xref["ucs_row"].astype("Int64")
+    by_method = xref["method"].value_counts().to_dict()
+    matched = int(xref["ucs_row"].notna().sum())
+    report = {
+        "celestrak_rows": n,
+        "ucs_rows": int(len(ucs)),
+        "matched": matched,
+        "unmatched": n - matched,
+        "match_rate": round(matched / n, 4) if n else 0.0,
+        "by_method": {k: int(v) for k, v in by_method.items()},
+        "seconds_exact": round(t_exact, 4),
+        "seconds_total": round(time.perf_counter() - t0, 4),
+    }
+    return xref, report
+
+
+def load_or_build_xref(
+    celestrak: pd.DataFrame,
+    ucs: pd.DataFrame,
+    fingerprints: Dict[str, Optional[str]],
+    csv_path: str = XREF_CSV,
+    meta_path: str = XREF_META,
+) -> Tuple[pd.DataFrame, dict]:
+    """
+    Load the persisted cross-reference if it was built from the same inputs; else rebuild it.
+    Carrega a referência cruzada persistida se veio das mesmas entradas; senão reconstrói.
+
+    Args:
+        fingerprints: Content hashes of the Celestrak and classified files
+    """
+    key = {"version": XREF_VERSION, "inputs": fingerprints}
+    # one worker builds while the others wait, then read its table
+    # um worker constrói enquanto os outros aguardam e depois leem a tabela dele
+    with ExitStack() as stack:
+        try:
+            stack.enter_context(file_lock(f"{csv_path}.lock"))
+        except OSError:
+            pass  # read-only deploys: no lock, and nothing is written either
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("key") == key and os.path.exists(csv_path):
+                xref = pd.read_csv(csv_path, dtype={"norad_id": "Int64", "ucs_row": "Int64"})
+                # rows are positional: a table for other frames would misalign them
+                # linhas são posicionais: uma tabela de outros frames as desalinharia
+                if len(xref) == len(celestrak) and not (xref["ucs_row"] >= len(ucs)).any():
+                    return xref, meta["report"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        xref, report = build_xref(celestrak, ucs)
+        suffix = f"{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            os.makedirs(os.path.dirname(csv_path) or ".", exist_ok=True)
+            xref.to_csv(f"{csv_path}.{suffix}", index=False)
+            os.replace(f"{csv_path}.{suffix}", csv_path)
+            with open(f"{meta_path}.{suffix}", "w", encoding="utf-8") as f:
+                json.dump({"key": key, "report": report}, f, ensure_ascii=False, indent=2)
+            os.replace(f"{meta_path}.{suffix}", meta_path)
+        except OSError:
+            pass  # read-only deploys still serve the in-memory table / deploy somente leitura
+    return xref, report
+
+def main() -> None:
+    from .data_access import CELESTRAK_CSV, CLASSIFIED_CSV, _read_celestrak_csv
+
+    celestrak = _read_celestrak_csv()
+    ucs = pd.read_csv(CLASSIFIED_CSV)
+    xref, report = build_xref(celestrak, ucs)
+    print(json.dumps(report, indent=2))
+    unmatched = xref[xref["ucs_row"].isna()]["cel_name"].head(20).tolist()
+    print("Sample unmatched:", unmatched)
+    print(f"Inputs: {CELESTRAK_CSV}, {CLASSIFIED_CSV}")
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Celestrak ↔ UCS cross-reference report").parse_args()
+    main()
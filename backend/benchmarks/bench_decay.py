@@ -0,0 +1,52 @@
+"""
+Decay/lifetime batch job throughput, in-process vs process pool.
+Vazão do job de decaimento/vida orbital, no processo vs pool de processos.
+
+Resamples the Celestrak element sets in data/raw into a ``--objects`` catalog (mean
+motion and ṅ jittered so objects differ) and times app.decay.estimate_decay.
+
+Run from ``backend/``:  python -m benchmarks.bench_decay
+"""
+
+import os
+import time
+import argparse
+import warnings
+
+import numpy as np
+
+from app.data_access import CELESTRAK_CSV
+from app.decay import estimate_decay
+from app.ingest import read_elements
+
+
+def synthesize(objects: int, seed: int = 0):
+    elements = read_elements(CELESTRAK_CSV)
+    elements = elements[elements["mean_motion"].notna()]
+    rng = np.random.default_rng(seed)
+    big = elements.sample(objects, replace=True, random_state=seed).reset_index(drop=True)
+    big["norad_id"] = np.arange(len(big))
+    big["mean_motion"] *= rng.uniform(0.97, 1.03, len(big))
+    big["mean_motion_dot"] *= rng.uniform(0.5, 1.5, len(big))
+    return big
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=30000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    catalog = synthesize(args.objects)
+    print(f"{'workers':<10}{'objects':>10}{'seconds':>10}   methods")
+    for workers in sorted({1, args.workers}):
+        t0 = time.perf_counter()
+        estimates = estimate_decay(catalog, workers=workers)
+        elapsed = time.perf_counter() - t0
+        methods = estimates["method"].value_counts().to_dict()
+        print(f"{workers:<10}{len(estimates):>10}{elapsed:>10.2f}   {methods}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Payload size and client decode time of /satellites bodies: JSON vs Arrow IPC vs MessagePack.
+Tamanho do payload e tempo de decodificação no cliente: JSON vs Arrow IPC vs MessagePack.
+
+Sizes are reported raw and with the gzip/brotli variants the API precompresses; decode
+time is what a client spends turning the (decompressed) body into rows/columns.
+
+Run from ``backend/``:  python -m benchmarks.bench_formats
+"""
+
+import gzip
+import json
+import time
+import argparse
+import warnings
+
+import orjson
+import pyarrow as pa
+
+from app.main import _satellites_body
+from app.data_access import current_snapshot
+from app.formats import ARROW, ARROW_FILE, JSON, MSGPACK, available_formats, msgpack
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+QUERIES = [
+    ("default page (limit=50)", {"classification": None, "purpose": None, "limit": 50}),
+    ("OURO, all rows", {"classification": "OURO", "purpose": None, "limit": 0}),
+    ("whole catalog", {"classification": None, "purpose": None, "limit": 0}),
+]
+
+
+def best_of(fn, repeat: int) -> float:
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+DECODERS = {
+    JSON: [
+        ("orjson.loads", lambda b: orjson.loads(b)),
+        ("json.loads", lambda b: json.loads(b)),
+    ],
+    ARROW: [
+        ("ipc read_all", lambda b: pa.ipc.open_stream(b).read_all()),
+        ("read_all + to_pandas", lambda b: pa.ipc.open_stream(b).read_all().to_pandas()),
+    ],
+    ARROW_FILE: [
+        ("ipc open_file read_all", lambda b: pa.ipc.open_file(b).read_all()),
+    ],
+    MSGPACK: [
+        ("msgpack.unpackb", lambda b: msgpack.unpackb(b)),
+    ],
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    snap = current_snapshot()
+    for label, q in QUERIES:
+        print(f"\n== {label} ==")
+        print(f"{'format':<12}{'raw KB':>10}{'gzip KB':>10}{'br KB':>10}{'encode ms':>11}   decode ms")
+        for fmt in available_formats():
+            body = _satellites_body(q["classification"], q["purpose"], q["limit"], snap=snap, fmt=fmt)
+            encode_ms = best_of(
+                lambda: _satellites_body(q["classification"], q["purpose"], q["limit"], snap=snap, fmt=fmt),
+                max(3, args.repeat // 4),
+            )
+            gz = len(gzip.compress(body, 9, mtime=0)) / 1024
+            br = len(brotli.compress(body, quality=6)) / 1024 if brotli is not None else float("nan")
+            decodes = ", ".join(
+                f"{name} {best_of(lambda: fn(body), args.repeat):.2f}" for name, fn in DECODERS[fmt]
+            )
+            print(f"{fmt:<12}{len(body) / 1024:>10.1f}{gz:>10.1f}{br:>10.1f}{encode_ms:>11.2f}   {decodes}")
+
+
+if __name__ == "__main__":
+    main()
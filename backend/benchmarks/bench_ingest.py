@@ -0,0 +1,99 @@
+"""
+TLE ingest throughput: fixed-column parse, epoch dedup and history archiving.
+Vazão da ingestão de TLE: parse de colunas fixas, deduplicação por época e histórico.
+
+Synthesizes one 3LE file per epoch with ``--objects`` satellites (valid checksums,
+derived from the Celestrak TLEs in data/raw), then the latest sets one day newer as
+OMM JSON, and ingests them into a throwaway store.
+
+Run from ``backend/``:  python -m benchmarks.bench_ingest
+"""
+
+import os
+import json
+import time
+import argparse
+import tempfile
+import warnings
+
+import pandas as pd
+
+from app.data_access import CELESTRAK_CSV
+from app.ingest import ElementStore, element_records, read_celestrak_csv
+
+
+def _checksum(line: str) -> str:
+    total = sum(int(c) if c.isdigit() else (1 if c == "-" else 0) for c in line[:68])
+    return line[:68] + str(total % 10)
+
+
+def synthesize(path: str, objects: int, day: float) -> int:
+    """3LE text: ``objects`` renumbered copies of the sample TLEs at day-of-year ``day``."""
+    raw = read_celestrak_csv(CELESTRAK_CSV)
+    samples = raw.dropna(subset=["tle_line1", "tle_line2"])[["name", "tle_line1", "tle_line2"]].values.tolist()
+    lines = []
+    for i in range(objects):
+        name, l1, l2 = samples[i % len(samples)]
+        sat = f"{10000 + i:05d}"
+        l1 = _checksum(f"1 {sat}U{l1[7:18]}25{day:012.8f}{l1[32:]}")
+        l2 = _checksum(f"2 {sat}{l2[7:]}")
+        lines += [f"0 {name} {i}", l1, l2]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return objects
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=30000)
+    parser.add_argument("--epochs", type=int, default=2)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ElementStore(os.path.join(tmp, "store"))
+        batches = []
+        for k in range(args.epochs):
+            path = os.path.join(tmp, f"batch{k}.3le")
+            n = synthesize(path, args.objects, day=100.0 + 5.0 * k)
+            batches.append((path, n))
+
+        print(f"{'step':<34}{'sets':>8}{'parse s':>10}{'total s':>10}{'archived':>10}")
+        for path, n in batches:
+            report = store.ingest([path])
+            print(f"{os.path.basename(path) + ' (3LE)':<34}{n:>8}{report['seconds_parse']:>10.3f}"
+                  f"{report['seconds_total']:>10.3f}{report['archived']:>10}")
+
+        # re-ingest: nothing new, nothing archived / reingestão: nada novo nem arquivado
+        report = store.ingest([batches[-1][0]])
+        print(f"{'re-ingest last batch':<34}{batches[-1][1]:>8}{report['seconds_parse']:>10.3f}"
+              f"{report['seconds_total']:>10.3f}{report['archived']:>10}")
+
+        omm = os.path.join(tmp, "omm.json")
+        newer = store.latest()
+        newer["epoch"] = newer["epoch"] + pd.Timedelta(days=1)
+        with open(omm, "w", encoding="utf-8") as f:
+            json.dump([
+                {
+                    "OBJECT_NAME": r["name"], "OBJECT_ID": r["object_id"], "EPOCH": r["epoch"][:-1],
+                    "MEAN_MOTION": r["mean_motion"], "ECCENTRICITY": r["eccentricity"],
+                    "INCLINATION": r["inclination"], "RA_OF_ASC_NODE": r["raan"],
+                    "ARG_OF_PERICENTER": r["arg_perigee"], "MEAN_ANOMALY": r["mean_anomaly"],
+                    "NORAD_CAT_ID": r["norad_id"], "ELEMENT_SET_NO": r["element_set_no"],
+                    "REV_AT_EPOCH": r["rev_at_epoch"], "BSTAR": r["bstar"],
+                    "MEAN_MOTION_DOT": r["mean_motion_dot"], "MEAN_MOTION_DDOT": r["mean_motion_ddot"],
+                }
+                for r in element_records(newer)
+            ], f)
+        report = store.ingest([omm])
+        print(f"{'OMM JSON (one epoch newer)':<34}{len(newer):>8}{report['seconds_parse']:>10.3f}"
+              f"{report['seconds_total']:>10.3f}{report['archived']:>10}")
+
+        t0 = time.perf_counter()
+        hist = store.history(10000)
+        print(f"\nhistory(10000): {len(hist)} element sets in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        print(json.dumps({k: v for k, v in store.stats().items() if k != "last_ingest"}))
+
+
+if __name__ == "__main__":
+    main()
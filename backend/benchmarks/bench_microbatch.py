@@ -0,0 +1,122 @@
+"""
+Throughput vs p99 latency of /classify: one transform/predict per request vs micro-batches.
+Vazão vs latência p99 do /classify: um transform/predict por requisição vs micro-lotes.
+
+Closed-loop clients each send single-satellite requests back to back, the way
+API-delivery integrations do. Both paths run the model on the threadpool under the
+same admission limiter as the API.
+
+Run from ``backend/``:  python -m benchmarks.bench_microbatch --clients 64 --waits 0,1,2,5
+"""
+
+import time
+import random
+import asyncio
+import argparse
+import statistics
+import warnings
+
+import pandas as pd
+from fastapi.concurrency import run_in_threadpool
+
+from app.main import _classify_records
+from app.data_access import load_artifacts_snapshot, load_serving_df
+from app.admission import AdmissionLimiter
+from app.batching import MicroBatcher
+
+PURPOSES = ["Communications", "Earth Observation", "Navigation/Global Positioning", "Technology Development"]
+
+
+def make_records(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    purposes = load_serving_df()["Purpose"].dropna().astype(str).unique().tolist() or PURPOSES
+    return [
+        {
+            "OBJECT_NAME": f"SAT-{i}",
+            "PURPOSE": rng.choice(purposes),
+            "OPS_STATUS_CODE": rng.choice(["+", "-", "P", None]),
+            "LAUNCH_DATE": None,
+            "LIFETIME_YEARS": round(rng.uniform(0, 15), 2),
+            "CAPABILITIES_COUNT": rng.randint(0, 5),
+        }
+        for i in range(n)
+    ]
+
+
+def load_model(records: list):
+    """Serving artifacts, or a same-shaped stand-in if they cannot be unpickled here."""
+    try:
+        artifacts = load_artifacts_snapshot()
+        _classify_records(records[:2], artifacts)
+        return artifacts, "app/models"
+    except Exception as exc:
+        from app.train import build_pipeline
+
+        feats = pd.DataFrame(records)[["PURPOSE", "OPS_STATUS_CODE", "LIFETIME_YEARS", "CAPABILITIES_COUNT"]]
+        feats["OPS_STATUS_CODE"] = feats["OPS_STATUS_CODE"].fillna("UNKNOWN")
+        feats["ENV_IMPACT_SCORE"] = [random.uniform(400, 80000) for _ in range(len(feats))]
+        pipe = build_pipeline(["PURPOSE", "OPS_STATUS_CODE"], ["LIFETIME_YEARS", "CAPABILITIES_COUNT", "ENV_IMPACT_SCORE"])
+        pipe.fit(feats)
+        label_map = {0: "BRONZE", 1: "OURO", 2: "PRATA"}
+        return (pipe.named_steps["pre"], pipe.named_steps["kmeans"], label_map), f"stand-in ({type(exc).__name__})"
+
+
+async def closed_loop(call, records: list, clients: int, per_client: int) -> dict:
+    latencies = []
+
+    async def client(offset: int):
+        for j in range(per_client):
+            rec = records[(offset * per_client + j) % len(records)]
+            t0 = time.perf_counter()
+            await call([rec])
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*[client(c) for c in range(clients)])
+    wall = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "req_per_s": len(latencies) / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=30, help="requests per client")
+    parser.add_argument("--concurrency", type=int, default=4, help="admission slots")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--waits", default="0,1,2,5", help="max-wait values in ms")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    records = make_records(4096)
+    artifacts, source = load_model(records)
+    process = lambda recs: _classify_records(recs, artifacts)
+    print(f"model: {source} | clients={args.clients} x {args.requests} requests | slots={args.concurrency}")
+    print(f"{'mode':<28}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'mean batch':>12}")
+
+    async def run_all():
+        limiter = AdmissionLimiter("bench", args.concurrency, 10**6, timeout=600)
+
+        async def unbatched(recs):
+            return await limiter.run(lambda: run_in_threadpool(process, recs))
+
+        r = await closed_loop(unbatched, records, args.clients, args.requests)
+        print(f"{'per-request':<28}{r['req_per_s']:>10.0f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{1:>12.1f}")
+
+        for wait in [float(w) for w in args.waits.split(",")]:
+            batcher = MicroBatcher("bench", process, max_batch=args.max_batch, max_wait_ms=wait,
+                                   limiter=limiter, max_pending=10**6)
+            r = await closed_loop(batcher.submit, records, args.clients, args.requests)
+            batcher.close()
+            label = f"batched wait={wait:g}ms"
+            print(f"{label:<28}{r['req_per_s']:>10.0f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{batcher.stats()['mean_batch']:>12.1f}")
+
+    asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main()
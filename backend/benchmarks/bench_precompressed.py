@@ -0,0 +1,70 @@
+"""
+CPU-per-request benchmark: on-the-fly GZipMiddleware path vs precompressed variants.
+Benchmark de CPU por requisição: compactação sob demanda vs variantes pré-compactadas.
+
+Run from ``backend/``:  python -m benchmarks.bench_precompressed
+"""
+
+import gzip
+import time
+import argparse
+
+import orjson
+
+from app.data_access import current_snapshot, filter_satellites
+from app.compression import PrecompressedCache, negotiate
+
+QUERIES = [
+    {"classification": None, "purpose": None, "limit": 50},
+    {"classification": "OURO", "purpose": None, "limit": 50},
+    {"classification": "BRONZE", "purpose": "Earth", "limit": 0},
+]
+
+
+def legacy_request(q: dict) -> bytes:
+    # filter + ORJSONResponse + GZipMiddleware(compresslevel=9), every request
+    body = orjson.dumps(filter_satellites(**q))
+    return gzip.compress(body, compresslevel=9) if len(body) >= 800 else body
+
+
+ACCEPT_ENCODING = "gzip, deflate, br"
+
+
+def precompressed_request(cache: PrecompressedCache, version: int, q: dict) -> bytes:
+    key = (q["classification"], q["purpose"], q["limit"])
+    variants = cache.get(version, key, lambda: orjson.dumps(filter_satellites(**q)), accept_encoding=ACCEPT_ENCODING)
+    return variants.bodies[negotiate(ACCEPT_ENCODING, variants.bodies)]
+
+
+def miss_cost(version: int, q: dict) -> float:
+    # fresh cache: filter + serialize + one fast-level variant / cache vazio
+    t0 = time.process_time()
+    precompressed_request(PrecompressedCache(), version, q)
+    return time.process_time() - t0
+
+
+def cpu_per_request(fn, n: int) -> float:
+    fn()  # warm-up / aquecimento
+    t0 = time.process_time()
+    for _ in range(n):
+        fn()
+    return (time.process_time() - t0) / n
+
+
+def main(n: int) -> None:
+    version = current_snapshot().version
+    cache = PrecompressedCache()
+    print(f"{'query':<48} {'legacy ms':>10} {'miss ms':>10} {'precomp ms':>11} {'speedup':>8}")
+    for q in QUERIES:
+        legacy = cpu_per_request(lambda: legacy_request(q), n)
+        miss = miss_cost(version, q)
+        pre = cpu_per_request(lambda: precompressed_request(cache, version, q), n)
+        label = ", ".join(f"{k}={v}" for k, v in q.items())
+        print(f"{label:<48} {legacy * 1e3:>10.3f} {miss * 1e3:>10.3f} {pre * 1e3:>11.4f} {legacy / max(pre, 1e-9):>7.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=50, help="requests per query")
+    args = parser.parse_args()
+    main(args.n)
@@ -0,0 +1,117 @@
+"""
+Request coalescing and load shedding (app.admission).
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.admission import AdmissionLimiter, SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_computation():
+    calls = []
+
+    async def compute(key):
+        calls.append(key)
+        await asyncio.sleep(0.02)
+        return {"key": key}
+
+    async def scenario():
+        flight = SingleFlight("test")
+        results = await asyncio.gather(
+            *(flight.do("a", lambda: compute("a")) for _ in range(5)),
+            flight.do("b", lambda: compute("b")),
+        )
+        # finished keys are not cached: the next call computes again
+        again = await flight.do("a", lambda: compute("a"))
+        return results, again, flight.stats()
+
+    results, again, stats = asyncio.run(scenario())
+    assert calls == ["a", "b", "a"]
+    assert all(r is results[0] for r in results[:5]) and results[5] == {"key": "b"}
+    assert again == {"key": "a"}
+    assert stats == {"in_flight": 0, "leaders": 3, "coalesced": 4}
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_work():
+    finished = []
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+        return 42
+
+    async def scenario():
+        flight = SingleFlight("test")
+        leader = asyncio.ensure_future(flight.do("k", compute))
+        follower = asyncio.ensure_future(flight.do("k", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()  # the first client disconnects / o primeiro cliente desconecta
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == 42
+    assert finished == [True]
+
+
+def test_failure_reaches_every_waiter_and_is_not_kept():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        flight = SingleFlight("test")
+        results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+        return results, flight.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert stats["in_flight"] == 0 and stats["leaders"] == 1
+
+
+def test_full_queue_gets_429_and_a_stale_wait_503_with_retry_after():
+    async def hold(release):
+        await release.wait()
+        return "done"
+
+    async def scenario():
+        limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=1, timeout=0.05, retry_after=7)
+        release = asyncio.Event()
+        running = asyncio.ensure_future(limiter.run(lambda: hold(release)))
+        await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(limiter.run(lambda: hold(release)))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as full:
+            await limiter.run(lambda: hold(release))
+        with pytest.raises(HTTPException) as stale:
+            await queued
+        release.set()
+        assert await running == "done"
+        return full.value, stale.value, limiter.stats()
+
+    full, stale, stats = asyncio.run(scenario())
+    assert full.status_code == 429 and full.headers == {"Retry-After": "7"}
+    assert stale.status_code == 503 and stale.headers == {"Retry-After": "7"}
+    assert stats["running"] == 0 and stats["waiting"] == 0
+    assert stats["admitted"] == 1 and stats["rejected_429"] == 1 and stats["rejected_503"] == 1
+
+
+def test_free_slot_admits_immediately_and_is_released_on_error():
+    async def fail():
+        raise ValueError("boom")
+
+    async def scenario():
+        limiter = AdmissionLimiter("test", max_concurrent=2, max_queue=0)
+        with pytest.raises(ValueError):
+            await limiter.run(fail)
+        results = await asyncio.gather(*(limiter.run(lambda i=i: asyncio.sleep(0.01, result=i)) for i in range(2)))
+        return results, limiter.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert results == [0, 1]
+    assert stats["running"] == 0 and stats["admitted"] == 3 and stats["rejected_429"] == 0
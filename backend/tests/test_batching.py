@@ -0,0 +1,92 @@
+"""
+Admission and fan-out behaviour of the micro-batcher (app.batching).
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+import time
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.admission import AdmissionLimiter
+from app.batching import MicroBatcher
+
+
+def _double(records):
+    if any(r.get("bad") for r in records):
+        raise ValueError("bad record")
+    return [r["x"] * 2 for r in records]
+
+
+def test_bad_record_only_fails_its_own_request():
+    async def scenario():
+        batcher = MicroBatcher("test", _double, max_wait_ms=20)
+        results = await asyncio.gather(
+            batcher.submit([{"x": 1}, {"x": 2}]),
+            batcher.submit([{"x": 3, "bad": True}]),
+            batcher.submit([{"x": 4}]),
+            return_exceptions=True,
+        )
+        stats = batcher.stats()
+        batcher.close()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+    assert results[0] == [2, 4]
+    assert isinstance(results[1], ValueError)
+    assert results[2] == [8]
+    assert stats["isolated_batches"] == 1
+
+
+def test_batches_fill_while_every_slot_is_busy():
+    def slow(records):
+        time.sleep(0.05)
+        return [r["x"] for r in records]
+
+    async def scenario():
+        limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=0, timeout=5)
+        batcher = MicroBatcher("test", slow, max_wait_ms=0, limiter=limiter)
+        first = asyncio.ensure_future(batcher.submit([{"x": 0}]))
+        await asyncio.sleep(0.01)  # first batch now holds the only slot
+        rest = await asyncio.gather(*(batcher.submit([{"x": i}]) for i in range(1, 21)))
+        await first
+        stats = batcher.stats()
+        batcher.close()
+        return rest, stats, limiter.stats()
+
+    rest, stats, limit = asyncio.run(scenario())
+    assert rest == [[i] for i in range(1, 21)]
+    # the 20 requests queued behind the busy slot ran as one batch
+    assert stats["batches"] == 2
+    assert stats["largest_batch"] == 20
+    assert limit["running"] == 0 and limit["admitted"] == 2
+
+
+def test_full_queue_is_shed_with_429_and_stale_requests_with_503():
+    def slow(records):
+        time.sleep(0.3)
+        return [r["x"] for r in records]
+
+    async def scenario():
+        limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=0, timeout=0.1)
+        batcher = MicroBatcher("test", slow, max_batch=4, max_wait_ms=0, limiter=limiter, max_pending=4)
+        first = asyncio.ensure_future(batcher.submit([{"x": 0}]))
+        await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(batcher.submit([{"x": i} for i in range(4)]))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as full:
+            await batcher.submit([{"x": 5}])
+        with pytest.raises(HTTPException) as stale:
+            await queued
+        assert await first == [0]
+        stats = batcher.stats()
+        batcher.close()
+        return full.value, stale.value, stats
+
+    full, stale, stats = asyncio.run(scenario())
+    assert full.status_code == 429 and full.headers["Retry-After"]
+    assert stale.status_code == 503
+    assert stats["queued_records"] == 0
+    assert stats["rejected_429"] == 1 and stats["rejected_503"] == 1
@@ -0,0 +1,59 @@
+"""
+Version counter and change feed shared by several processes (app.changelog).
+
+Each ChangeLog instance below stands in for one uvicorn worker on the same files.
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+import multiprocessing
+
+from app.changelog import ChangeLog
+
+BUILD_1 = {"a": {"sustainability_class": "OURO", "purpose": "Earth"}, "b": {"sustainability_class": "PRATA"}}
+BUILD_2 = {"a": {"sustainability_class": "PRATA", "purpose": "Earth"}, "c": {"sustainability_class": "BRONZE"}}
+
+
+def test_workers_recording_the_same_build_share_one_version(tmp_path):
+    w1, w2 = ChangeLog(str(tmp_path)), ChangeLog(str(tmp_path))
+    assert w1.record(BUILD_1) == 1 and w2.record(BUILD_1) == 1
+    assert w1.record(BUILD_2) == 2 and w2.record(BUILD_2) == 2
+    assert ChangeLog(str(tmp_path)).stats()["version"] == 2
+
+
+def test_changes_recorded_by_another_worker_are_served(tmp_path):
+    w1, w2 = ChangeLog(str(tmp_path), max_versions=2), ChangeLog(str(tmp_path), max_versions=2)
+    w1.record(BUILD_1)
+    w2.changes_since(1)  # w2 has loaded version 1
+    w1.record(BUILD_2)
+    delta = w2.changes_since(1)
+    assert delta["version"] == 2 and not delta["full_resync"]
+    assert {c["id"]: c["op"] for c in delta["changes"]} == {"a": "class_changed", "b": "removed", "c": "added"}
+    # a compaction in w2 keeps the entries w1 appended / compactação em w2 mantém as entradas de w1
+    w1.record(BUILD_1)
+    w2.record({**BUILD_1, "d": {}})
+    delta = ChangeLog(str(tmp_path)).changes_since(2)
+    assert delta["version"] == 4 and not delta["full_resync"]
+    assert {c["id"] for c in delta["changes"]} == {"a", "b", "c", "d"}
+
+
+def _record_builds(directory: str, builds: list) -> None:
+    log = ChangeLog(directory)
+    for build in builds:
+        log.record(build)
+
+
+def test_concurrent_processes_never_fork_the_version(tmp_path):
+    builds = [BUILD_1, BUILD_2, BUILD_1, BUILD_2]
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_record_builds, args=(str(tmp_path), builds)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert all(p.exitcode == 0 for p in procs)
+    log = ChangeLog(str(tmp_path))
+    stats = log.stats()
+    # every version in the log has its entries and the catalog is the last build
+    assert stats["versions_in_log"] == stats["version"] - stats["oldest_delta_since"]
+    assert log.records in (BUILD_1, BUILD_2)
@@ -0,0 +1,64 @@
+"""
+Miss-path encoding, on-demand variants, ETags and byte budget of the precompressed cache (app.compression).
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+import gzip
+
+from app.compression import ENCODINGS, CompressedVariants, PrecompressedCache, precompressed_response
+
+BODY = b'{"name":"satellite","purpose":"Earth Observation"},' * 200
+
+
+def test_miss_encodes_only_the_negotiated_variant():
+    cache = PrecompressedCache()
+    variants = cache.get(1, "q", lambda: BODY, accept_encoding="gzip")
+    assert set(variants.bodies) == {"identity", "gzip"}
+    assert gzip.decompress(variants.bodies["gzip"]) == BODY
+    assert set(cache.get(1, "plain", lambda: BODY).bodies) == {"identity"}
+
+
+def test_warm_builds_every_variant():
+    cache = PrecompressedCache()
+    cache.warm(1, [("hot", lambda: BODY)])
+    assert set(cache.lookup(1, "hot").bodies) == {"identity", *ENCODINGS}
+
+
+def test_cache_is_bounded_in_bytes():
+    size = CompressedVariants(BODY, encodings=("gzip",), fast=True).nbytes
+    cache = PrecompressedCache(max_bytes=2 * size + size // 2)
+    for key in "abc":
+        cache.get(1, key, lambda: BODY, accept_encoding="gzip")
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] == 2 * size
+    assert cache.lookup(1, "a") is None and cache.lookup(1, "c") is not None
+    # a body above the whole budget is served but not stored
+    small = PrecompressedCache(max_bytes=size - 1)
+    assert small.get(1, "big", lambda: BODY, accept_encoding="gzip").bodies["identity"] == BODY
+    assert small.stats()["entries"] == 0
+
+
+def test_encoding_missing_from_a_cached_entry_is_added_once():
+    cache = PrecompressedCache()
+    variants = cache.get(1, "q", lambda: BODY)  # first client: identity only
+    assert variants.missing("identity") is None
+    assert variants.missing("gzip, br") == ENCODINGS[0]
+    before = cache.stats()["bytes"]
+    cache.add_encoding(1, "q", variants, ENCODINGS[0])
+    assert cache.lookup(1, "q").missing("gzip, br") is None
+    assert cache.stats()["bytes"] == before + len(variants.bodies[ENCODINGS[0]])
+    response = precompressed_response(variants, "gzip, br")
+    assert response.headers["Content-Encoding"] == ENCODINGS[0]
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+def test_each_variant_has_its_own_etag():
+    variants = CompressedVariants(BODY, encodings=("gzip",), fast=True)
+    plain = precompressed_response(variants, "identity")
+    zipped = precompressed_response(variants, "gzip")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["ETag"] != zipped.headers["ETag"]
+    # a cached copy of either variant revalidates / cópia de qualquer variante revalida
+    assert precompressed_response(variants, "gzip", if_none_match=plain.headers["ETag"]).status_code == 304
+    assert precompressed_response(variants, "", if_none_match="W/" + zipped.headers["ETag"]).status_code == 304
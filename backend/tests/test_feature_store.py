@@ -0,0 +1,109 @@
+"""
+Cache key and pinned as-of date of the versioned feature store (app.feature_store).
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from app import decay, feature_store
+from app.features import engineer_features
+
+SOURCE = pd.DataFrame({
+    "Purpose": ["Earth Observation", "Communications"],
+    "NORAD Number": [57799, 25544],
+    "Date of Launch": ["2020-01-01", "1998-11-20"],
+})
+
+
+def _estimates(path, reentries):
+    pd.DataFrame({
+        "norad_id": [57799, 25544],
+        "reentry_epoch": pd.to_datetime(reentries, utc=True),
+        "beyond_horizon": [False, False],
+    }).to_parquet(path)
+
+
+def _store(tmp_path, monkeypatch):
+    source = tmp_path / "ucs.xlsx"
+    source.write_bytes(b"ucs v1")
+    estimates = str(tmp_path / "decay_estimates.parquet")
+    monkeypatch.delenv("ORBITHUB_FEATURES_AS_OF", raising=False)
+    monkeypatch.setattr(feature_store, "load_source", lambda *a, **k: SOURCE.copy())
+    monkeypatch.setattr(feature_store, "DECAY_ESTIMATES", estimates)
+    monkeypatch.setattr(feature_store, "load_estimates", lambda: decay.load_estimates(estimates))
+    return str(source), estimates, str(tmp_path / "features")
+
+
+def test_new_decay_estimates_keep_the_pinned_as_of(tmp_path, monkeypatch):
+    source, estimates, store = _store(tmp_path, monkeypatch)
+    _estimates(estimates, ["2025-01-01", "2030-01-01"])
+    first, meta1 = feature_store.load_features(source, as_of="2024-01-01", store_dir=store)
+    _estimates(estimates, ["2026-01-01", "2031-01-01"])
+    second, meta2 = feature_store.load_features(source, store_dir=store)
+    assert meta2["as_of"] == "2024-01-01" and meta2["key"] != meta1["key"]
+    assert meta2["decay_refreshed_from"] == meta1["key"]
+    # only the decay columns moved, and they match a full rebuild
+    expected = engineer_features(
+        SOURCE, as_of=pd.Timestamp("2024-01-01", tz="UTC"), decay=decay.load_estimates(estimates)
+    )
+    pd.testing.assert_frame_equal(second, expected)
+    assert (second["ORBITAL_LIFETIME_YEARS"] > first["ORBITAL_LIFETIME_YEARS"]).all()
+    # the refreshed matrix is now the stored one / a matriz atualizada passa a ser a salva
+    assert feature_store.load_features(source, store_dir=store)[1]["key"] == meta2["key"]
+
+
+def test_code_version_covers_the_decay_model(monkeypatch):
+    before = feature_store.feature_code_version()
+    real = feature_store.inspect.getsource
+    monkeypatch.setattr(
+        feature_store.inspect, "getsource", lambda obj: real(obj) + ("# edit" if obj is decay else "")
+    )
+    assert feature_store.feature_code_version() != before
+
+
+def _count_builds(monkeypatch):
+    builds = []
+    real = feature_store.engineer_features
+    monkeypatch.setattr(
+        feature_store, "engineer_features", lambda df, **kw: builds.append(kw["as_of"]) or real(df, **kw)
+    )
+    return builds
+
+
+def test_matrix_is_rebuilt_only_when_a_key_input_changes(tmp_path, monkeypatch):
+    source, estimates, store = _store(tmp_path, monkeypatch)
+    builds = _count_builds(monkeypatch)
+    _, meta = feature_store.load_features(source, as_of="2024-01-01", store_dir=store)
+    assert feature_store.load_features(source, as_of="2024-01-01", store_dir=store)[1]["key"] == meta["key"]
+    assert len(builds) == 1
+    # each key input yields a new entry / cada entrada da chave gera uma nova matriz
+    keys = {meta["key"]}
+    keys.add(feature_store.load_features(source, as_of="2024-06-01", store_dir=store)[1]["key"])
+    keys.add(feature_store.load_features(source, as_of="2024-06-01", force=True, store_dir=store)[1]["key"])
+    monkeypatch.setattr(feature_store, "feature_code_version", lambda: "2-test")
+    keys.add(feature_store.load_features(source, as_of="2024-06-01", store_dir=store)[1]["key"])
+    (tmp_path / "ucs.xlsx").write_bytes(b"ucs v2")
+    keys.add(feature_store.load_features(source, as_of="2024-06-01", store_dir=store)[1]["key"])
+    assert len(builds) == 5 and len(keys) == 4  # force rebuilds under the same key
+
+
+def test_as_of_stays_pinned_across_days(tmp_path, monkeypatch):
+    source, estimates, store = _store(tmp_path, monkeypatch)
+    builds = _count_builds(monkeypatch)
+    _, first = feature_store.load_features(source, store_dir=store)
+    assert first["as_of"] == datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    class Tomorrow(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(days=1)
+
+    monkeypatch.setattr(feature_store, "datetime", Tomorrow)
+    _, again = feature_store.load_features(source, store_dir=store)
+    assert again["key"] == first["key"] and len(builds) == 1
+    # an explicit date (argument or env) still wins / uma data explícita ainda prevalece
+    monkeypatch.setenv("ORBITHUB_FEATURES_AS_OF", "2024-01-01")
+    assert feature_store.load_features(source, store_dir=store)[1]["as_of"] == "2024-01-01"
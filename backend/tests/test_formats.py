@@ -0,0 +1,34 @@
+"""
+Content negotiation and binary encoders (app.formats).
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+import pandas as pd
+import pyarrow as pa
+
+from app.formats import ARROW, ARROW_FILE, JSON, MEDIA_TYPES, encode, negotiate_format
+
+FRAME = pd.DataFrame({
+    "name_of_satellite": ["A", "B", None],
+    "sustainability_class": pd.Categorical(["OURO", "OURO", "BRONZE"]),
+})
+
+
+def test_arrow_file_accept_gets_an_arrow_file():
+    assert negotiate_format("application/vnd.apache.arrow.file") == ARROW_FILE
+    assert MEDIA_TYPES[ARROW_FILE] == "application/vnd.apache.arrow.file"
+    table = pa.ipc.open_file(encode(FRAME, ARROW_FILE)).read_all()
+    assert table.column("name_of_satellite").to_pylist() == ["A", "B", None]
+    assert pa.ipc.open_stream(encode(FRAME, ARROW)).read_all().equals(table)
+
+
+def test_unmatched_accept_falls_back_to_json():
+    assert negotiate_format(None) == JSON
+    assert negotiate_format("text/plain") == JSON
+    assert negotiate_format("text/html, application/xml;q=0.9") == JSON
+    assert negotiate_format("text/plain, application/vnd.apache.arrow.stream;q=0.5") == ARROW
+
+
+def test_explicitly_refused_json_is_not_acceptable():
+    assert negotiate_format("application/json;q=0, text/plain") is None
@@ -0,0 +1,68 @@
+"""
+OMM ingest and the element store round trip (app.ingest).
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+import json
+
+import pandas as pd
+
+from app.data_access import _read_latest_elements
+from app.ingest import ElementStore, read_omm_json
+
+LINE1 = "1 57799U 23027B   23251.47642099  .00045784  00000+0  69629-3 0  9997"
+LINE2 = "2 57799  51.7807 275.9647 0005371  48.1461 311.9989 15.54063850   688"
+
+OMM = [
+    {"OBJECT_NAME": "ISS (ZARYA)", "OBJECT_ID": "1998-067A", "EPOCH": "2024-03-01T12:00:00",
+     "MEAN_MOTION": 15.5, "ECCENTRICITY": 0.0005, "NORAD_CAT_ID": 25544},
+    {"OBJECT_ID": "2023-027B", "EPOCH": "2024-03-01T12:00:00", "MEAN_MOTION": 15.54, "NORAD_CAT_ID": "57799"},
+    {"OBJECT_NAME": "BAD NUMBER", "EPOCH": "2024-03-01T12:00:00", "NORAD_CAT_ID": "ISS"},
+    {"OBJECT_NAME": "FRACTIONAL", "EPOCH": "2024-03-01T12:00:00", "NORAD_CAT_ID": 12.5},
+]
+
+
+def _write(tmp_path, records):
+    path = tmp_path / "omm.json"
+    path.write_text(json.dumps(records))
+    return str(path)
+
+
+def test_unparsable_norad_numbers_are_rejected_not_raised(tmp_path):
+    df, rejected = read_omm_json(_write(tmp_path, OMM))
+    assert df["norad_id"].tolist() == [25544, 57799]
+    assert df["norad_id"].dtype == "int64"
+    assert rejected == 2
+
+
+def test_missing_strings_stay_missing(tmp_path):
+    df, _ = read_omm_json(_write(tmp_path, OMM))
+    row = df[df["norad_id"] == 57799].iloc[0]
+    assert row["name"] is None and row["tle_line1"] is None
+    assert row["object_id"] == "2023-027B"
+
+
+def test_store_keeps_sets_without_tle_out_of_the_tle_overlay(tmp_path, monkeypatch):
+    store = ElementStore(str(tmp_path / "store"))
+    report = store.ingest([_write(tmp_path, OMM)])
+    assert report["objects"] == 2 and report["files"][0]["rejected"] == 2
+    latest = store.latest()
+    assert latest["tle_line1"].isna().all()
+    monkeypatch.setattr("app.data_access.ELEMENT_STORE", store)
+    assert len(_read_latest_elements()) == 0
+
+
+def test_newer_row_without_elements_does_not_replace_a_tle(tmp_path):
+    tle = tmp_path / "crew.tle"
+    tle.write_text(f"CREW DRAGON 6 DEB\n{LINE1}\n{LINE2}\n")
+    csv = tmp_path / "celestrak.csv"
+    csv.write_text("name;norad_cat_id;epoch;tle_line1;tle_line2\nCREW DRAGON 6 DEB;57799;2024-01-01T00:00:00+00:00;;\n")
+    store = ElementStore(str(tmp_path / "store"))
+    store.ingest([str(tle)])
+    report = store.ingest([str(csv)])
+    assert report["files"][0]["without_elements"] == 1 and report["archived"] == 0
+    latest = store.latest()
+    assert len(latest) == 1 and latest.iloc[0]["tle_line1"] == LINE1
+    assert latest.iloc[0]["epoch"] < pd.Timestamp("2024-01-01", tz="UTC")
+    assert len(store.history(57799)) == 1
@@ -0,0 +1,112 @@
+"""
+Batch job specs and selection matching (app.jobs).
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.jobs import (
+    JobEngine, _write_json_atomic, build_job_spec, job_id_for, snapshot_fingerprint, unmatched_selection,
+)
+
+
+def test_unsupported_format_is_rejected_before_any_job():
+    with pytest.raises(ValueError):
+        build_job_spec({"batch_format": "xlsx"}, None)
+
+
+def test_unmatched_selections_are_reported():
+    spec = build_job_spec({"selected_satellites": [{"name_of_satellite": n} for n in ("A", "B", "C")]}, None)
+    assert unmatched_selection(spec, ["A", "C"]) == ["B"]
+    assert unmatched_selection({"classification": "OURO"}, []) == []
+
+
+def test_selection_with_no_match_fails():
+    spec = build_job_spec({"selected_satellites": [{"name_of_satellite": "NOPE"}]}, None)
+    with pytest.raises(ValueError, match="None of the 1 selected"):
+        unmatched_selection(spec, ["A"])
+
+
+def test_a_claimed_job_cannot_be_claimed_by_another_engine(tmp_path):
+    first, second = JobEngine(str(tmp_path)), JobEngine(str(tmp_path))
+    assert first._claim("0" * 20)
+    assert not second._claim("0" * 20)
+    first._release("0" * 20)
+    assert second._claim("0" * 20)
+    second._release("0" * 20)
+
+
+def _engine(directory):
+    engine = JobEngine(str(directory))
+    os.makedirs(engine.out_dir, exist_ok=True)
+    engine._pool = ThreadPoolExecutor(2)  # in-process stand-in for the worker pool
+    return engine
+
+
+def _wait(engine, job_id, status="done"):
+    for _ in range(200):
+        job = engine.get(job_id)
+        if job and job["status"] == status:
+            return job
+        time.sleep(0.01)
+    return engine.get(job_id)
+
+
+def test_joining_worker_never_overwrites_a_finished_job(tmp_path, monkeypatch):
+    gate = threading.Event()
+    calls = []
+
+    def fake_materialize(spec, out_path):
+        calls.append(spec)
+        gate.wait(5)
+        with open(out_path, "wb") as f:
+            f.write(b"x")
+        return {"rows": 1, "unmatched": []}
+
+    monkeypatch.setattr("app.jobs._materialize", fake_materialize)
+    worker_a, worker_b = _engine(tmp_path), _engine(tmp_path)
+    job = worker_a.submit({"classification": "OURO"})
+    joined = worker_b.submit({"classification": "OURO"})  # A holds the claim
+    assert joined["job_id"] == job["job_id"] and joined["status"] == "running"
+    gate.set()
+    done = _wait(worker_a, job["job_id"])
+    assert done["status"] == "done" and done["requests"] == 2
+    assert worker_b.submit({"classification": "OURO"})["status"] == "done"
+    assert len(calls) == 1
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
+
+
+def test_orphaned_running_job_is_picked_up_by_another_worker(tmp_path, monkeypatch):
+    def fake_materialize(spec, out_path):
+        open(out_path, "wb").close()
+        return {"rows": 0, "unmatched": []}
+
+    monkeypatch.setattr("app.jobs._materialize", fake_materialize)
+    worker = _engine(tmp_path)
+    spec = build_job_spec({"classification": "OURO"}, None)
+    orphan = {"job_id": job_id_for(spec), "status": "running", "spec": spec, "requests": 1}
+    _write_json_atomic(os.path.join(str(tmp_path), f"{orphan['job_id']}.json"), orphan)
+    worker.submit({"classification": "OURO"})
+    assert _wait(worker, orphan["job_id"])["status"] == "done"
+
+
+class _Snap:
+    def __init__(self, fingerprints):
+        self.fingerprints = fingerprints
+
+
+def test_celestrak_refresh_changes_the_job_key():
+    from app.data_access import CELESTRAK_CSV, CLASSIFIED_CSV
+
+    payload = {"selected_satellites": [{"name_of_satellite": "A"}]}
+    before = _Snap({CLASSIFIED_CSV: "ucs", CELESTRAK_CSV: "cel-1"})
+    after = _Snap({CLASSIFIED_CSV: "ucs", CELESTRAK_CSV: "cel-2"})
+    same = build_job_spec(payload, snapshot_fingerprint(before))
+    assert job_id_for(same) == job_id_for(build_job_spec(payload, snapshot_fingerprint(before)))
+    assert job_id_for(same) != job_id_for(build_job_spec(payload, snapshot_fingerprint(after)))
@@ -0,0 +1,90 @@
+"""
+SatrecArray pass finder (app.passes) against brute-force one-second propagation.
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sgp4.api import Satrec, jday
+
+from app.passes import _look_angles, _station, predict_passes
+
+# CREW DRAGON 6 DEB, from data/raw/Celestrak_data.csv: ~400 km, 51.8° inclination
+LINE1 = "1 57799U 23027B   23251.47642099  .00045784  00000+0  69629-3 0  9997"
+LINE2 = "2 57799  51.7807 275.9647 0005371  48.1461 311.9989 15.54063850   688"
+OBJECT = {"name": "CREW DRAGON 6 DEB", "tle_line1": LINE1, "tle_line2": LINE2}
+LISBON = (38.72, -9.14, 100.0)
+START = datetime(2023, 9, 8, 12, 0, tzinfo=timezone.utc)
+HOURS = 24.0
+
+
+def _brute_force(lat, lon, alt_m, start, hours, min_el):
+    """(rise, peak, set, peak elevation) per pass, sampling every second."""
+    secs = np.arange(0.0, hours * 3600.0 + 1.0)
+    jd0, fr0 = jday(start.year, start.month, start.day, start.hour, start.minute, start.second)
+    err, r, _ = Satrec.twoline2rv(LINE1, LINE2).sgp4_array(np.full(secs.shape, jd0), fr0 + secs / 86400.0)
+    assert not np.asarray(err).any()
+    el, _ = _look_angles(np.asarray(r), jd0 + fr0 + secs / 86400.0, _station(lat, lon, alt_m))
+    above = np.concatenate([[False], el > min_el, [False]])
+    edges = np.nonzero(np.diff(above.astype(np.int8)))[0].reshape(-1, 2)
+    out = []
+    for lo, hi in edges:  # samples lo .. hi-1 are above the mask
+        peak = lo + int(np.argmax(el[lo:hi]))
+        rise = None if lo == 0 else secs[lo]
+        set_ = None if hi == len(secs) else secs[hi - 1]
+        out.append((rise, secs[peak], set_, float(el[peak])))
+    return out
+
+
+def _offset(start, iso):
+    if iso is None:
+        return None
+    return (datetime.fromisoformat(iso.replace("Z", "+00:00")) - start).total_seconds()
+
+
+def _check(predicted, expected, start):
+    assert len(predicted) == len(expected)
+    for p, (rise, peak, set_, peak_el) in zip(predicted, expected):
+        for got, want in ((_offset(start, p["rise_time"]), rise), (_offset(start, p["set_time"]), set_)):
+            if want is None:
+                assert got is None
+            else:
+                assert got == pytest.approx(want, abs=3.0)
+        assert _offset(start, p["culmination_time"]) == pytest.approx(peak, abs=5.0)
+        assert p["max_elevation_deg"] == pytest.approx(peak_el, abs=0.05)
+
+
+def test_passes_match_brute_force_propagation():
+    expected = _brute_force(*LISBON, START, HOURS, 0.0)
+    assert len(expected) >= 3
+    predicted = predict_passes([OBJECT], *LISBON, start=START, hours=HOURS)
+    _check(predicted, expected, START)
+    assert all(p["name"] == "CREW DRAGON 6 DEB" for p in predicted)
+
+
+def test_elevation_threshold_drops_low_passes_and_delays_rise():
+    low = _brute_force(*LISBON, START, HOURS, 0.0)
+    expected = _brute_force(*LISBON, START, HOURS, 20.0)
+    assert 0 < len(expected) < len(low)  # some passes never reach 20°
+    predicted = predict_passes([OBJECT], *LISBON, start=START, hours=HOURS, min_elevation=20.0)
+    _check(predicted, expected, START)
+    assert all(p["max_elevation_deg"] > 20.0 for p in predicted)
+
+
+def test_pass_in_progress_at_window_start():
+    rise, peak, set_, _ = _brute_force(*LISBON, START, HOURS, 0.0)[0]
+    start = START + timedelta(seconds=int(peak))
+    expected = _brute_force(*LISBON, start, 6.0, 0.0)
+    assert expected[0][0] is None  # already up / já visível
+    predicted = predict_passes([OBJECT], *LISBON, start=start, hours=6.0)
+    _check(predicted, expected, start)
+    assert predicted[0]["rise_time"] is None and predicted[0]["set_time"] is not None
+
+
+def test_object_that_never_rises():
+    # 51.8° inclination at ~400 km is never above the horizon near the pole
+    assert _brute_force(85.0, 0.0, 0.0, START, HOURS, 0.0) == []
+    assert predict_passes([OBJECT], 85.0, 0.0, start=START, hours=HOURS) == []
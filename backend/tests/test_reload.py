@@ -0,0 +1,98 @@
+"""
+Change detection and snapshot swaps of the hot reloader (app.reload).
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+import os
+
+from app import reload
+from app.reload import ReloadManager
+
+
+def _write(path, content, mtime_s):
+    path.write_bytes(content)
+    # explicit mtimes: a fast test would otherwise reuse the same timestamp
+    os.utime(path, ns=(mtime_s * 10**9, mtime_s * 10**9))
+
+
+def _manager(path):
+    builds = []
+
+    def build(fingerprints):
+        content = path.read_bytes()
+        builds.append(content)
+        if content == b"broken":
+            raise ValueError("unparsable dataset")
+        return {"content": content}
+
+    manager = ReloadManager([str(path)], build, interval=0)
+    return manager, builds
+
+
+def _count_digests(monkeypatch):
+    calls = []
+    real = reload._file_digest
+    monkeypatch.setattr(reload, "_file_digest", lambda p: calls.append(p) or real(p))
+    return calls
+
+
+def test_changed_content_swaps_in_a_new_snapshot(tmp_path):
+    data = tmp_path / "data.csv"
+    _write(data, b"v1", 1000)
+    manager, builds = _manager(data)
+    old = manager.current()
+    _write(data, b"v2!", 2000)
+    assert manager.check(settle=False)
+    assert manager.version == 2 and manager.current()["content"] == b"v2!"
+    # a request still holding the old snapshot keeps its data
+    assert old["content"] == b"v1" and builds == [b"v1", b"v2!"]
+
+
+def test_settle_waits_for_a_stable_signature(tmp_path):
+    data = tmp_path / "data.csv"
+    _write(data, b"v1", 1000)
+    manager, builds = _manager(data)
+    manager.current()
+    _write(data, b"v2 partial", 2000)
+    assert not manager.check()  # first sighting: maybe still being written
+    _write(data, b"v2 complete", 3000)
+    assert not manager.check()
+    assert manager.check()  # unchanged since the previous poll
+    assert manager.current()["content"] == b"v2 complete" and len(builds) == 2
+
+
+def test_touch_with_identical_content_does_not_rebuild(tmp_path, monkeypatch):
+    data = tmp_path / "data.csv"
+    _write(data, b"v1", 1000)
+    manager, builds = _manager(data)
+    manager.current()
+    _write(data, b"v1", 2000)
+    digests = _count_digests(monkeypatch)
+    assert not manager.check(settle=False)
+    assert not manager.check(settle=False)
+    assert len(digests) == 1  # the new signature is remembered / assinatura lembrada
+    assert manager.version == 1 and len(builds) == 1
+
+
+def test_failed_build_keeps_the_old_snapshot_and_backs_off(tmp_path, monkeypatch):
+    data = tmp_path / "data.csv"
+    _write(data, b"v1", 1000)
+    manager, builds = _manager(data)
+    manager.current()
+    _write(data, b"broken", 2000)
+    assert not manager.check(settle=False)
+    assert manager.current()["content"] == b"v1"
+    assert manager.stats()["last_error"].startswith("ValueError")
+    # same files: no rehash and no rebuild on later polls / sem novo hash nem reconstrução
+    digests = _count_digests(monkeypatch)
+    for _ in range(3):
+        assert not manager.check(settle=False)
+    assert digests == [] and len(builds) == 2
+    # an explicit trigger retries once / um trigger explícito tenta de novo
+    manager.trigger()
+    assert not manager.check(settle=False) and len(builds) == 3
+    # a fixed file is picked up / um arquivo corrigido é carregado
+    _write(data, b"v2", 3000)
+    assert manager.check(settle=False)
+    assert manager.current()["content"] == b"v2" and manager.stats()["last_error"] is None
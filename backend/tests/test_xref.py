@@ -0,0 +1,71 @@
+"""
+Matching tiers and persistence of the Celestrak ↔ UCS cross-reference (app.xref).
+
+Run from ``backend/``:  python -m pytest -q
+"""
+
+import os
+
+import pandas as pd
+
+from app.xref import build_xref, cospar_from_line1, load_or_build_xref, normalize_name
+
+ISS_LINE1 = "1 25544U 98067A   24061.50000000  .00016717  00000-0  10270-3 0  9005"
+# NORAD 99999 is not in the UCS frame, the COSPAR designator 2023-027B is
+UNKNOWN_LINE1 = "1 99999U 23027B   23251.47642099  .00045784  00000+0  69629-3 0  9997"
+
+UCS = pd.DataFrame({
+    "Current Official Name of Satellite": ["International Space Station", "Crew Dragon 6", "Sentinel-2A",
+                                           "Twin Sat", "Twin Sat"],
+    "Name of Satellite, Alternate Names": [None, None, "Sentinel 2A (S2A, Copernicus 2A)", None, None],
+    "NORAD Number": [25544, None, 40697, 70001, 70002],
+    "COSPAR Number": ["1998-067A", "2023-027B", "2015-028A", None, None],
+})
+
+CELESTRAK = pd.DataFrame({
+    "name": ["ISS (ZARYA)", "CREW DRAGON 6 DEB", "SENTINEL 2A", "S2A", "TWIN SAT", "UNLISTED"],
+    "tle_line1": [ISS_LINE1, UNKNOWN_LINE1, None, None, None, None],
+    "norad_cat_id": [None, None, None, None, None, None],
+})
+
+
+def _matches(xref):
+    return list(zip(xref["method"], xref["ucs_row"]))
+
+
+def test_tiers_norad_then_cospar_then_name():
+    xref, report = build_xref(CELESTRAK, UCS)
+    assert _matches(xref)[:4] == [("norad", 0), ("cospar", 1), ("name", 2), ("name", 2)]
+    assert xref["norad_id"].tolist()[:2] == [25544, 99999]
+    assert report["by_method"] == {"name": 2, "norad": 1, "cospar": 1}
+    assert report["matched"] == 4 and report["unmatched"] == 2
+
+
+def test_ambiguous_and_unknown_names_stay_unmatched():
+    xref, _ = build_xref(CELESTRAK, UCS)
+    # TWIN SAT names two UCS rows equally well / TWIN SAT casa com duas linhas igualmente
+    assert xref["ucs_row"].iloc[4:].isna().all() and xref["method"].iloc[4:].isna().all()
+
+
+def test_norad_cat_id_is_used_without_a_tle():
+    cel = pd.DataFrame({"name": ["SOMETHING ELSE"], "tle_line1": [None], "norad_cat_id": ["40697"]})
+    xref, _ = build_xref(cel, UCS)
+    assert _matches(xref) == [("norad", 2)]
+
+
+def test_name_and_cospar_normalization():
+    assert normalize_name("Sentinel-2A  (S2A)") == "SENTINEL 2A S2A"
+    assert cospar_from_line1(ISS_LINE1) == "1998-067A"
+    assert cospar_from_line1("2 25544") is None
+
+
+def test_persisted_table_is_reused_only_for_the_same_frames(tmp_path):
+    csv, meta = str(tmp_path / "xref.csv"), str(tmp_path / "xref.json")
+    inputs = {"celestrak": "a", "classified": "b"}
+    first, _ = load_or_build_xref(CELESTRAK, UCS, inputs, csv, meta)
+    again, _ = load_or_build_xref(CELESTRAK, UCS, inputs, csv, meta)
+    pd.testing.assert_frame_equal(first, again)
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+    # same fingerprints but a shorter frame: rebuilt, never misaligned
+    shorter, _ = load_or_build_xref(CELESTRAK.head(2), UCS, inputs, csv, meta)
+    assert len(shorter) == 2